@@ -190,9 +190,15 @@ export const adminApi = {
     if (params.action) qs.set('action', params.action)
     if (params.user_email) qs.set('user_email', params.user_email)
     if (params.limit) qs.set('limit', params.limit)
-    if (params.offset) qs.set('offset', params.offset)
+    if (params.before) qs.set('before', params.before)
+    if (params.include_archive) qs.set('include_archive', 'true')
     const q = qs.toString()
     return request('GET', `/admin/audit-log${q ? '?' + q : ''}`)
+  },
+  getIndexReport: () => request('GET', '/admin/index-advisor'),
+  getEntityHistory: (entityType, entityId, before) => {
+    const q = before ? `?before=${encodeURIComponent(before)}` : ''
+    return request('GET', `/admin/audit-log/history/${entityType}/${entityId}${q}`)
   }
 }
 
@@ -205,7 +211,12 @@ function entityApi (resource) {
       const qs = params ? '?' + new URLSearchParams(params).toString() : ''
       return request('GET', `/${resource}${qs}`)
     },
-    get: (id) => request('GET', `/${resource}/${id}`),
+    get: (id, params) => {
+      const qs = params ? '?' + new URLSearchParams(params).toString() : ''
+      return request('GET', `/${resource}/${id}${qs}`)
+    },
+    // One request for many ids, in request order; { items, missing }
+    getMany: (ids, fields) => request('POST', `/${resource}/by-ids`, { ids, fields }),
     create: (data) => request('POST', `/${resource}`, data),
     update: (id, data, version) => request('PUT', `/${resource}/${id}`, data, { ifMatch: version }),
     delete: (id) => request('DELETE', `/${resource}/${id}`)
@@ -227,6 +238,34 @@ export const api = {
   kpis: entityApi('kpis'),
   mappings: entityApi('capability-mappings'),
 
+  // Ordered create/update/delete operations applied in one transaction;
+  // { committed, results } with a status per operation
+  batch: (operations) => request('POST', '/batch', { operations }),
+
+  // Owner ids referencing an id, grouped by relation (e.g. project_apps)
+  references: (targetId, relations = []) => {
+    const qs = new URLSearchParams()
+    relations.forEach(r => qs.append('relation', r))
+    const q = qs.toString()
+    return request('GET', `/links/${encodeURIComponent(targetId)}${q ? '?' + q : ''}`)
+  },
+
+  // Topological order, cycles, critical path and schedule conflicts;
+  // with a projectId also its transitive dependencies
+  dependencyAnalysis: (projectId) =>
+    request('GET', `/project-dependencies/analysis${projectId ? '?project_id=' + encodeURIComponent(projectId) : ''}`),
+
+  // Integration graph (server-side traversals)
+  graph: {
+    neighbors: (appId, depth = 1, direction = 'both') =>
+      request('GET', `/graph/apps/${encodeURIComponent(appId)}/neighbors?depth=${depth}&direction=${direction}`),
+    impact: (appId, direction = 'downstream') =>
+      request('GET', `/graph/apps/${encodeURIComponent(appId)}/impact?direction=${direction}`),
+    path: (source, target, directed = true) =>
+      request('GET', `/graph/path?${new URLSearchParams({ source, target, directed })}`),
+    components: (minSize = 2) => request('GET', `/graph/components?min_size=${minSize}`)
+  },
+
   // Dashboard aggregation
   dashboard: {
     summary: () => request('GET', '/dashboard/summary'),
@@ -236,6 +275,14 @@ export const api = {
     complianceStatus: () => request('GET', '/dashboard/compliance-status')
   },
 
+  // Full-text search; { query, corrected, total, groups: [{ type, total, items }] }
+  search: (q, { limit, types = [] } = {}) => {
+    const qs = new URLSearchParams({ q })
+    if (limit) qs.set('limit', limit)
+    types.forEach(t => qs.append('types', t))
+    return request('GET', `/search?${qs}`)
+  },
+
   // Seed & Export
   seed: () => request('POST', '/seed'),
   exportJson: () => request('GET', '/export/json'),
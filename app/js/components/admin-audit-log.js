@@ -11,17 +11,21 @@ export default {
     return {
       entries: [],
       total: 0,
+      totalIsEstimate: false,
       loading: true,
-      filters: { entity_type: '', action: '', user_email: '' },
+      filters: { entity_type: '', action: '', user_email: '', include_archive: false },
       limit: 50,
-      offset: 0
+      // Cursors of the pages before the current one; the last is the current page's
+      cursors: [null],
+      nextCursor: null
     }
   },
   async mounted () {
     await this.loadEntries()
   },
   computed: {
-    hasMore () { return this.offset + this.limit < this.total }
+    hasMore () { return this.nextCursor !== null },
+    offset () { return (this.cursors.length - 1) * this.limit }
   },
   methods: {
     async loadEntries () {
@@ -30,10 +34,12 @@ export default {
         const data = await adminApi.getAuditLog({
           ...this.filters,
           limit: this.limit,
-          offset: this.offset
+          before: this.cursors[this.cursors.length - 1]
         })
         this.entries = data.entries
         this.total = data.total
+        this.totalIsEstimate = data.totalIsEstimate
+        this.nextCursor = data.nextCursor
       } catch (e) {
         addToast(e.message || 'Fehler beim Laden des Audit-Logs', 'error')
       } finally {
@@ -41,15 +47,15 @@ export default {
       }
     },
     applyFilters () {
-      this.offset = 0
+      this.cursors = [null]
       this.loadEntries()
     },
     nextPage () {
-      this.offset += this.limit
+      this.cursors.push(this.nextCursor)
       this.loadEntries()
     },
     prevPage () {
-      this.offset = Math.max(0, this.offset - this.limit)
+      if (this.cursors.length > 1) this.cursors.pop()
       this.loadEntries()
     },
     actionBadgeClass (action) {
@@ -97,11 +103,15 @@ export default {
         </select>
         <input v-model="filters.user_email" @keyup.enter="applyFilters" placeholder="E-Mail filtern..."
           class="px-3 py-1.5 border border-gray-300 dark:border-gray-600 rounded-lg bg-white dark:bg-surface-700 text-sm text-gray-800 dark:text-gray-200 w-48" />
+        <label class="flex items-center gap-1.5 text-sm text-gray-600 dark:text-gray-400">
+          <input type="checkbox" v-model="filters.include_archive" @change="applyFilters" />
+          Archiv durchsuchen
+        </label>
       </div>
 
       <!-- Summary -->
       <div class="text-sm text-gray-500 dark:text-gray-400 mb-3">
-        {{ total }} Einträge gesamt · Zeige {{ offset + 1 }}–{{ Math.min(offset + limit, total) }}
+        {{ totalIsEstimate ? '~' : '' }}{{ total }} Einträge gesamt · Zeige {{ offset + 1 }}–{{ offset + entries.length }}
       </div>
 
       <!-- Loading -->
@@ -136,7 +146,7 @@ export default {
         <div v-if="entries.length === 0" class="text-center py-8 text-gray-500">Keine Einträge gefunden</div>
 
         <!-- Pagination -->
-        <div v-if="total > limit" class="flex items-center justify-between px-4 py-3 border-t border-gray-100 dark:border-gray-700">
+        <div v-if="hasMore || offset > 0" class="flex items-center justify-between px-4 py-3 border-t border-gray-100 dark:border-gray-700">
           <button @click="prevPage" :disabled="offset === 0"
             class="px-3 py-1 text-sm rounded border border-gray-300 dark:border-gray-600 disabled:opacity-40">← Zurück</button>
           <button @click="nextPage" :disabled="!hasMore"
@@ -5,15 +5,33 @@ from sqlalchemy.orm import Session
 from app.database import get_db
 from app.models.user import User
 from app.services.auth_service import decode_token
+from app.services.principal_cache import principal_cache
 
 bearer_scheme = HTTPBearer(auto_error=False)
 
 
+def _resolve_user(payload: dict, token: str, db: Session) -> User | None:
+    """Resolve a decoded access token to an active user, using the principal cache."""
+    user_id = payload.get("sub")
+    user = principal_cache.get(user_id, token)
+    if user is not None:
+        return user
+    user = db.query(User).filter(User.id == user_id).first()
+    if user is None or not user.is_active:
+        return None
+    principal_cache.put(token, user)
+    return user
+
+
 def get_current_user(
     credentials: HTTPAuthorizationCredentials | None = Depends(bearer_scheme),
     db: Session = Depends(get_db),
 ) -> User:
-    """Extract and validate JWT, return the User object."""
+    """Extract and validate JWT, return the User object.
+
+    The user may come from the principal cache and is then not attached to
+    ``db``; load it from the session before modifying it.
+    """
     if credentials is None:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
@@ -27,8 +45,8 @@ def get_current_user(
             detail="Invalid or expired token",
             headers={"WWW-Authenticate": "Bearer"},
         )
-    user = db.query(User).filter(User.id == payload.get("sub")).first()
-    if user is None or not user.is_active:
+    user = _resolve_user(payload, credentials.credentials, db)
+    if user is None:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="User not found or inactive",
@@ -46,10 +64,7 @@ def get_optional_user(
     payload = decode_token(credentials.credentials)
     if payload is None or payload.get("type") != "access":
         return None
-    user = db.query(User).filter(User.id == payload.get("sub")).first()
-    if user is None or not user.is_active:
-        return None
-    return user
+    return _resolve_user(payload, credentials.credentials, db)
 
 
 def require_role(*roles: str):
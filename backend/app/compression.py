@@ -0,0 +1,299 @@
+"""ASGI response compression with a cache for ETag-identified payloads.
+
+Encodings are negotiated from ``Accept-Encoding``: zstd and brotli when the
+optional ``zstandard`` / ``brotli`` packages are installed, gzip always.
+Bodies below ``minimum_size`` and non-text content types are passed through;
+streamed bodies are compressed chunk by chunk.
+
+A compressed representation gets its own strong ETag (``"<etag>-<encoding>"``)
+and is cached by that ETag, so an unchanged export is compressed once rather
+than once per client.  The suffix is removed again from ``If-None-Match``
+before the request reaches the application.
+"""
+import zlib
+from collections import OrderedDict
+
+import anyio
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+try:
+    import brotli
+except ImportError:  # optional
+    brotli = None
+
+try:
+    import zstandard
+except ImportError:  # optional
+    zstandard = None
+
+COMPRESSIBLE_TYPES = (
+    "application/json",
+    "application/x-ndjson",
+    "application/msgpack",
+    "application/javascript",
+    "application/xml",
+    "text/",
+)
+# Bodies larger than this are compressed off the event loop.
+_THREAD_THRESHOLD = 256 * 1024
+
+
+class _Gzip:
+    def __init__(self, level: int):
+        self._obj = zlib.compressobj(level, zlib.DEFLATED, 16 + zlib.MAX_WBITS)
+
+    def compress(self, data: bytes) -> bytes:
+        return self._obj.compress(data)
+
+    def finish(self) -> bytes:
+        return self._obj.flush()
+
+
+class _Brotli:
+    def __init__(self, level: int):
+        self._obj = brotli.Compressor(quality=level)
+
+    def compress(self, data: bytes) -> bytes:
+        return self._obj.process(data)
+
+    def finish(self) -> bytes:
+        return self._obj.finish()
+
+
+class _Zstd:
+    def __init__(self, level: int):
+        self._obj = zstandard.ZstdCompressor(level=level).compressobj()
+
+    def compress(self, data: bytes) -> bytes:
+        return self._obj.compress(data)
+
+    def finish(self) -> bytes:
+        return self._obj.flush()
+
+
+def available_encodings() -> dict[str, tuple[type, int]]:
+    """Supported encodings in order of preference, with their level."""
+    encodings = {}
+    if zstandard is not None:
+        encodings["zstd"] = (_Zstd, 3)
+    if brotli is not None:
+        encodings["br"] = (_Brotli, 5)
+    encodings["gzip"] = (_Gzip, 6)
+    return encodings
+
+
+def negotiate(accept_encoding: str, encodings) -> str | None:
+    """Pick the preferred encoding the client accepts (q > 0)."""
+    accepted: dict[str, float] = {}
+    for part in accept_encoding.split(","):
+        name, _, params = part.strip().partition(";")
+        q = 1.0
+        for param in params.split(";"):
+            key, _, value = param.strip().partition("=")
+            if key == "q":
+                try:
+                    q = float(value)
+                except ValueError:
+                    q = 0.0
+        if name:
+            accepted[name.lower()] = q
+    wildcard = accepted.get("*", 0.0)
+    for encoding in encodings:
+        if accepted.get(encoding, wildcard) > 0:
+            return encoding
+    return None
+
+
+def _compress(factory, level: int, body: bytes) -> bytes:
+    compressor = factory(level)
+    return compressor.compress(body) + compressor.finish()
+
+
+class CompressedCache:
+    """LRU of compressed bodies keyed by their ETag, bounded in bytes."""
+
+    def __init__(self, max_bytes: int):
+        self.max_bytes = max_bytes
+        self._entries: OrderedDict[str, bytes] = OrderedDict()
+        self._size = 0
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, etag: str) -> bytes | None:
+        body = self._entries.get(etag)
+        if body is None:
+            self.misses += 1
+            return None
+        self._entries.move_to_end(etag)
+        self.hits += 1
+        return body
+
+    def put(self, etag: str, body: bytes):
+        if len(body) > self.max_bytes or etag in self._entries:
+            return
+        self._entries[etag] = body
+        self._size += len(body)
+        while self._size > self.max_bytes:
+            _, evicted = self._entries.popitem(last=False)
+            self._size -= len(evicted)
+
+    def stats(self) -> dict:
+        return {"entries": len(self._entries), "bytes": self._size, "hits": self.hits, "misses": self.misses}
+
+
+def _encoded_etag(etag: str, encoding: str) -> str:
+    return f'{etag[:-1]}-{encoding}"'
+
+
+def _strip_encoding(value: str, encodings) -> str:
+    """``"abc-gzip"`` -> ``"abc"``; other validators are returned unchanged."""
+    for encoding in encodings:
+        suffix = f'-{encoding}"'
+        if value.endswith(suffix):
+            return value[: -len(suffix)] + '"'
+    return value
+
+
+class CompressionMiddleware:
+    def __init__(self, app: ASGIApp, minimum_size: int = 1024, cache_bytes: int = 64 * 1024 * 1024):
+        self.app = app
+        self.minimum_size = minimum_size
+        self.encodings = available_encodings()
+        self.cache = CompressedCache(cache_bytes)
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        headers = Headers(scope=scope)
+        encoding = negotiate(headers.get("accept-encoding", ""), self.encodings)
+        if encoding is None:
+            await self.app(scope, receive, send)
+            return
+        responder = _CompressionResponder(self, encoding, send)
+        if_none_match = headers.get("if-none-match")
+        if if_none_match:
+            stripped = []
+            for value in if_none_match.split(","):
+                value = value.strip()
+                base = _strip_encoding(value.removeprefix("W/"), self.encodings)
+                responder.validators[base] = value.removeprefix("W/")
+                stripped.append(base)
+            scope = dict(scope)
+            scope["headers"] = list(scope["headers"])
+            MutableHeaders(scope=scope)["if-none-match"] = ", ".join(stripped)
+        await self.app(scope, receive, responder.send)
+
+
+class _CompressionResponder:
+    def __init__(self, middleware: CompressionMiddleware, encoding: str, send: Send):
+        self.middleware = middleware
+        self.encoding = encoding
+        self.factory, self.level = middleware.encodings[encoding]
+        self._send = send
+        self.start: Message | None = None
+        self.mode = "pending"  # pending | passthrough | compress | cached
+        self.compressor = None
+        self.etag: str | None = None
+        self.cache_parts: list[bytes] | None = None
+        self.cache_size = 0
+        self.buffered: list[bytes] = []
+        self.buffered_size = 0
+        # Stripped request validator -> the one the client sent.
+        self.validators: dict[str, str] = {}
+
+    async def send(self, message: Message):
+        if message["type"] == "http.response.start":
+            self.start = message
+            return
+        if message["type"] != "http.response.body":
+            await self._send(message)
+            return
+
+        body = message.get("body", b"")
+        more_body = message.get("more_body", False)
+        if self.mode == "pending":
+            # Small bodies often arrive as a chunk plus an empty final message,
+            # so buffer until the size threshold is reached or the body ends.
+            self.buffered.append(body)
+            self.buffered_size += len(body)
+            if more_body and self.buffered_size < self.middleware.minimum_size:
+                return
+            body, self.buffered = b"".join(self.buffered), []
+            await self._begin(body, more_body)
+            return
+        if self.mode == "passthrough":
+            await self._send(message)
+        elif self.mode == "compress":
+            await self._compress_chunk(body, more_body)
+        # "cached": the cached body was already sent; drain the application.
+
+    async def _begin(self, body: bytes, more_body: bool):
+        start = self.start
+        headers = MutableHeaders(raw=start["headers"])
+        content_type = headers.get("content-type", "")
+        status = start["status"]
+        if status == 304 and headers.get("etag") in self.validators:
+            headers["etag"] = self.validators[headers["etag"]]
+        compressible = (
+            200 <= status < 300 and status != 204
+            and "content-encoding" not in headers
+            and content_type.startswith(COMPRESSIBLE_TYPES)
+        )
+        if compressible:
+            headers.add_vary_header("Accept-Encoding")
+        if not compressible or (not more_body and len(body) < self.middleware.minimum_size):
+            self.mode = "passthrough"
+            await self._send(start)
+            await self._send({"type": "http.response.body", "body": body, "more_body": more_body})
+            return
+
+        etag = headers.get("etag")
+        if etag and etag.startswith('"'):
+            self.etag = _encoded_etag(etag, self.encoding)
+            headers["etag"] = self.etag
+        headers["content-encoding"] = self.encoding
+
+        cached = self.middleware.cache.get(self.etag) if self.etag else None
+        if cached is not None:
+            self.mode = "cached"
+            headers["content-length"] = str(len(cached))
+            await self._send(start)
+            await self._send({"type": "http.response.body", "body": cached})
+            return
+
+        if not more_body:
+            self.mode = "passthrough"
+            if len(body) > _THREAD_THRESHOLD:
+                compressed = await anyio.to_thread.run_sync(_compress, self.factory, self.level, body)
+            else:
+                compressed = _compress(self.factory, self.level, body)
+            if self.etag:
+                self.middleware.cache.put(self.etag, compressed)
+            headers["content-length"] = str(len(compressed))
+            await self._send(start)
+            await self._send({"type": "http.response.body", "body": compressed})
+            return
+
+        self.mode = "compress"
+        self.compressor = self.factory(self.level)
+        self.cache_parts = [] if self.etag else None
+        if "content-length" in headers:
+            del headers["content-length"]
+        await self._send(start)
+        await self._compress_chunk(body, more_body)
+
+    async def _compress_chunk(self, body: bytes, more_body: bool):
+        data = self.compressor.compress(body) if body else b""
+        if not more_body:
+            data += self.compressor.finish()
+        if self.cache_parts is not None:
+            self.cache_parts.append(data)
+            self.cache_size += len(data)
+            if self.cache_size > self.middleware.cache.max_bytes:
+                self.cache_parts = None
+            elif not more_body:
+                self.middleware.cache.put(self.etag, b"".join(self.cache_parts))
+        if data or not more_body:
+            await self._send({"type": "http.response.body", "body": data, "more_body": more_body})
@@ -18,6 +18,38 @@ class Settings(BaseSettings):
     ACCESS_TOKEN_EXPIRE_MINUTES: int = 60
     REFRESH_TOKEN_EXPIRE_DAYS: int = 7
 
+    # Password hashing: bcrypt cost factor, size of the dedicated process pool
+    # (0 = hash in the request thread) and concurrent logins admitted at once
+    BCRYPT_ROUNDS: int = 12
+    PASSWORD_HASH_WORKERS: int = 2
+    LOGIN_CONCURRENCY: int = 8
+    LOGIN_QUEUE_TIMEOUT_SECONDS: float = 10
+
+    # Authenticated-user cache (0 disables it)
+    AUTH_CACHE_TTL_SECONDS: float = 30
+    AUTH_CACHE_MAX_ENTRIES: int = 10000
+
+    # Response compression: smallest body worth compressing and memory for
+    # compressed bodies of ETag-identified responses
+    COMPRESSION_MINIMUM_SIZE: int = 1024
+    COMPRESSION_CACHE_MB: int = 64
+
+    # Audit log: entries of strict entity types are written in the request's
+    # transaction; with AUDIT_ASYNC the rest go through a queue written in
+    # batches, spooled to AUDIT_SPOOL_DIR while the database is unavailable
+    AUDIT_ASYNC: bool = True
+    AUDIT_BATCH_SIZE: int = 500
+    AUDIT_FLUSH_INTERVAL_SECONDS: float = 1.0
+    AUDIT_QUEUE_MAX_ENTRIES: int = 100000
+    AUDIT_SPOOL_DIR: str = "./data/audit-spool"
+    AUDIT_STRICT_ENTITY_TYPES: list[str] = [
+        "compliance_assessment", "legal_entity", "data_object", "import", "seed", "audit_log",
+    ]
+    # Entries older than this many days move to compressed monthly files in
+    # AUDIT_ARCHIVE_DIR when archiving runs (0 keeps everything in the database)
+    AUDIT_RETENTION_DAYS: int = 0
+    AUDIT_ARCHIVE_DIR: str = "./data/audit-archive"
+
     # Initial admin (created on first startup if no users exist)
     ADMIN_EMAIL: str = "admin@example.com"
     ADMIN_PASSWORD: str = "admin123"
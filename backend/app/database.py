@@ -1,8 +1,15 @@
-from sqlalchemy import create_engine
+import logging
+import re
+import time
+
+from sqlalchemy import create_engine, inspect
 from sqlalchemy.orm import sessionmaker, DeclarativeBase
+from sqlalchemy.schema import CreateIndex
 
 from app.config import settings
 
+logger = logging.getLogger(__name__)
+
 connect_args = {}
 if settings.DATABASE_URL.startswith("sqlite"):
     connect_args["check_same_thread"] = False
@@ -15,9 +22,68 @@ class Base(DeclarativeBase):
     pass
 
 
+def _create_index(bind, index):
+    if bind.dialect.name == "postgresql":
+        # Build without blocking writes; CONCURRENTLY cannot run in a transaction.
+        ddl = str(CreateIndex(index, if_not_exists=True).compile(dialect=bind.dialect))
+        ddl = re.sub(r"^CREATE (UNIQUE )?INDEX", r"CREATE \1INDEX CONCURRENTLY", ddl)
+        with bind.connect().execution_options(isolation_level="AUTOCOMMIT") as conn:
+            conn.exec_driver_sql(ddl)
+    else:
+        index.create(bind, checkfirst=True)
+
+
+def upsert_insert(bind):
+    """The dialect's ``insert`` construct with ``on_conflict_do_update``, or
+    None where SQLAlchemy has none (callers fall back to portable SQL)."""
+    if bind.dialect.name == "sqlite":
+        from sqlalchemy.dialects.sqlite import insert
+    elif bind.dialect.name == "postgresql":
+        from sqlalchemy.dialects.postgresql import insert
+    else:
+        return None
+    return insert
+
+
+def ensure_indexes(bind) -> list[str]:
+    """Create model indexes missing from existing tables; returns their names.
+
+    ``create_all`` only creates indexes together with new tables, so indexes
+    added to a model later are created here — at startup, or ahead of a
+    deploy with ``python -m app.database``.  On Postgres they are built
+    ``CONCURRENTLY`` so a large table stays writable meanwhile.
+    """
+    inspector = inspect(bind)
+    existing_tables = set(inspector.get_table_names())
+    created = []
+    for table in Base.metadata.sorted_tables:
+        if table.name not in existing_tables:
+            continue
+        present = {ix["name"] for ix in inspector.get_indexes(table.name)}
+        for index in table.indexes:
+            if index.name not in present:
+                started = time.perf_counter()
+                _create_index(bind, index)
+                logger.info("Created index %s on %s in %.1fs", index.name, table.name, time.perf_counter() - started)
+                created.append(index.name)
+    return created
+
+
 def get_db():
     db = SessionLocal()
     try:
         yield db
     finally:
         db.close()
+
+
+def get_session_factory():
+    """For work that outlives the request's ``get_db`` session, e.g. a
+    streaming response body: open a session from this and close it yourself."""
+    return SessionLocal
+
+
+if __name__ == "__main__":
+    Base.metadata.create_all(bind=engine)
+    created = ensure_indexes(engine)
+    print(f"Created {len(created)} index(es): {', '.join(created)}" if created else "All indexes present")
@@ -0,0 +1,106 @@
+"""Response encoding: fast JSON and MessagePack content negotiation.
+
+:class:`APIResponse` is the application's default response class.  JSON is
+encoded with ``orjson`` when it is installed and with the stdlib otherwise
+(same compact, UTF-8 output as Starlette's ``JSONResponse``).  Clients that
+prefer ``application/msgpack`` in ``Accept`` get MessagePack instead, encoded
+with ``msgpack``; without it installed MessagePack is not offered and every
+client gets JSON.
+
+The format is chosen once per request by :class:`NegotiationMiddleware` and
+read by the response class through a context variable, so routers keep
+returning plain objects.
+"""
+import json
+from contextvars import ContextVar
+
+from starlette.datastructures import Headers
+from starlette.responses import JSONResponse
+from starlette.types import ASGIApp, Receive, Scope, Send
+
+try:
+    import orjson
+except ImportError:  # in requirements.txt; the stdlib encoder is the fallback
+    orjson = None
+
+try:
+    import msgpack
+except ImportError:  # in requirements.txt; without it only JSON is offered
+    msgpack = None
+
+JSON = "application/json"
+MSGPACK = "application/msgpack"
+_MSGPACK_ALIASES = (MSGPACK, "application/x-msgpack")
+
+response_format: ContextVar[str] = ContextVar("response_format", default=JSON)
+
+
+def dumps_json(content) -> bytes:
+    if orjson is not None:
+        return orjson.dumps(content, option=orjson.OPT_NON_STR_KEYS)
+    return json.dumps(content, ensure_ascii=False, allow_nan=False, indent=None, separators=(",", ":")).encode("utf-8")
+
+
+def dumps_msgpack(content) -> bytes:
+    return msgpack.packb(content, use_bin_type=True)
+
+
+def preferred_format(accept: str | None) -> str:
+    """``MSGPACK`` if the client ranks it above JSON in ``Accept``, else ``JSON``."""
+    if not accept or msgpack is None:
+        return JSON
+    best, best_q = JSON, 0.0
+    for part in accept.split(","):
+        media_type, _, params = part.strip().partition(";")
+        media_type = media_type.strip().lower()
+        q = 1.0
+        for param in params.split(";"):
+            key, _, value = param.strip().partition("=")
+            if key == "q":
+                try:
+                    q = float(value)
+                except ValueError:
+                    q = 0.0
+        if media_type in _MSGPACK_ALIASES and q > best_q:
+            best, best_q = MSGPACK, q
+        elif media_type == JSON and q >= best_q and q > 0:
+            best, best_q = JSON, q
+        elif media_type in ("application/*", "*/*") and q > best_q:
+            best, best_q = JSON, q
+    return best
+
+
+class APIResponse(JSONResponse):
+    """JSON or MessagePack, depending on the negotiated format.
+
+    Subclasses ``JSONResponse`` so FastAPI still documents response models.
+    """
+
+    media_type = JSON
+
+    def render(self, content) -> bytes:
+        if response_format.get() == MSGPACK:
+            self.media_type = MSGPACK
+            return dumps_msgpack(content)
+        return dumps_json(content)
+
+    def init_headers(self, headers=None):
+        super().init_headers(headers)
+        self.headers.add_vary_header("Accept")
+
+
+class NegotiationMiddleware:
+    """Pick the response format for the request from its ``Accept`` header."""
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        token = response_format.set(preferred_format(Headers(scope=scope).get("accept")))
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            response_format.reset(token)
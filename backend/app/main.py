@@ -8,15 +8,20 @@ from slowapi import _rate_limit_exceeded_handler
 from slowapi.errors import RateLimitExceeded
 from sqlalchemy import text
 
+from app.compression import CompressionMiddleware
 from app.config import settings
-from app.database import Base, engine, SessionLocal
+from app.encoding import APIResponse, NegotiationMiddleware
+from app.database import Base, engine, ensure_indexes, SessionLocal
 from app.logging_config import RequestLoggingMiddleware, setup_logging
 from app.models.user import User
-from app.services.auth_service import hash_password
+from app.services.audit_service import audit_writer
+from app.services.auth_service import hash_password, password_pool
+from app.services.derived_tables import ensure_all as ensure_derived_tables
+from app.services.table_versions import ensure_epoch
 from app.routers import (
     domains, applications, projects, vendors, demands,
     integrations, processes, entities, compliance, kpis,
-    data_objects, seed, export, dashboard, audit,
+    data_objects, seed, export, imports, dashboard, audit, batch, links, graph, search,
 )
 from app.routers import auth as auth_router
 from app.routers import admin as admin_router
@@ -47,12 +52,18 @@ async def lifespan(application: FastAPI):
         db_path = url.replace("sqlite:///", "")
         os.makedirs(os.path.dirname(db_path) or ".", exist_ok=True)
     Base.metadata.create_all(bind=engine)
+    ensure_indexes(engine)
     db = SessionLocal()
     try:
         _ensure_admin(db)
+        ensure_derived_tables(db)
+        ensure_epoch(db)
     finally:
         db.close()
+    if settings.AUDIT_ASYNC:
+        audit_writer.start(SessionLocal)
     yield
+    audit_writer.stop()
 
 
 app = FastAPI(
@@ -62,6 +73,7 @@ app = FastAPI(
     redoc_url="/api/redoc",
     openapi_url="/api/openapi.json",
     lifespan=lifespan,
+    default_response_class=APIResponse,
 )
 
 # Rate limiter (used by auth endpoints)
@@ -75,14 +87,26 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["X-Request-ID", "X-Next-Cursor", "X-Total-Estimate", "X-Missing-Ids", "ETag"],
 )
 
 # Structured request logging (adds X-Request-ID header)
 app.add_middleware(RequestLoggingMiddleware)
 
+# Response format negotiation (JSON / MessagePack)
+app.add_middleware(NegotiationMiddleware)
+
+# Response compression (outermost, so every response goes through it)
+app.add_middleware(
+    CompressionMiddleware,
+    minimum_size=settings.COMPRESSION_MINIMUM_SIZE,
+    cache_bytes=settings.COMPRESSION_CACHE_MB * 1024 * 1024,
+)
+
 # Auth & Admin
 app.include_router(auth_router.router, prefix="/api")
 app.include_router(admin_router.router, prefix="/api")
+app.include_router(admin_router.index_router, prefix="/api")
 
 # Dashboard
 app.include_router(dashboard.router, prefix="/api")
@@ -101,8 +125,13 @@ app.include_router(entities.router, prefix="/api")
 app.include_router(data_objects.router, prefix="/api")
 app.include_router(compliance.router, prefix="/api")
 app.include_router(kpis.router, prefix="/api")
+app.include_router(batch.router, prefix="/api")
+app.include_router(links.router, prefix="/api")
+app.include_router(graph.router, prefix="/api")
+app.include_router(search.router, prefix="/api")
 app.include_router(seed.router, prefix="/api")
 app.include_router(export.router, prefix="/api")
+app.include_router(imports.router, prefix="/api")
 
 # Audit log (admin-only)
 app.include_router(audit.router, prefix="/api")
@@ -123,5 +152,7 @@ def health_check():
         "status": "healthy" if db_ok else "degraded",
         "database": {"type": db_type, "connected": db_ok},
         "uptime_seconds": round(time.time() - _start_time),
+        "password_pool": password_pool.stats(),
+        "audit_writer": audit_writer.stats(),
         "version": "0.5.0",
     }
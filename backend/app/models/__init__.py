@@ -11,6 +11,11 @@ from app.models.kpi import ManagementKPI
 from app.models.data_object import DataObject
 from app.models.user import User
 from app.models.audit_log import AuditLog
+from app.models.id_sequence import IdSequence
+from app.models.rollup import PortfolioRollup
+from app.models.link import EntityLink
+from app.models.search import SearchDocument
+from app.models.table_version import TableVersion
 
 __all__ = [
     "Domain", "Capability", "SubCapability",
@@ -21,4 +26,5 @@ __all__ = [
     "ComplianceAssessment", "ManagementKPI",
     "DataObject",
     "User", "AuditLog",
+    "IdSequence", "PortfolioRollup", "EntityLink", "SearchDocument", "TableVersion",
 ]
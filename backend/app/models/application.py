@@ -9,9 +9,9 @@ class Application(Base):
     id = Column(String(50), primary_key=True)
     name = Column(String(255), nullable=False)
     vendor = Column(String(255))
-    category = Column(String(100))
+    category = Column(String(100), index=True)
     type = Column(String(100))
-    criticality = Column(String(100))
+    criticality = Column(String(100), index=True)
     time_quadrant = Column(String(100))
     business_owner = Column(String(255))
     it_owner = Column(String(255))
@@ -22,7 +22,7 @@ class Application(Base):
     scores = Column(JSON, default=dict)
     risk_probability = Column(String(50))
     risk_impact = Column(String(50))
-    lifecycle_status = Column(String(100))
+    lifecycle_status = Column(String(100), index=True)
     technology = Column(JSON, default=list)
     entities = Column(JSON, default=list)
     end_of_support_date = Column(String(50))
@@ -40,5 +40,5 @@ class CapabilityMapping(Base):
     __tablename__ = "capability_mappings"
 
     capability_id = Column(String(50), primary_key=True)
-    application_id = Column(String(50), primary_key=True)
+    application_id = Column(String(50), primary_key=True, index=True)
     role = Column(String(100))
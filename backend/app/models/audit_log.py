@@ -1,6 +1,6 @@
 from datetime import datetime, timezone
 
-from sqlalchemy import Column, Integer, String, Text, DateTime
+from sqlalchemy import Column, DateTime, Index, Integer, String, Text
 
 from app.database import Base
 
@@ -16,3 +16,15 @@ class AuditLog(Base):
     entity_type = Column(String(100), nullable=False)
     entity_id = Column(String(100), nullable=True)
     detail = Column(Text, nullable=True)
+
+    # Every listing is newest first, optionally filtered by one column, and
+    # pages by (timestamp, id); each index serves one filter without a sort.
+    __table_args__ = (
+        Index("ix_audit_log_timestamp_id", "timestamp", "id"),
+        Index("ix_audit_log_entity_type_timestamp", "entity_type", "timestamp", "id"),
+        Index("ix_audit_log_action_timestamp", "action", "timestamp", "id"),
+        Index("ix_audit_log_user_email_timestamp", "user_email", "timestamp", "id"),
+        Index("ix_audit_log_entity_history", "entity_type", "entity_id", "timestamp", "id"),
+        # Archiving can empty the table; never hand out an archived id again.
+        {"sqlite_autoincrement": True},
+    )
@@ -7,9 +7,9 @@ class ComplianceAssessment(Base):
     __tablename__ = "compliance_assessments"
 
     id = Column(String(50), primary_key=True)
-    app_id = Column(String(50))
-    regulation = Column(String(100))
-    status = Column(String(100))
+    app_id = Column(String(50), index=True)
+    regulation = Column(String(100), index=True)
+    status = Column(String(100), index=True)
     assessed_by = Column(String(255))
     assessed_date = Column(String(50))
     notes = Column(Text)
@@ -24,7 +24,7 @@ class Capability(Base):
     __tablename__ = "capabilities"
 
     id = Column(String(50), primary_key=True)
-    domain_id = Column(Integer, ForeignKey("domains.id", ondelete="CASCADE"), nullable=False)
+    domain_id = Column(Integer, ForeignKey("domains.id", ondelete="CASCADE"), nullable=False, index=True)
     name = Column(String(255), nullable=False)
     maturity = Column(Integer)
     target_maturity = Column(Integer)
@@ -38,7 +38,7 @@ class SubCapability(Base):
     __tablename__ = "sub_capabilities"
 
     id = Column(String(50), primary_key=True)
-    capability_id = Column(String(50), ForeignKey("capabilities.id", ondelete="CASCADE"), nullable=False)
+    capability_id = Column(String(50), ForeignKey("capabilities.id", ondelete="CASCADE"), nullable=False, index=True)
     name = Column(String(255), nullable=False)
 
     capability = relationship("Capability", back_populates="sub_capabilities")
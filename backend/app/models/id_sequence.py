@@ -0,0 +1,12 @@
+from sqlalchemy import Column, Integer, String
+
+from app.database import Base
+
+
+class IdSequence(Base):
+    """Last number handed out per ID prefix (``APP`` -> 42 means APP-042 was allocated)."""
+
+    __tablename__ = "id_sequences"
+
+    prefix = Column(String(20), primary_key=True)
+    last_value = Column(Integer, nullable=False, default=0)
@@ -7,8 +7,8 @@ class Integration(Base):
     __tablename__ = "integrations"
 
     id = Column(String(50), primary_key=True)
-    source_app_id = Column(String(50))
-    target_app_id = Column(String(50))
+    source_app_id = Column(String(50), index=True)
+    target_app_id = Column(String(50), index=True)
     interface_type = Column(String(100))
     protocol = Column(String(100))
     description = Column(Text)
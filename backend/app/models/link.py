@@ -0,0 +1,16 @@
+from sqlalchemy import Column, Index, String
+
+from app.database import Base
+
+
+class EntityLink(Base):
+    __tablename__ = "entity_links"
+
+    relation = Column(String(50), primary_key=True)
+    owner_id = Column(String(50), primary_key=True)
+    target_id = Column(String(255), primary_key=True)
+
+    __table_args__ = (
+        # Reverse lookups: "which owners reference this target" (in one or all relations).
+        Index("ix_entity_links_target", "target_id", "relation", "owner_id"),
+    )
@@ -16,7 +16,7 @@ class Project(Base):
     budget = Column(Float)
     start = Column(String(50))
     end = Column(String(50))
-    status = Column(String(50))
+    status = Column(String(50), index=True)
     status_text = Column(Text)
     sponsor = Column(String(255))
     project_lead = Column(String(255))
@@ -0,0 +1,13 @@
+from sqlalchemy import Column, String, Integer, Float
+
+from app.database import Base
+
+
+class PortfolioRollup(Base):
+    __tablename__ = "portfolio_rollups"
+
+    dimension = Column(String(50), primary_key=True)
+    group_key = Column(String(255), primary_key=True)
+    row_count = Column(Integer, nullable=False, default=0)
+    value_count = Column(Integer, nullable=False, default=0)
+    value_sum = Column(Float, nullable=False, default=0)
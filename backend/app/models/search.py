@@ -0,0 +1,49 @@
+from sqlalchemy import DDL, Column, Integer, String, Text, UniqueConstraint, event
+
+from app.database import Base
+
+
+class SearchDocument(Base):
+    """One searchable entity; the full-text index over it is dialect-specific (below)."""
+    __tablename__ = "search_documents"
+
+    id = Column(Integer, primary_key=True, autoincrement=True)
+    entity_type = Column(String(50), nullable=False)
+    entity_id = Column(String(50), nullable=False)
+    title = Column(String(255))
+    detail = Column(String(500))
+    body = Column(Text)
+
+    __table_args__ = (UniqueConstraint("entity_type", "entity_id", name="uq_search_documents_entity"),)
+
+
+# SQLite: an FTS5 index with the documents as external content, kept in step by
+# triggers, plus a vocabulary view of its terms for typo correction.
+_SQLITE_CREATE = [
+    "CREATE VIRTUAL TABLE search_fts USING fts5(title, body, content='search_documents', "
+    "content_rowid='id', tokenize='unicode61 remove_diacritics 2', prefix='2 3')",
+    "CREATE VIRTUAL TABLE search_vocab USING fts5vocab(search_fts, 'row')",
+    "CREATE TRIGGER search_documents_ai AFTER INSERT ON search_documents BEGIN "
+    "INSERT INTO search_fts(rowid, title, body) VALUES (new.id, new.title, new.body); END",
+    "CREATE TRIGGER search_documents_ad AFTER DELETE ON search_documents BEGIN "
+    "INSERT INTO search_fts(search_fts, rowid, title, body) VALUES ('delete', old.id, old.title, old.body); END",
+    "CREATE TRIGGER search_documents_au AFTER UPDATE ON search_documents BEGIN "
+    "INSERT INTO search_fts(search_fts, rowid, title, body) VALUES ('delete', old.id, old.title, old.body); "
+    "INSERT INTO search_fts(rowid, title, body) VALUES (new.id, new.title, new.body); END",
+]
+_SQLITE_DROP = ["DROP TABLE IF EXISTS search_vocab", "DROP TABLE IF EXISTS search_fts"]
+
+# PostgreSQL: a weighted tsvector column (title A, body B) with a GIN index.
+_POSTGRES_CREATE = [
+    "ALTER TABLE search_documents ADD COLUMN search_vector tsvector GENERATED ALWAYS AS ("
+    "setweight(to_tsvector('simple', coalesce(title, '')), 'A') || "
+    "setweight(to_tsvector('simple', coalesce(body, '')), 'B')) STORED",
+    "CREATE INDEX ix_search_documents_vector ON search_documents USING GIN (search_vector)",
+]
+
+for _statement in _SQLITE_CREATE:
+    event.listen(SearchDocument.__table__, "after_create", DDL(_statement).execute_if(dialect="sqlite"))
+for _statement in _SQLITE_DROP:
+    event.listen(SearchDocument.__table__, "before_drop", DDL(_statement).execute_if(dialect="sqlite"))
+for _statement in _POSTGRES_CREATE:
+    event.listen(SearchDocument.__table__, "after_create", DDL(_statement).execute_if(dialect="postgresql"))
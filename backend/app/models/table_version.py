@@ -0,0 +1,10 @@
+from sqlalchemy import Column, String, Integer
+
+from app.database import Base
+
+
+class TableVersion(Base):
+    __tablename__ = "table_versions"
+
+    table_name = Column(String(100), primary_key=True)
+    version = Column(Integer, nullable=False, default=0)
@@ -1,13 +1,17 @@
 from fastapi import APIRouter, Depends, HTTPException, status
 from sqlalchemy.orm import Session
+from starlette.concurrency import run_in_threadpool
 
 from app.database import get_db
 from app.models.user import User
-from app.services.auth_service import hash_password
+from app.services.auth_service import hash_password_async
 from app.schemas.user import UserRead, UserCreate, UserUpdate
 from app.auth import require_role
+from app.services.table_versions import conditional_get
+from app.services.index_advisor import index_advisor
+from app.services.principal_cache import principal_cache
 
-router = APIRouter(prefix="/admin/users", tags=["admin"])
+router = APIRouter(prefix="/admin/users", tags=["admin"], dependencies=[Depends(conditional_get(User, auth=require_role("admin")))])
 
 
 @router.get("", response_model=list[UserRead])
@@ -30,21 +34,30 @@ def get_user(
     return user
 
 
+# Password hashing is awaited on the event loop; the database work runs on
+# the threadpool as in a sync route.
+
+
 @router.post("", response_model=UserRead, status_code=201)
-def create_user(
+async def create_user(
     data: UserCreate,
     db: Session = Depends(get_db),
     _admin: User = Depends(require_role("admin")),
 ):
     if data.role not in ("admin", "editor", "viewer"):
         raise HTTPException(status_code=400, detail="Invalid role")
+    password_hash = await hash_password_async(data.password)
+    return await run_in_threadpool(_insert_user, db, data, password_hash)
+
+
+def _insert_user(db: Session, data: UserCreate, password_hash: str) -> User:
     existing = db.query(User).filter(User.email == data.email).first()
     if existing:
         raise HTTPException(status_code=409, detail="Email already registered")
     user = User(
         email=data.email,
         name=data.name,
-        password_hash=hash_password(data.password),
+        password_hash=password_hash,
         role=data.role,
         is_active=data.is_active,
     )
@@ -55,12 +68,17 @@ def create_user(
 
 
 @router.put("/{user_id}", response_model=UserRead)
-def update_user(
+async def update_user(
     user_id: int,
     data: UserUpdate,
     db: Session = Depends(get_db),
     _admin: User = Depends(require_role("admin")),
 ):
+    password_hash = None if data.password is None else await hash_password_async(data.password)
+    return await run_in_threadpool(_update_user, db, user_id, data, password_hash)
+
+
+def _update_user(db: Session, user_id: int, data: UserUpdate, password_hash: str | None) -> User:
     user = db.query(User).filter(User.id == user_id).first()
     if not user:
         raise HTTPException(status_code=404, detail="User not found")
@@ -71,8 +89,8 @@ def update_user(
         user.email = data.email
     if data.name is not None:
         user.name = data.name
-    if data.password is not None:
-        user.password_hash = hash_password(data.password)
+    if password_hash is not None:
+        user.password_hash = password_hash
     if data.role is not None:
         if data.role not in ("admin", "editor", "viewer"):
             raise HTTPException(status_code=400, detail="Invalid role")
@@ -80,6 +98,7 @@ def update_user(
     if data.is_active is not None:
         user.is_active = data.is_active
     db.commit()
+    principal_cache.invalidate_user(user_id)
     db.refresh(user)
     return user
 
@@ -97,3 +116,22 @@ def delete_user(
         raise HTTPException(status_code=400, detail="Cannot delete yourself")
     db.delete(user)
     db.commit()
+    principal_cache.invalidate_user(user_id)
+
+
+# Filter statistics live in process memory, so no table-version ETag here.
+index_router = APIRouter(prefix="/admin/index-advisor", tags=["admin"])
+
+
+@index_router.get("")
+def index_report(
+    db: Session = Depends(get_db),
+    _admin: User = Depends(require_role("admin")),
+):
+    """Filters received by list endpoints of this process and the index serving each."""
+    return index_advisor.report(db)
+
+
+@index_router.delete("", status_code=204)
+def reset_index_stats(_admin: User = Depends(require_role("admin"))):
+    index_advisor.clear()
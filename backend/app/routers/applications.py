@@ -1,64 +1,91 @@
 import uuid
-from fastapi import APIRouter, Depends, HTTPException, Query, Header
+from fastapi import APIRouter, Depends, HTTPException, Query, Header, Response
 from sqlalchemy.orm import Session
 
 from app.database import get_db
 from app.models.application import Application, CapabilityMapping
 from app.models.user import User
+from app.schemas.batch import BatchGetRequest, BatchGetResponse
 from app.schemas.application import (
     ApplicationCreate, ApplicationRead, ApplicationUpdate,
     CapabilityMappingCreate, CapabilityMappingRead, CapabilityMappingUpdate,
 )
 from app.auth import get_current_user, require_role
+from app.services.table_versions import conditional_get
 from app.services.audit_service import write_audit
+from app.services.id_allocator import next_id
+from app.services.link_service import linked
+from app.services.list_reader import FieldSet, ListReader
+from app.services.pagination import PageParams, paginate
 
-router = APIRouter(prefix="/applications", tags=["applications"])
-
-
-def _generate_app_id(db: Session) -> str:
-    existing = db.query(Application.id).all()
-    nums = []
-    for (aid,) in existing:
-        if aid.startswith("APP-"):
-            try:
-                nums.append(int(aid[4:]))
-            except ValueError:
-                pass
-    next_num = max(nums, default=0) + 1
-    return f"APP-{next_num:03d}"
+router = APIRouter(prefix="/applications", tags=["applications"], dependencies=[Depends(conditional_get(Application, CapabilityMapping))])
+_reader = ListReader(Application, ApplicationRead)
 
 
 @router.get("", response_model=list[ApplicationRead])
 def list_applications(
+    response: Response,
     category: str | None = Query(None),
     criticality: str | None = Query(None),
     lifecycle_status: str | None = Query(None),
+    entity: str | None = Query(None, description="Only applications used by this legal entity"),
+    technology: str | None = Query(None, description="Only applications on this technology"),
+    regulation: str | None = Query(None, description="Only applications subject to this regulation"),
+    page: PageParams = Depends(),
+    fields: FieldSet = Depends(_reader.fieldset),
+    ids: list | None = Depends(_reader.id_list),
     db: Session = Depends(get_db),
     _user: User = Depends(get_current_user),
 ):
-    q = db.query(Application)
+    if ids is not None:
+        return _reader.by_ids_response(db, ids, response, fields)
+    q = _reader.query(db, fields)
     if category:
         q = q.filter(Application.category == category)
     if criticality:
         q = q.filter(Application.criticality == criticality)
     if lifecycle_status:
         q = q.filter(Application.lifecycle_status == lifecycle_status)
-    return q.all()
+    if entity is not None:
+        q = q.filter(linked("application_entities", entity))
+    if technology is not None:
+        q = q.filter(linked("application_technology", technology))
+    if regulation is not None:
+        q = q.filter(linked("application_regulations", regulation))
+    return _reader.response(db, paginate(q, response, page), response, fields)
+
+
+@router.post("/by-ids", response_model=BatchGetResponse[ApplicationRead])
+def get_applications_by_ids(
+    data: BatchGetRequest,
+    response: Response,
+    db: Session = Depends(get_db),
+    _user: User = Depends(get_current_user),
+):
+    """Fetch many applications at once, in request order; unknown ids are listed in ``missing``."""
+    ids = _reader.coerce_ids(data.ids)
+    return _reader.by_ids_response(db, ids, response, _reader.fieldset_from_list(data.fields), envelope=True)
 
 
 @router.get("/{app_id}", response_model=ApplicationRead)
-def get_application(app_id: str, db: Session = Depends(get_db), _user: User = Depends(get_current_user)):
-    app = db.query(Application).filter(Application.id == app_id).first()
+def get_application(
+    app_id: str,
+    response: Response,
+    fields: FieldSet = Depends(_reader.fieldset),
+    db: Session = Depends(get_db),
+    _user: User = Depends(get_current_user),
+):
+    app = _reader.query(db, fields).filter(Application.id == app_id).first()
     if not app:
         raise HTTPException(status_code=404, detail="Application not found")
-    return app
+    return _reader.item_response(db, app, response, fields)
 
 
 @router.post("", response_model=ApplicationRead, status_code=201)
 def create_application(data: ApplicationCreate, db: Session = Depends(get_db), user: User = Depends(require_role("admin", "editor"))):
     app_dict = data.model_dump()
     if app_dict.get("id") is None:
-        app_dict["id"] = _generate_app_id(db)
+        app_dict["id"] = next_id(db, Application, "APP")
     application = Application(**app_dict)
     db.add(application)
     write_audit(db, user, "CREATE", "application", application.id)
@@ -106,22 +133,26 @@ def delete_application(app_id: str, db: Session = Depends(get_db), user: User =
 
 # --- Capability Mappings ---
 
-mapping_router = APIRouter(prefix="/capability-mappings", tags=["capability-mappings"])
+mapping_router = APIRouter(prefix="/capability-mappings", tags=["capability-mappings"], dependencies=[Depends(conditional_get(Application, CapabilityMapping))])
+_mapping_reader = ListReader(CapabilityMapping, CapabilityMappingRead)
 
 
 @mapping_router.get("", response_model=list[CapabilityMappingRead])
 def list_mappings(
+    response: Response,
     application_id: str | None = Query(None),
     capability_id: str | None = Query(None),
+    page: PageParams = Depends(),
+    fields: FieldSet = Depends(_mapping_reader.fieldset),
     db: Session = Depends(get_db),
     _user: User = Depends(get_current_user),
 ):
-    q = db.query(CapabilityMapping)
+    q = _mapping_reader.query(db, fields)
     if application_id:
         q = q.filter(CapabilityMapping.application_id == application_id)
     if capability_id:
         q = q.filter(CapabilityMapping.capability_id == capability_id)
-    return q.all()
+    return _mapping_reader.response(db, paginate(q, response, page), response, fields)
 
 
 @mapping_router.post("", response_model=CapabilityMappingRead, status_code=201)
@@ -1,13 +1,38 @@
 """Admin-accessible audit log endpoint."""
-from fastapi import APIRouter, Depends, Query
+from datetime import datetime
+
+from fastapi import APIRouter, Depends, HTTPException, Query
 from sqlalchemy.orm import Session
 
 from app.database import get_db
 from app.models.user import User
 from app.models.audit_log import AuditLog
 from app.auth import require_role
+from app.config import settings
+from app.services import audit_archive, audit_query
+from app.services.audit_service import flush_audit_log, write_audit
+from app.services.table_versions import conditional_get
+
+router = APIRouter(prefix="/admin/audit-log", tags=["admin"], dependencies=[Depends(flush_audit_log), Depends(conditional_get(AuditLog, auth=require_role("admin")))])
+
+
+class _Range:
+    """Time range and archive search shared by the audit-log listings."""
 
-router = APIRouter(prefix="/admin/audit-log", tags=["admin"])
+    def __init__(
+        self,
+        since: datetime | None = Query(None, description="Only entries at or after this time"),
+        until: datetime | None = Query(None, description="Only entries before this time"),
+        include_archive: bool = Query(False, description="Also search archived entries (slower)"),
+    ):
+        self.since = audit_query.as_stored(since)
+        self.until = audit_query.as_stored(until)
+        self.include_archive = include_archive
+
+    def archived(self, **filters):
+        if not self.include_archive:
+            return None
+        return lambda position, limit: audit_archive.search(filters, limit, position, self.since, self.until)
 
 
 @router.get("")
@@ -15,33 +40,57 @@ def list_audit_log(
     entity_type: str | None = Query(None),
     action: str | None = Query(None),
     user_email: str | None = Query(None),
-    limit: int = Query(100, le=500),
-    offset: int = Query(0),
+    limit: int = Query(100, ge=1, le=500),
+    before: str | None = Query(None, description="Cursor from the previous page's nextCursor"),
+    offset: int = Query(0, ge=0, description="Deprecated: scans all skipped rows; use before"),
+    time_range: _Range = Depends(),
     db: Session = Depends(get_db),
     _admin: User = Depends(require_role("admin")),
 ):
-    q = db.query(AuditLog).order_by(AuditLog.timestamp.desc())
-    if entity_type:
-        q = q.filter(AuditLog.entity_type == entity_type)
-    if action:
-        q = q.filter(AuditLog.action == action)
-    if user_email:
-        q = q.filter(AuditLog.user_email == user_email)
-    total = q.count()
-    entries = q.offset(offset).limit(limit).all()
+    """Entries newest first.  ``total`` is exact up to 10,000 and an estimate
+    beyond; it covers the live table only, not archived entries."""
+    filters = {"entity_type": entity_type, "action": action, "user_email": user_email}
+    q = audit_query.filtered(db, time_range.since, time_range.until, **filters)
+    entries, next_cursor = audit_query.page(q, limit, before, offset, time_range.archived(**filters))
+    is_filtered = any(filters.values()) or time_range.since is not None or time_range.until is not None
+    total, is_estimate = audit_query.count(db, q, is_filtered)
     return {
         "total": total,
-        "entries": [
-            {
-                "id": e.id,
-                "timestamp": e.timestamp.isoformat() if e.timestamp else None,
-                "userId": e.user_id,
-                "userEmail": e.user_email,
-                "action": e.action,
-                "entityType": e.entity_type,
-                "entityId": e.entity_id,
-                "detail": e.detail,
-            }
-            for e in entries
-        ],
+        "totalIsEstimate": is_estimate,
+        "nextCursor": next_cursor,
+        "entries": [audit_query.entry_dict(e) for e in entries],
     }
+
+
+@router.get("/history/{entity_type}/{entity_id:path}")
+def entity_history(
+    entity_type: str,
+    entity_id: str,
+    limit: int = Query(100, ge=1, le=500),
+    before: str | None = Query(None, description="Cursor from the previous page's nextCursor"),
+    time_range: _Range = Depends(),
+    db: Session = Depends(get_db),
+    _admin: User = Depends(require_role("admin")),
+):
+    """Changes to one entity, newest first (composite ids like ``CAP-001/APP-002``)."""
+    filters = {"entity_type": entity_type, "entity_id": entity_id}
+    q = audit_query.filtered(db, time_range.since, time_range.until, **filters)
+    entries, next_cursor = audit_query.page(q, limit, before, archived=time_range.archived(**filters))
+    return {"nextCursor": next_cursor, "entries": [audit_query.entry_dict(e) for e in entries]}
+
+
+@router.post("/archive")
+def archive_audit_log(
+    older_than_days: int | None = Query(None, ge=1, description="Defaults to AUDIT_RETENTION_DAYS"),
+    db: Session = Depends(get_db),
+    admin: User = Depends(require_role("admin")),
+):
+    """Move entries older than the retention period to the compressed archive."""
+    days = older_than_days or settings.AUDIT_RETENTION_DAYS
+    if days <= 0:
+        raise HTTPException(status_code=400, detail="No retention period: pass older_than_days or set AUDIT_RETENTION_DAYS")
+    cutoff = audit_archive.retention_cutoff(days)
+    result = audit_archive.archive_entries(db, cutoff)
+    write_audit(db, admin, "ARCHIVE", "audit_log", None, f"{result['archived']} entries before {cutoff.isoformat()}")
+    db.commit()
+    return result
@@ -1,14 +1,20 @@
+import asyncio
+from contextlib import asynccontextmanager
 from datetime import datetime, timezone
 
 from fastapi import APIRouter, Depends, HTTPException, status, Request
 from sqlalchemy.orm import Session
 from slowapi import Limiter
 from slowapi.util import get_remote_address
+from starlette.concurrency import run_in_threadpool
 
+from app.config import settings
 from app.database import get_db
 from app.models.user import User
 from app.services.auth_service import (
-    verify_password,
+    hash_password_async,
+    verify_password_async,
+    password_needs_rehash,
     create_access_token,
     create_refresh_token,
     decode_token,
@@ -22,29 +28,61 @@ from app.schemas.user import (
     ProfileUpdate,
 )
 from app.auth import get_current_user
+from app.services.principal_cache import principal_cache
 
 router = APIRouter(prefix="/auth", tags=["auth"])
 limiter = Limiter(key_func=get_remote_address)
 
 
-@router.post("/login", response_model=TokenResponse)
-@limiter.limit("5/minute")
-def login(request: Request, data: LoginRequest, db: Session = Depends(get_db)):
-    user = db.query(User).filter(User.email == data.email).first()
-    if not user or not verify_password(data.password, user.password_hash):
+_login_slots: tuple[asyncio.AbstractEventLoop, asyncio.Semaphore] | None = None
+
+
+@asynccontextmanager
+async def _login_slot():
+    """Admit at most LOGIN_CONCURRENCY logins at once; answer 503 if the wait is too long."""
+    global _login_slots
+    loop = asyncio.get_running_loop()
+    if _login_slots is None or _login_slots[0] is not loop:
+        _login_slots = (loop, asyncio.Semaphore(settings.LOGIN_CONCURRENCY))
+    semaphore = _login_slots[1]
+    try:
+        await asyncio.wait_for(semaphore.acquire(), settings.LOGIN_QUEUE_TIMEOUT_SECONDS)
+    except asyncio.TimeoutError:
         raise HTTPException(
-            status_code=status.HTTP_401_UNAUTHORIZED,
-            detail="Invalid email or password",
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Too many concurrent logins, please retry",
+            headers={"Retry-After": "1"},
         )
-    if not user.is_active:
-        raise HTTPException(
-            status_code=status.HTTP_403_FORBIDDEN,
-            detail="Account is disabled",
+    try:
+        yield
+    finally:
+        semaphore.release()
+
+
+@router.post("/login", response_model=TokenResponse)
+@limiter.limit("5/minute")
+async def login(request: Request, data: LoginRequest, db: Session = Depends(get_db)):
+    async with _login_slot():
+        user = await run_in_threadpool(
+            lambda: db.query(User).filter(User.email == data.email).first()
         )
-    user.last_login = datetime.now(timezone.utc)
-    db.commit()
+        if not user or not await verify_password_async(data.password, user.password_hash):
+            raise HTTPException(
+                status_code=status.HTTP_401_UNAUTHORIZED,
+                detail="Invalid email or password",
+            )
+        if not user.is_active:
+            raise HTTPException(
+                status_code=status.HTTP_403_FORBIDDEN,
+                detail="Account is disabled",
+            )
+        if password_needs_rehash(user.password_hash):
+            user.password_hash = await hash_password_async(data.password)
+        user.last_login = datetime.now(timezone.utc)
+        token_data = {"sub": str(user.id), "email": user.email, "role": user.role}
+        await run_in_threadpool(db.commit)
+    principal_cache.invalidate_user(int(token_data["sub"]))
 
-    token_data = {"sub": str(user.id), "email": user.email, "role": user.role}
     return TokenResponse(
         access_token=create_access_token(token_data),
         refresh_token=create_refresh_token(token_data),
@@ -75,16 +113,23 @@ def get_me(user: User = Depends(get_current_user)):
 
 
 @router.put("/me", response_model=UserRead)
-def update_me(
+async def update_me(
     data: ProfileUpdate,
-    user: User = Depends(get_current_user),
+    current: User = Depends(get_current_user),
     db: Session = Depends(get_db),
 ):
+    password_hash = None if data.password is None else await hash_password_async(data.password)
+    return await run_in_threadpool(_update_profile, db, current.id, data, password_hash)
+
+
+def _update_profile(db: Session, user_id: int, data: ProfileUpdate, password_hash: str | None) -> User:
+    # The authenticated user may be a cached snapshot; modify the stored row.
+    user = db.get(User, user_id)
     if data.name is not None:
         user.name = data.name
-    if data.password is not None:
-        from app.services.auth_service import hash_password
-        user.password_hash = hash_password(data.password)
+    if password_hash is not None:
+        user.password_hash = password_hash
     db.commit()
+    principal_cache.invalidate_user(user.id)
     db.refresh(user)
     return user
@@ -0,0 +1,26 @@
+from fastapi import APIRouter, Depends
+from sqlalchemy.orm import Session
+
+from app.auth import require_role
+from app.database import get_db
+from app.encoding import APIResponse
+from app.models.user import User
+from app.schemas.batch import BatchWriteRequest, BatchWriteResponse
+from app.services.batch_service import NOT_APPLIED_STATUS, apply_batch
+
+router = APIRouter(prefix="/batch", tags=["batch"])
+
+
+@router.post("", response_model=BatchWriteResponse)
+def apply_operations(data: BatchWriteRequest, db: Session = Depends(get_db), user: User = Depends(require_role("admin", "editor"))):
+    """Create, update and delete many entities in one transaction.
+
+    Either every operation is applied or none is.  On failure the response
+    has the status of the first failing operation and reports each
+    operation's own status; operations that were valid but not applied get 424.
+    """
+    result = apply_batch(db, user, data.operations)
+    if result.committed:
+        return result
+    status = next(r.status for r in result.results if r.status != NOT_APPLIED_STATUS)
+    return APIResponse(result.model_dump(), status_code=status)
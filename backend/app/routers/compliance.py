@@ -1,59 +1,79 @@
-from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi import APIRouter, Depends, HTTPException, Query, Response
 from sqlalchemy.orm import Session
 
 from app.database import get_db
 from app.models.compliance import ComplianceAssessment
 from app.models.user import User
 from app.auth import get_current_user, require_role
+from app.services.table_versions import conditional_get
 from app.services.audit_service import write_audit
+from app.services.id_allocator import next_id
+from app.services.list_reader import FieldSet, ListReader
+from app.services.pagination import PageParams, paginate
+from app.schemas.batch import BatchGetRequest, BatchGetResponse
 from app.schemas.compliance import (
     ComplianceAssessmentCreate, ComplianceAssessmentRead, ComplianceAssessmentUpdate,
 )
 
-router = APIRouter(prefix="/compliance", tags=["compliance"])
+router = APIRouter(prefix="/compliance", tags=["compliance"], dependencies=[Depends(conditional_get(ComplianceAssessment))])
+_reader = ListReader(ComplianceAssessment, ComplianceAssessmentRead)
 
 
 @router.get("", response_model=list[ComplianceAssessmentRead])
 def list_assessments(
+    response: Response,
     app_id: str | None = Query(None),
     regulation: str | None = Query(None),
     status: str | None = Query(None),
+    page: PageParams = Depends(),
+    fields: FieldSet = Depends(_reader.fieldset),
+    ids: list | None = Depends(_reader.id_list),
     db: Session = Depends(get_db),
     _user: User = Depends(get_current_user),
 ):
-    q = db.query(ComplianceAssessment)
+    if ids is not None:
+        return _reader.by_ids_response(db, ids, response, fields)
+    q = _reader.query(db, fields)
     if app_id:
         q = q.filter(ComplianceAssessment.app_id == app_id)
     if regulation:
         q = q.filter(ComplianceAssessment.regulation == regulation)
     if status:
         q = q.filter(ComplianceAssessment.status == status)
-    return q.all()
+    return _reader.response(db, paginate(q, response, page), response, fields)
+
+
+@router.post("/by-ids", response_model=BatchGetResponse[ComplianceAssessmentRead])
+def get_assessments_by_ids(
+    data: BatchGetRequest,
+    response: Response,
+    db: Session = Depends(get_db),
+    _user: User = Depends(get_current_user),
+):
+    """Fetch many assessments at once, in request order; unknown ids are listed in ``missing``."""
+    ids = _reader.coerce_ids(data.ids)
+    return _reader.by_ids_response(db, ids, response, _reader.fieldset_from_list(data.fields), envelope=True)
 
 
 @router.get("/{assessment_id}", response_model=ComplianceAssessmentRead)
-def get_assessment(assessment_id: str, db: Session = Depends(get_db), _user: User = Depends(get_current_user)):
-    assessment = db.query(ComplianceAssessment).filter(
-        ComplianceAssessment.id == assessment_id
-    ).first()
+def get_assessment(
+    assessment_id: str,
+    response: Response,
+    fields: FieldSet = Depends(_reader.fieldset),
+    db: Session = Depends(get_db),
+    _user: User = Depends(get_current_user),
+):
+    assessment = _reader.query(db, fields).filter(ComplianceAssessment.id == assessment_id).first()
     if not assessment:
         raise HTTPException(status_code=404, detail="Assessment not found")
-    return assessment
+    return _reader.item_response(db, assessment, response, fields)
 
 
 @router.post("", response_model=ComplianceAssessmentRead, status_code=201)
 def create_assessment(data: ComplianceAssessmentCreate, db: Session = Depends(get_db), user: User = Depends(require_role("admin", "editor"))):
     assessment_dict = data.model_dump()
     if not assessment_dict.get("id"):
-        existing = db.query(ComplianceAssessment.id).all()
-        nums = []
-        for (aid,) in existing:
-            if aid and aid.startswith("CA-"):
-                try:
-                    nums.append(int(aid.split("-")[1]))
-                except ValueError:
-                    pass
-        assessment_dict["id"] = f"CA-{max(nums, default=0) + 1:03d}"
+        assessment_dict["id"] = next_id(db, ComplianceAssessment, "CA")
     assessment = ComplianceAssessment(**assessment_dict)
     db.add(assessment)
     write_audit(db, user, "CREATE", "compliance_assessment", assessment.id)
@@ -1,20 +1,92 @@
-"""Aggregated dashboard endpoints."""
-from fastapi import APIRouter, Depends
+"""Aggregated dashboard endpoints.
+
+All widgets read the event-maintained ``portfolio_rollups`` table (see
+:mod:`app.services.rollup_service`), so any set of widgets costs one indexed
+query over O(groups) rows.
+"""
+from fastapi import APIRouter, Depends, HTTPException, Query
 from sqlalchemy.orm import Session
-from sqlalchemy import func
 
 from app.database import get_db
+from app.models.rollup import PortfolioRollup
 from app.models.user import User
-from app.models.application import Application
-from app.models.domain import Domain
-from app.models.project import Project
-from app.models.vendor import Vendor
-from app.models.demand import Demand
-from app.models.compliance import ComplianceAssessment
-from app.models.integration import Integration
-from app.auth import get_current_user
+from app.auth import get_current_user, require_role
+from app.services.table_versions import conditional_get
+from app.services.audit_service import write_audit
+from app.services.rollup_service import ROLLUPS, read_rollups, rebuild_rollups
+
+_ETAG_MODELS = {PortfolioRollup, *(r.model for r in ROLLUPS)}
+router = APIRouter(prefix="/dashboard", tags=["dashboard"], dependencies=[Depends(conditional_get(*_ETAG_MODELS))])
+
+# Widget name -> rollup dimension.  Widgets return ``{group: count}``.
+WIDGETS = {
+    "summary": "summary",
+    "time-distribution": "app_time_quadrant",
+    "application-categories": "app_category",
+    "criticality-distribution": "app_criticality",
+    "compliance-status": "compliance_status",
+    "compliance-regulations": "compliance_regulation",
+    "project-status": "project_status",
+}
+DIMENSIONS = list(dict.fromkeys(r.dimension for r in ROLLUPS))
+_SUMMARY_KEYS = [r.label for r in ROLLUPS if r.dimension == "summary"]
+
+
+def compute_widgets(db: Session, names: list[str]) -> dict:
+    """Compute the given widgets with one SQL statement."""
+    rollups = read_rollups(db, [WIDGETS[name] for name in names])
+    result = {}
+    for name in names:
+        counts = {key: stats["count"] for key, stats in rollups[WIDGETS[name]].items()}
+        if name == "summary":
+            counts = {key: counts.get(key, 0) for key in _SUMMARY_KEYS}
+        result[name] = counts
+    return result
+
+
+@router.get("/bundle")
+def dashboard_bundle(
+    widgets: str | None = Query(None, description=f"Comma-separated subset of: {', '.join(WIDGETS)}"),
+    db: Session = Depends(get_db),
+    _user: User = Depends(get_current_user),
+):
+    """Several dashboard widgets in one request and one SQL statement."""
+    names = list(WIDGETS) if not widgets else list(dict.fromkeys(w.strip() for w in widgets.split(",") if w.strip()))
+    unknown = [n for n in names if n not in WIDGETS]
+    if unknown:
+        raise HTTPException(status_code=400, detail=f"Unknown widgets: {', '.join(unknown)}")
+    return compute_widgets(db, names)
 
-router = APIRouter(prefix="/dashboard", tags=["dashboard"])
+
+@router.get("/rollups")
+def dashboard_rollups(
+    dimensions: str | None = Query(None, description=f"Comma-separated subset of: {', '.join(DIMENSIONS)}"),
+    db: Session = Depends(get_db),
+    _user: User = Depends(get_current_user),
+):
+    """Count, total and average of the rollup value per group.
+
+    Values are yearly application cost, project budget or capability maturity,
+    depending on the dimension; ``project_domain`` and ``capability_maturity``
+    are keyed by domain id.
+    """
+    names = DIMENSIONS if not dimensions else [d.strip() for d in dimensions.split(",") if d.strip()]
+    unknown = [n for n in names if n not in DIMENSIONS]
+    if unknown:
+        raise HTTPException(status_code=400, detail=f"Unknown dimensions: {', '.join(unknown)}")
+    return read_rollups(db, names)
+
+
+@router.post("/rollups/rebuild")
+def rebuild_dashboard_rollups(
+    db: Session = Depends(get_db),
+    user: User = Depends(require_role("admin")),
+):
+    """Recompute all rollups from the source tables (repair)."""
+    rows = rebuild_rollups(db)
+    write_audit(db, user, "UPDATE", "rollups", "all", detail=f"Rebuilt {rows} rollup rows")
+    db.commit()
+    return {"rows": rows}
 
 
 @router.get("/summary")
@@ -23,15 +95,7 @@ def dashboard_summary(
     _user: User = Depends(get_current_user),
 ):
     """High-level counts for the executive summary."""
-    return {
-        "applications": db.query(func.count(Application.id)).scalar(),
-        "domains": db.query(func.count(Domain.id)).scalar(),
-        "projects": db.query(func.count(Project.id)).scalar(),
-        "vendors": db.query(func.count(Vendor.id)).scalar(),
-        "demands": db.query(func.count(Demand.id)).scalar(),
-        "integrations": db.query(func.count(Integration.id)).scalar(),
-        "complianceAssessments": db.query(func.count(ComplianceAssessment.id)).scalar(),
-    }
+    return compute_widgets(db, ["summary"])["summary"]
 
 
 @router.get("/time-distribution")
@@ -40,13 +104,7 @@ def time_distribution(
     _user: User = Depends(get_current_user),
 ):
     """Application count per TIME quadrant (Tolerate/Invest/Migrate/Eliminate)."""
-    rows = (
-        db.query(Application.time_quadrant, func.count(Application.id))
-        .filter(Application.time_quadrant.isnot(None))
-        .group_by(Application.time_quadrant)
-        .all()
-    )
-    return {quadrant: count for quadrant, count in rows}
+    return compute_widgets(db, ["time-distribution"])["time-distribution"]
 
 
 @router.get("/application-categories")
@@ -55,13 +113,7 @@ def application_categories(
     _user: User = Depends(get_current_user),
 ):
     """Application count per category."""
-    rows = (
-        db.query(Application.category, func.count(Application.id))
-        .filter(Application.category.isnot(None))
-        .group_by(Application.category)
-        .all()
-    )
-    return {cat: count for cat, count in rows}
+    return compute_widgets(db, ["application-categories"])["application-categories"]
 
 
 @router.get("/criticality-distribution")
@@ -70,13 +122,7 @@ def criticality_distribution(
     _user: User = Depends(get_current_user),
 ):
     """Application count per criticality level."""
-    rows = (
-        db.query(Application.criticality, func.count(Application.id))
-        .filter(Application.criticality.isnot(None))
-        .group_by(Application.criticality)
-        .all()
-    )
-    return {crit: count for crit, count in rows}
+    return compute_widgets(db, ["criticality-distribution"])["criticality-distribution"]
 
 
 @router.get("/compliance-status")
@@ -85,10 +131,4 @@ def compliance_status(
     _user: User = Depends(get_current_user),
 ):
     """Compliance assessment count per status."""
-    rows = (
-        db.query(ComplianceAssessment.status, func.count(ComplianceAssessment.id))
-        .filter(ComplianceAssessment.status.isnot(None))
-        .group_by(ComplianceAssessment.status)
-        .all()
-    )
-    return {status: count for status, count in rows}
+    return compute_widgets(db, ["compliance-status"])["compliance-status"]
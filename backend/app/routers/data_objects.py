@@ -1,54 +1,78 @@
-from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi import APIRouter, Depends, HTTPException, Query, Response
 from sqlalchemy.orm import Session
 
 from app.database import get_db
 from app.models.data_object import DataObject
 from app.models.user import User
 from app.auth import get_current_user, require_role
+from app.services.table_versions import conditional_get
 from app.services.audit_service import write_audit
+from app.services.id_allocator import next_id
+from app.services.link_service import linked
+from app.services.list_reader import FieldSet, ListReader
+from app.services.pagination import PageParams, paginate
+from app.schemas.batch import BatchGetRequest, BatchGetResponse
 from app.schemas.data_object import DataObjectCreate, DataObjectRead, DataObjectUpdate
 
-router = APIRouter(prefix="/data-objects", tags=["data-objects"])
-
-
-def _generate_data_object_id(db: Session) -> str:
-    existing = db.query(DataObject.id).all()
-    nums = []
-    for (did,) in existing:
-        if did.startswith("DO-"):
-            try:
-                nums.append(int(did[3:]))
-            except ValueError:
-                pass
-    next_num = max(nums, default=0) + 1
-    return f"DO-{next_num:03d}"
+router = APIRouter(prefix="/data-objects", tags=["data-objects"], dependencies=[Depends(conditional_get(DataObject))])
+_reader = ListReader(DataObject, DataObjectRead)
 
 
 @router.get("", response_model=list[DataObjectRead])
 def list_data_objects(
+    response: Response,
     classification: str | None = Query(None),
+    source_app_id: str | None = Query(None, description="Only data objects sourced from this application"),
+    consuming_app_id: str | None = Query(None, description="Only data objects consumed by this application"),
+    page: PageParams = Depends(),
+    fields: FieldSet = Depends(_reader.fieldset),
+    ids: list | None = Depends(_reader.id_list),
     db: Session = Depends(get_db),
     _user: User = Depends(get_current_user),
 ):
-    q = db.query(DataObject)
+    if ids is not None:
+        return _reader.by_ids_response(db, ids, response, fields)
+    q = _reader.query(db, fields)
     if classification:
         q = q.filter(DataObject.classification == classification)
-    return q.all()
+    if source_app_id is not None:
+        q = q.filter(linked("data_object_sources", source_app_id))
+    if consuming_app_id is not None:
+        q = q.filter(linked("data_object_consumers", consuming_app_id))
+    return _reader.response(db, paginate(q, response, page), response, fields)
+
+
+@router.post("/by-ids", response_model=BatchGetResponse[DataObjectRead])
+def get_data_objects_by_ids(
+    data: BatchGetRequest,
+    response: Response,
+    db: Session = Depends(get_db),
+    _user: User = Depends(get_current_user),
+):
+    """Fetch many data objects at once, in request order; unknown ids are listed in ``missing``."""
+    ids = _reader.coerce_ids(data.ids)
+    return _reader.by_ids_response(db, ids, response, _reader.fieldset_from_list(data.fields), envelope=True)
 
 
 @router.get("/{data_object_id}", response_model=DataObjectRead)
-def get_data_object(data_object_id: str, db: Session = Depends(get_db), _user: User = Depends(get_current_user)):
-    obj = db.query(DataObject).filter(DataObject.id == data_object_id).first()
+def get_data_object(
+    data_object_id: str,
+    response: Response,
+    fields: FieldSet = Depends(_reader.fieldset),
+    db: Session = Depends(get_db),
+    _user: User = Depends(get_current_user),
+):
+    obj = _reader.query(db, fields).filter(DataObject.id == data_object_id).first()
     if not obj:
         raise HTTPException(status_code=404, detail="Data object not found")
-    return obj
+    return _reader.item_response(db, obj, response, fields)
 
 
 @router.post("", response_model=DataObjectRead, status_code=201)
 def create_data_object(data: DataObjectCreate, db: Session = Depends(get_db), user: User = Depends(require_role("admin", "editor"))):
     obj_dict = data.model_dump()
     if obj_dict.get("id") is None:
-        obj_dict["id"] = _generate_data_object_id(db)
+        obj_dict["id"] = next_id(db, DataObject, "DO")
     obj = DataObject(**obj_dict)
     db.add(obj)
     write_audit(db, user, "CREATE", "data_object", obj.id)
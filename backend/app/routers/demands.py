@@ -1,60 +1,87 @@
-from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi import APIRouter, Depends, HTTPException, Query, Response
 from sqlalchemy.orm import Session
 
 from app.database import get_db
 from app.models.demand import Demand
 from app.models.user import User
 from app.auth import get_current_user, require_role
+from app.services.table_versions import conditional_get
 from app.services.audit_service import write_audit
+from app.services.id_allocator import next_id
+from app.services.link_service import linked
+from app.services.list_reader import FieldSet, ListReader
+from app.services.pagination import PageParams, paginate
+from app.schemas.batch import BatchGetRequest, BatchGetResponse
 from app.schemas.demand import DemandCreate, DemandRead, DemandUpdate
 
-router = APIRouter(prefix="/demands", tags=["demands"])
-
-
-def _generate_demand_id(db: Session) -> str:
-    existing = db.query(Demand.id).all()
-    nums = []
-    for (did,) in existing:
-        if did.startswith("DEM-"):
-            try:
-                nums.append(int(did[4:]))
-            except ValueError:
-                pass
-    next_num = max(nums, default=0) + 1
-    return f"DEM-{next_num:03d}"
+router = APIRouter(prefix="/demands", tags=["demands"], dependencies=[Depends(conditional_get(Demand))])
+_reader = ListReader(Demand, DemandRead)
 
 
 @router.get("", response_model=list[DemandRead])
 def list_demands(
+    response: Response,
     category: str | None = Query(None),
     status: str | None = Query(None),
     priority: str | None = Query(None),
+    app_id: str | None = Query(None, description="Only demands related to this application"),
+    vendor_id: str | None = Query(None, description="Only demands related to this vendor"),
+    domain_id: int | None = Query(None, description="Only demands related to this domain"),
+    page: PageParams = Depends(),
+    fields: FieldSet = Depends(_reader.fieldset),
+    ids: list | None = Depends(_reader.id_list),
     db: Session = Depends(get_db),
     _user: User = Depends(get_current_user),
 ):
-    q = db.query(Demand)
+    if ids is not None:
+        return _reader.by_ids_response(db, ids, response, fields)
+    q = _reader.query(db, fields)
     if category:
         q = q.filter(Demand.category == category)
     if status:
         q = q.filter(Demand.status == status)
     if priority:
         q = q.filter(Demand.priority == priority)
-    return q.all()
+    if app_id is not None:
+        q = q.filter(linked("demand_apps", app_id))
+    if vendor_id is not None:
+        q = q.filter(linked("demand_vendors", vendor_id))
+    if domain_id is not None:
+        q = q.filter(linked("demand_domains", domain_id))
+    return _reader.response(db, paginate(q, response, page), response, fields)
+
+
+@router.post("/by-ids", response_model=BatchGetResponse[DemandRead])
+def get_demands_by_ids(
+    data: BatchGetRequest,
+    response: Response,
+    db: Session = Depends(get_db),
+    _user: User = Depends(get_current_user),
+):
+    """Fetch many demands at once, in request order; unknown ids are listed in ``missing``."""
+    ids = _reader.coerce_ids(data.ids)
+    return _reader.by_ids_response(db, ids, response, _reader.fieldset_from_list(data.fields), envelope=True)
 
 
 @router.get("/{demand_id}", response_model=DemandRead)
-def get_demand(demand_id: str, db: Session = Depends(get_db), _user: User = Depends(get_current_user)):
-    demand = db.query(Demand).filter(Demand.id == demand_id).first()
+def get_demand(
+    demand_id: str,
+    response: Response,
+    fields: FieldSet = Depends(_reader.fieldset),
+    db: Session = Depends(get_db),
+    _user: User = Depends(get_current_user),
+):
+    demand = _reader.query(db, fields).filter(Demand.id == demand_id).first()
     if not demand:
         raise HTTPException(status_code=404, detail="Demand not found")
-    return demand
+    return _reader.item_response(db, demand, response, fields)
 
 
 @router.post("", response_model=DemandRead, status_code=201)
 def create_demand(data: DemandCreate, db: Session = Depends(get_db), user: User = Depends(require_role("admin", "editor"))):
     demand_dict = data.model_dump()
     if demand_dict.get("id") is None:
-        demand_dict["id"] = _generate_demand_id(db)
+        demand_dict["id"] = next_id(db, Demand, "DEM")
     demand = Demand(**demand_dict)
     db.add(demand)
     write_audit(db, user, "CREATE", "demand", demand.id)
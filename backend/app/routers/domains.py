@@ -1,32 +1,68 @@
 import uuid
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Response
 from sqlalchemy.orm import Session
 
 from app.database import get_db
 from app.models.domain import Domain, Capability, SubCapability
 from app.models.user import User
 from app.auth import get_current_user, require_role
+from app.services.table_versions import conditional_get
 from app.services.audit_service import write_audit
+from app.services.list_reader import FieldSet, ListReader
+from app.services.pagination import PageParams, paginate
+from app.schemas.batch import BatchGetRequest, BatchGetResponse
 from app.schemas.domain import (
     DomainCreate, DomainRead, DomainUpdate,
     CapabilityCreate, CapabilityRead, CapabilityUpdate,
     SubCapabilityCreate, SubCapabilityRead, SubCapabilityUpdate,
 )
 
-router = APIRouter(prefix="/domains", tags=["domains"])
+router = APIRouter(prefix="/domains", tags=["domains"], dependencies=[Depends(conditional_get(Domain, Capability, SubCapability))])
+_capability_reader = ListReader(Capability, CapabilityRead, children={
+    "sub_capabilities": ("capability_id", ListReader(SubCapability, SubCapabilityRead)),
+})
+_domain_reader = ListReader(Domain, DomainRead, children={"capabilities": ("domain_id", _capability_reader)})
 
 
 @router.get("", response_model=list[DomainRead])
-def list_domains(db: Session = Depends(get_db), _user: User = Depends(get_current_user)):
-    return db.query(Domain).all()
+def list_domains(
+    response: Response,
+    page: PageParams = Depends(),
+    fields: FieldSet = Depends(_domain_reader.fieldset),
+    ids: list | None = Depends(_domain_reader.id_list),
+    db: Session = Depends(get_db),
+    _user: User = Depends(get_current_user),
+):
+    if ids is not None:
+        return _domain_reader.by_ids_response(db, ids, response, fields)
+    q = _domain_reader.query(db, fields)
+    return _domain_reader.response(db, paginate(q, response, page), response, fields)
+
+
+@router.post("/by-ids", response_model=BatchGetResponse[DomainRead])
+def get_domains_by_ids(
+    data: BatchGetRequest,
+    response: Response,
+    db: Session = Depends(get_db),
+    _user: User = Depends(get_current_user),
+):
+    """Fetch many domains at once, in request order; unknown ids are listed in ``missing``."""
+    ids = _domain_reader.coerce_ids(data.ids)
+    return _domain_reader.by_ids_response(db, ids, response, _domain_reader.fieldset_from_list(data.fields), envelope=True)
 
 
 @router.get("/{domain_id}", response_model=DomainRead)
-def get_domain(domain_id: int, db: Session = Depends(get_db), _user: User = Depends(get_current_user)):
-    domain = db.query(Domain).filter(Domain.id == domain_id).first()
+def get_domain(
+    domain_id: int,
+    response: Response,
+    fields: FieldSet = Depends(_domain_reader.fieldset),
+    db: Session = Depends(get_db),
+    _user: User = Depends(get_current_user),
+):
+    domain = _domain_reader.query(db, fields).filter(Domain.id == domain_id).first()
     if not domain:
         raise HTTPException(status_code=404, detail="Domain not found")
-    return domain
+    return _domain_reader.item_response(db, domain, response, fields)
 
 
 @router.post("", response_model=DomainRead, status_code=201)
@@ -86,8 +122,16 @@ def delete_domain(domain_id: int, db: Session = Depends(get_db), user: User = De
 # --- Capability sub-routes ---
 
 @router.get("/{domain_id}/capabilities", response_model=list[CapabilityRead])
-def list_capabilities(domain_id: int, db: Session = Depends(get_db), _user: User = Depends(get_current_user)):
-    return db.query(Capability).filter(Capability.domain_id == domain_id).all()
+def list_capabilities(
+    domain_id: int,
+    response: Response,
+    page: PageParams = Depends(),
+    fields: FieldSet = Depends(_capability_reader.fieldset),
+    db: Session = Depends(get_db),
+    _user: User = Depends(get_current_user),
+):
+    q = _capability_reader.query(db, fields).filter(Capability.domain_id == domain_id)
+    return _capability_reader.response(db, paginate(q, response, page), response, fields)
 
 
 @router.post("/{domain_id}/capabilities", response_model=CapabilityRead, status_code=201)
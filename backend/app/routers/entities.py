@@ -1,54 +1,71 @@
-from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi import APIRouter, Depends, HTTPException, Query, Response
 from sqlalchemy.orm import Session
 
 from app.database import get_db
 from app.models.entity import LegalEntity
 from app.models.user import User
 from app.auth import get_current_user, require_role
+from app.services.table_versions import conditional_get
 from app.services.audit_service import write_audit
+from app.services.id_allocator import next_id
+from app.services.list_reader import FieldSet, ListReader
+from app.services.pagination import PageParams, paginate
+from app.schemas.batch import BatchGetRequest, BatchGetResponse
 from app.schemas.entity import LegalEntityCreate, LegalEntityRead, LegalEntityUpdate
 
-router = APIRouter(prefix="/entities", tags=["entities"])
-
-
-def _generate_entity_id(db: Session) -> str:
-    existing = db.query(LegalEntity.id).all()
-    nums = []
-    for (eid,) in existing:
-        if eid.startswith("ENT-"):
-            try:
-                nums.append(int(eid[4:]))
-            except ValueError:
-                pass
-    next_num = max(nums, default=0) + 1
-    return f"ENT-{next_num:03d}"
+router = APIRouter(prefix="/entities", tags=["entities"], dependencies=[Depends(conditional_get(LegalEntity))])
+_reader = ListReader(LegalEntity, LegalEntityRead)
 
 
 @router.get("", response_model=list[LegalEntityRead])
 def list_entities(
+    response: Response,
     country: str | None = Query(None),
+    page: PageParams = Depends(),
+    fields: FieldSet = Depends(_reader.fieldset),
+    ids: list | None = Depends(_reader.id_list),
     db: Session = Depends(get_db),
     _user: User = Depends(get_current_user),
 ):
-    q = db.query(LegalEntity)
+    if ids is not None:
+        return _reader.by_ids_response(db, ids, response, fields)
+    q = _reader.query(db, fields)
     if country:
         q = q.filter(LegalEntity.country == country)
-    return q.all()
+    return _reader.response(db, paginate(q, response, page), response, fields)
+
+
+@router.post("/by-ids", response_model=BatchGetResponse[LegalEntityRead])
+def get_entities_by_ids(
+    data: BatchGetRequest,
+    response: Response,
+    db: Session = Depends(get_db),
+    _user: User = Depends(get_current_user),
+):
+    """Fetch many entities at once, in request order; unknown ids are listed in ``missing``."""
+    ids = _reader.coerce_ids(data.ids)
+    return _reader.by_ids_response(db, ids, response, _reader.fieldset_from_list(data.fields), envelope=True)
 
 
 @router.get("/{entity_id}", response_model=LegalEntityRead)
-def get_entity(entity_id: str, db: Session = Depends(get_db), _user: User = Depends(get_current_user)):
-    entity = db.query(LegalEntity).filter(LegalEntity.id == entity_id).first()
+def get_entity(
+    entity_id: str,
+    response: Response,
+    fields: FieldSet = Depends(_reader.fieldset),
+    db: Session = Depends(get_db),
+    _user: User = Depends(get_current_user),
+):
+    entity = _reader.query(db, fields).filter(LegalEntity.id == entity_id).first()
     if not entity:
         raise HTTPException(status_code=404, detail="Entity not found")
-    return entity
+    return _reader.item_response(db, entity, response, fields)
 
 
 @router.post("", response_model=LegalEntityRead, status_code=201)
 def create_entity(data: LegalEntityCreate, db: Session = Depends(get_db), user: User = Depends(require_role("admin", "editor"))):
     entity_dict = data.model_dump()
     if entity_dict.get("id") is None:
-        entity_dict["id"] = _generate_entity_id(db)
+        entity_dict["id"] = next_id(db, LegalEntity, "ENT")
     entity = LegalEntity(**entity_dict)
     db.add(entity)
     write_audit(db, user, "CREATE", "legal_entity", entity.id)
@@ -0,0 +1,88 @@
+"""Integration graph queries: neighbourhoods, impact, paths and cycles.
+
+Answered from the in-memory graph of :mod:`app.services.integration_graph`;
+the ETag follows the ``integrations`` table like the integration list.
+"""
+from typing import Literal
+
+from fastapi import APIRouter, Depends, HTTPException, Query
+from sqlalchemy.orm import Session
+
+from app.database import get_db
+from app.models.application import Application
+from app.models.integration import Integration
+from app.models.user import User
+from app.auth import get_current_user
+from app.services.integration_graph import IntegrationGraph, integration_graph
+from app.services.table_versions import conditional_get
+
+router = APIRouter(prefix="/graph", tags=["graph"], dependencies=[Depends(conditional_get(Integration, Application))])
+
+
+def _graph(db: Session = Depends(get_db)) -> IntegrationGraph:
+    return integration_graph.current(db)
+
+
+def _require_app(db: Session, graph: IntegrationGraph, app_id: str):
+    if app_id not in graph and db.get(Application, app_id) is None:
+        raise HTTPException(status_code=404, detail=f"Application {app_id} not found")
+
+
+@router.get("/stats")
+def graph_stats(graph: IntegrationGraph = Depends(_graph), _user: User = Depends(get_current_user)):
+    return graph.stats()
+
+
+@router.get("/apps/{app_id}/neighbors")
+def get_neighbors(
+    app_id: str,
+    depth: int = Query(1, ge=1, le=10),
+    direction: Literal["both", "downstream", "upstream"] = Query("both"),
+    graph: IntegrationGraph = Depends(_graph),
+    db: Session = Depends(get_db),
+    _user: User = Depends(get_current_user),
+):
+    """Applications within ``depth`` integrations and the integrations among them."""
+    _require_app(db, graph, app_id)
+    return {"appId": app_id, "depth": depth, **graph.neighbors(app_id, depth, direction)}
+
+
+@router.get("/apps/{app_id}/impact")
+def get_impact(
+    app_id: str,
+    direction: Literal["downstream", "upstream"] = Query("downstream", description="downstream: apps fed by this one"),
+    max_depth: int | None = Query(None, ge=1),
+    graph: IntegrationGraph = Depends(_graph),
+    db: Session = Depends(get_db),
+    _user: User = Depends(get_current_user),
+):
+    """Transitive blast radius: every application reachable along integrations."""
+    _require_app(db, graph, app_id)
+    affected = graph.impact(app_id, direction, max_depth)
+    return {"appId": app_id, "direction": direction, "count": len(affected), "affected": affected}
+
+
+@router.get("/path")
+def get_shortest_path(
+    source: str = Query(...),
+    target: str = Query(...),
+    directed: bool = Query(True, description="Follow integrations only from source to target"),
+    graph: IntegrationGraph = Depends(_graph),
+    _user: User = Depends(get_current_user),
+):
+    """Fewest-hop chain of integrations from ``source`` to ``target``."""
+    path = graph.shortest_path(source, target, directed)
+    if path is None:
+        raise HTTPException(status_code=404, detail=f"No path from {source} to {target}")
+    return {"source": source, "target": target, "hops": len(path["integrations"]), **path}
+
+
+@router.get("/components")
+def get_components(
+    min_size: int = Query(2, ge=1, description="Smallest component to list; 2 lists only cycles"),
+    graph: IntegrationGraph = Depends(_graph),
+    _user: User = Depends(get_current_user),
+):
+    """Strongly connected components: groups of applications with circular data flows."""
+    components = graph.strongly_connected_components(min_size)
+    return {"count": len(components), "components": components}
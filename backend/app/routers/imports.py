@@ -0,0 +1,31 @@
+from typing import Literal
+
+from fastapi import APIRouter, Body, Depends, HTTPException, Query
+from sqlalchemy.orm import Session
+
+from app.database import get_db
+from app.models.user import User
+from app.auth import require_role
+from app.services.audit_service import write_audit
+from app.services.import_service import ImportValidationError, import_document
+
+router = APIRouter(prefix="/import", tags=["import"])
+
+
+@router.post("/json")
+def import_json(
+    document: dict = Body(..., description="Document in the format produced by /export/json"),
+    mode: Literal["replace", "merge"] = Query("merge"),
+    db: Session = Depends(get_db),
+    user: User = Depends(require_role("admin")),
+):
+    try:
+        report = import_document(db, document, mode)
+    except ImportValidationError as exc:
+        raise HTTPException(status_code=422, detail=exc.errors)
+    except Exception:
+        db.rollback()
+        raise
+    write_audit(db, user, "CREATE", "import", detail=f"JSON import ({mode}): {sum(report['counts'].values())} rows")
+    db.commit()
+    return report
@@ -1,60 +1,77 @@
-from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi import APIRouter, Depends, HTTPException, Query, Response
 from sqlalchemy.orm import Session
 
 from app.database import get_db
 from app.models.integration import Integration
 from app.models.user import User
 from app.auth import get_current_user, require_role
+from app.services.table_versions import conditional_get
 from app.services.audit_service import write_audit
+from app.services.id_allocator import next_id
+from app.services.list_reader import FieldSet, ListReader
+from app.services.pagination import PageParams, paginate
+from app.schemas.batch import BatchGetRequest, BatchGetResponse
 from app.schemas.integration import IntegrationCreate, IntegrationRead, IntegrationUpdate
 
-router = APIRouter(prefix="/integrations", tags=["integrations"])
-
-
-def _generate_integration_id(db: Session) -> str:
-    existing = db.query(Integration.id).all()
-    nums = []
-    for (iid,) in existing:
-        if iid.startswith("INT-"):
-            try:
-                nums.append(int(iid[4:]))
-            except ValueError:
-                pass
-    next_num = max(nums, default=0) + 1
-    return f"INT-{next_num:03d}"
+router = APIRouter(prefix="/integrations", tags=["integrations"], dependencies=[Depends(conditional_get(Integration))])
+_reader = ListReader(Integration, IntegrationRead)
 
 
 @router.get("", response_model=list[IntegrationRead])
 def list_integrations(
+    response: Response,
     source_app_id: str | None = Query(None),
     target_app_id: str | None = Query(None),
     status: str | None = Query(None),
+    page: PageParams = Depends(),
+    fields: FieldSet = Depends(_reader.fieldset),
+    ids: list | None = Depends(_reader.id_list),
     db: Session = Depends(get_db),
     _user: User = Depends(get_current_user),
 ):
-    q = db.query(Integration)
+    if ids is not None:
+        return _reader.by_ids_response(db, ids, response, fields)
+    q = _reader.query(db, fields)
     if source_app_id:
         q = q.filter(Integration.source_app_id == source_app_id)
     if target_app_id:
         q = q.filter(Integration.target_app_id == target_app_id)
     if status:
         q = q.filter(Integration.status == status)
-    return q.all()
+    return _reader.response(db, paginate(q, response, page), response, fields)
+
+
+@router.post("/by-ids", response_model=BatchGetResponse[IntegrationRead])
+def get_integrations_by_ids(
+    data: BatchGetRequest,
+    response: Response,
+    db: Session = Depends(get_db),
+    _user: User = Depends(get_current_user),
+):
+    """Fetch many integrations at once, in request order; unknown ids are listed in ``missing``."""
+    ids = _reader.coerce_ids(data.ids)
+    return _reader.by_ids_response(db, ids, response, _reader.fieldset_from_list(data.fields), envelope=True)
 
 
 @router.get("/{integration_id}", response_model=IntegrationRead)
-def get_integration(integration_id: str, db: Session = Depends(get_db), _user: User = Depends(get_current_user)):
-    integration = db.query(Integration).filter(Integration.id == integration_id).first()
+def get_integration(
+    integration_id: str,
+    response: Response,
+    fields: FieldSet = Depends(_reader.fieldset),
+    db: Session = Depends(get_db),
+    _user: User = Depends(get_current_user),
+):
+    integration = _reader.query(db, fields).filter(Integration.id == integration_id).first()
     if not integration:
         raise HTTPException(status_code=404, detail="Integration not found")
-    return integration
+    return _reader.item_response(db, integration, response, fields)
 
 
 @router.post("", response_model=IntegrationRead, status_code=201)
 def create_integration(data: IntegrationCreate, db: Session = Depends(get_db), user: User = Depends(require_role("admin", "editor"))):
     integration_dict = data.model_dump()
     if integration_dict.get("id") is None:
-        integration_dict["id"] = _generate_integration_id(db)
+        integration_dict["id"] = next_id(db, Integration, "INT")
     integration = Integration(**integration_dict)
     db.add(integration)
     write_audit(db, user, "CREATE", "integration", integration.id)
@@ -1,57 +1,74 @@
-from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi import APIRouter, Depends, HTTPException, Query, Response
 from sqlalchemy.orm import Session
 
 from app.database import get_db
 from app.models.kpi import ManagementKPI
 from app.models.user import User
 from app.auth import get_current_user, require_role
+from app.services.table_versions import conditional_get
 from app.services.audit_service import write_audit
+from app.services.id_allocator import next_id
+from app.services.list_reader import FieldSet, ListReader
+from app.services.pagination import PageParams, paginate
+from app.schemas.batch import BatchGetRequest, BatchGetResponse
 from app.schemas.kpi import ManagementKPICreate, ManagementKPIRead, ManagementKPIUpdate
 
-router = APIRouter(prefix="/kpis", tags=["kpis"])
-
-
-def _generate_kpi_id(db: Session) -> str:
-    existing = db.query(ManagementKPI.id).all()
-    nums = []
-    for (kid,) in existing:
-        if kid.startswith("KPI-"):
-            try:
-                nums.append(int(kid[4:]))
-            except ValueError:
-                pass
-    next_num = max(nums, default=0) + 1
-    return f"KPI-{next_num:03d}"
+router = APIRouter(prefix="/kpis", tags=["kpis"], dependencies=[Depends(conditional_get(ManagementKPI))])
+_reader = ListReader(ManagementKPI, ManagementKPIRead)
 
 
 @router.get("", response_model=list[ManagementKPIRead])
 def list_kpis(
+    response: Response,
     category: str | None = Query(None),
     trend: str | None = Query(None),
+    page: PageParams = Depends(),
+    fields: FieldSet = Depends(_reader.fieldset),
+    ids: list | None = Depends(_reader.id_list),
     db: Session = Depends(get_db),
     _user: User = Depends(get_current_user),
 ):
-    q = db.query(ManagementKPI)
+    if ids is not None:
+        return _reader.by_ids_response(db, ids, response, fields)
+    q = _reader.query(db, fields)
     if category:
         q = q.filter(ManagementKPI.category == category)
     if trend:
         q = q.filter(ManagementKPI.trend == trend)
-    return q.all()
+    return _reader.response(db, paginate(q, response, page), response, fields)
+
+
+@router.post("/by-ids", response_model=BatchGetResponse[ManagementKPIRead])
+def get_kpis_by_ids(
+    data: BatchGetRequest,
+    response: Response,
+    db: Session = Depends(get_db),
+    _user: User = Depends(get_current_user),
+):
+    """Fetch many kpis at once, in request order; unknown ids are listed in ``missing``."""
+    ids = _reader.coerce_ids(data.ids)
+    return _reader.by_ids_response(db, ids, response, _reader.fieldset_from_list(data.fields), envelope=True)
 
 
 @router.get("/{kpi_id}", response_model=ManagementKPIRead)
-def get_kpi(kpi_id: str, db: Session = Depends(get_db), _user: User = Depends(get_current_user)):
-    kpi = db.query(ManagementKPI).filter(ManagementKPI.id == kpi_id).first()
+def get_kpi(
+    kpi_id: str,
+    response: Response,
+    fields: FieldSet = Depends(_reader.fieldset),
+    db: Session = Depends(get_db),
+    _user: User = Depends(get_current_user),
+):
+    kpi = _reader.query(db, fields).filter(ManagementKPI.id == kpi_id).first()
     if not kpi:
         raise HTTPException(status_code=404, detail="KPI not found")
-    return kpi
+    return _reader.item_response(db, kpi, response, fields)
 
 
 @router.post("", response_model=ManagementKPIRead, status_code=201)
 def create_kpi(data: ManagementKPICreate, db: Session = Depends(get_db), user: User = Depends(require_role("admin", "editor"))):
     kpi_dict = data.model_dump()
     if kpi_dict.get("id") is None:
-        kpi_dict["id"] = _generate_kpi_id(db)
+        kpi_dict["id"] = next_id(db, ManagementKPI, "KPI")
     kpi = ManagementKPI(**kpi_dict)
     db.add(kpi)
     write_audit(db, user, "CREATE", "kpi", kpi.id)
@@ -0,0 +1,40 @@
+"""Reverse lookups over the JSON list relationships.
+
+Reads the ``entity_links`` table (see :mod:`app.services.link_service`):
+"what references APP-123" is one index range scan.  The list endpoints take
+the same links as filters, e.g. ``GET /api/projects?app_id=APP-123``.
+"""
+from fastapi import APIRouter, Depends, HTTPException, Query
+from sqlalchemy.orm import Session
+
+from app.database import get_db
+from app.models.link import EntityLink
+from app.models.user import User
+from app.auth import get_current_user
+from app.services.link_service import LINKS, LINKS_BY_NAME, references
+from app.services.table_versions import conditional_get
+
+router = APIRouter(prefix="/links", tags=["links"], dependencies=[Depends(conditional_get(EntityLink))])
+
+
+@router.get("")
+def list_relations(_user: User = Depends(get_current_user)):
+    """The mirrored relations: owner entity, JSON attribute and name."""
+    return [
+        {"relation": link.name, "owner": link.model.__tablename__, "attribute": link.attribute}
+        for link in LINKS
+    ]
+
+
+@router.get("/{target_id:path}")
+def get_references(
+    target_id: str,
+    relation: list[str] | None = Query(None, description="Only these relations (repeatable)"),
+    db: Session = Depends(get_db),
+    _user: User = Depends(get_current_user),
+):
+    """Owner ids referencing ``target_id``, grouped by relation."""
+    unknown = [r for r in relation or () if r not in LINKS_BY_NAME]
+    if unknown:
+        raise HTTPException(status_code=400, detail=f"Unknown relation(s): {', '.join(unknown)}")
+    return {"targetId": target_id, "references": references(db, target_id, relation)}
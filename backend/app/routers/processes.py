@@ -1,54 +1,75 @@
-from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi import APIRouter, Depends, HTTPException, Query, Response
 from sqlalchemy.orm import Session
 
 from app.database import get_db
 from app.models.process import E2EProcess
 from app.models.user import User
 from app.auth import get_current_user, require_role
+from app.services.table_versions import conditional_get
 from app.services.audit_service import write_audit
+from app.services.id_allocator import next_id
+from app.services.link_service import linked
+from app.services.list_reader import FieldSet, ListReader
+from app.services.pagination import PageParams, paginate
+from app.schemas.batch import BatchGetRequest, BatchGetResponse
 from app.schemas.process import E2EProcessCreate, E2EProcessRead, E2EProcessUpdate
 
-router = APIRouter(prefix="/processes", tags=["processes"])
-
-
-def _generate_process_id(db: Session) -> str:
-    existing = db.query(E2EProcess.id).all()
-    nums = []
-    for (pid,) in existing:
-        if pid.startswith("PRC-"):
-            try:
-                nums.append(int(pid[4:]))
-            except ValueError:
-                pass
-    next_num = max(nums, default=0) + 1
-    return f"PRC-{next_num:03d}"
+router = APIRouter(prefix="/processes", tags=["processes"], dependencies=[Depends(conditional_get(E2EProcess))])
+_reader = ListReader(E2EProcess, E2EProcessRead)
 
 
 @router.get("", response_model=list[E2EProcessRead])
 def list_processes(
+    response: Response,
     status: str | None = Query(None),
+    domain_id: int | None = Query(None, description="Only processes spanning this domain"),
+    page: PageParams = Depends(),
+    fields: FieldSet = Depends(_reader.fieldset),
+    ids: list | None = Depends(_reader.id_list),
     db: Session = Depends(get_db),
     _user: User = Depends(get_current_user),
 ):
-    q = db.query(E2EProcess)
+    if ids is not None:
+        return _reader.by_ids_response(db, ids, response, fields)
+    q = _reader.query(db, fields)
     if status:
         q = q.filter(E2EProcess.status == status)
-    return q.all()
+    if domain_id is not None:
+        q = q.filter(linked("process_domains", domain_id))
+    return _reader.response(db, paginate(q, response, page), response, fields)
+
+
+@router.post("/by-ids", response_model=BatchGetResponse[E2EProcessRead])
+def get_processes_by_ids(
+    data: BatchGetRequest,
+    response: Response,
+    db: Session = Depends(get_db),
+    _user: User = Depends(get_current_user),
+):
+    """Fetch many processes at once, in request order; unknown ids are listed in ``missing``."""
+    ids = _reader.coerce_ids(data.ids)
+    return _reader.by_ids_response(db, ids, response, _reader.fieldset_from_list(data.fields), envelope=True)
 
 
 @router.get("/{process_id}", response_model=E2EProcessRead)
-def get_process(process_id: str, db: Session = Depends(get_db), _user: User = Depends(get_current_user)):
-    process = db.query(E2EProcess).filter(E2EProcess.id == process_id).first()
+def get_process(
+    process_id: str,
+    response: Response,
+    fields: FieldSet = Depends(_reader.fieldset),
+    db: Session = Depends(get_db),
+    _user: User = Depends(get_current_user),
+):
+    process = _reader.query(db, fields).filter(E2EProcess.id == process_id).first()
     if not process:
         raise HTTPException(status_code=404, detail="Process not found")
-    return process
+    return _reader.item_response(db, process, response, fields)
 
 
 @router.post("", response_model=E2EProcessRead, status_code=201)
 def create_process(data: E2EProcessCreate, db: Session = Depends(get_db), user: User = Depends(require_role("admin", "editor"))):
     process_dict = data.model_dump()
     if process_dict.get("id") is None:
-        process_dict["id"] = _generate_process_id(db)
+        process_dict["id"] = next_id(db, E2EProcess, "PRC")
     process = E2EProcess(**process_dict)
     db.add(process)
     write_audit(db, user, "CREATE", "process", process.id)
@@ -1,60 +1,91 @@
-from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi import APIRouter, Depends, HTTPException, Query, Response
 from sqlalchemy.orm import Session
 
 from app.database import get_db
 from app.models.project import Project, ProjectDependency
 from app.models.user import User
 from app.auth import get_current_user, require_role
+from app.services.table_versions import conditional_get
+from app.services import dependency_analysis
 from app.services.audit_service import write_audit
+from app.services.id_allocator import next_id
+from app.services.link_service import linked
+from app.services.list_reader import FieldSet, ListReader
+from app.services.pagination import PageParams, paginate
+from app.schemas.batch import BatchGetRequest, BatchGetResponse
 from app.schemas.project import (
     ProjectCreate, ProjectRead, ProjectUpdate,
     ProjectDependencyCreate, ProjectDependencyRead, ProjectDependencyUpdate,
 )
 
-router = APIRouter(prefix="/projects", tags=["projects"])
-
-
-def _generate_project_id(db: Session) -> str:
-    existing = db.query(Project.id).all()
-    nums = []
-    for (pid,) in existing:
-        if pid.startswith("PRJ-"):
-            try:
-                nums.append(int(pid[4:]))
-            except ValueError:
-                pass
-    next_num = max(nums, default=0) + 1
-    return f"PRJ-{next_num:03d}"
+router = APIRouter(prefix="/projects", tags=["projects"], dependencies=[Depends(conditional_get(Project, ProjectDependency))])
+_reader = ListReader(Project, ProjectRead)
 
 
 @router.get("", response_model=list[ProjectRead])
 def list_projects(
+    response: Response,
     category: str | None = Query(None),
     status: str | None = Query(None),
+    app_id: str | None = Query(None, description="Only projects affecting this application"),
+    capability_id: str | None = Query(None, description="Only projects on this capability"),
+    domain_id: int | None = Query(None, description="Only projects with this secondary domain"),
+    process_id: str | None = Query(None, description="Only projects touching this E2E process"),
+    page: PageParams = Depends(),
+    fields: FieldSet = Depends(_reader.fieldset),
+    ids: list | None = Depends(_reader.id_list),
     db: Session = Depends(get_db),
     _user: User = Depends(get_current_user),
 ):
-    q = db.query(Project)
+    if ids is not None:
+        return _reader.by_ids_response(db, ids, response, fields)
+    q = _reader.query(db, fields)
     if category:
         q = q.filter(Project.category == category)
     if status:
         q = q.filter(Project.status == status)
-    return q.all()
+    if app_id is not None:
+        q = q.filter(linked("project_apps", app_id))
+    if capability_id is not None:
+        q = q.filter(linked("project_capabilities", capability_id))
+    if domain_id is not None:
+        q = q.filter(linked("project_domains", domain_id))
+    if process_id is not None:
+        q = q.filter(linked("project_processes", process_id))
+    return _reader.response(db, paginate(q, response, page), response, fields)
+
+
+@router.post("/by-ids", response_model=BatchGetResponse[ProjectRead])
+def get_projects_by_ids(
+    data: BatchGetRequest,
+    response: Response,
+    db: Session = Depends(get_db),
+    _user: User = Depends(get_current_user),
+):
+    """Fetch many projects at once, in request order; unknown ids are listed in ``missing``."""
+    ids = _reader.coerce_ids(data.ids)
+    return _reader.by_ids_response(db, ids, response, _reader.fieldset_from_list(data.fields), envelope=True)
 
 
 @router.get("/{project_id}", response_model=ProjectRead)
-def get_project(project_id: str, db: Session = Depends(get_db), _user: User = Depends(get_current_user)):
-    project = db.query(Project).filter(Project.id == project_id).first()
+def get_project(
+    project_id: str,
+    response: Response,
+    fields: FieldSet = Depends(_reader.fieldset),
+    db: Session = Depends(get_db),
+    _user: User = Depends(get_current_user),
+):
+    project = _reader.query(db, fields).filter(Project.id == project_id).first()
     if not project:
         raise HTTPException(status_code=404, detail="Project not found")
-    return project
+    return _reader.item_response(db, project, response, fields)
 
 
 @router.post("", response_model=ProjectRead, status_code=201)
 def create_project(data: ProjectCreate, db: Session = Depends(get_db), user: User = Depends(require_role("admin", "editor"))):
     project_dict = data.model_dump()
     if project_dict.get("id") is None:
-        project_dict["id"] = _generate_project_id(db)
+        project_dict["id"] = next_id(db, Project, "PRJ")
     project = Project(**project_dict)
     db.add(project)
     write_audit(db, user, "CREATE", "project", project.id)
@@ -88,19 +119,39 @@ def delete_project(project_id: str, db: Session = Depends(get_db), user: User =
 
 # --- Project Dependencies ---
 
-dep_router = APIRouter(prefix="/project-dependencies", tags=["project-dependencies"])
+dep_router = APIRouter(prefix="/project-dependencies", tags=["project-dependencies"], dependencies=[Depends(conditional_get(Project, ProjectDependency))])
+_dependency_reader = ListReader(ProjectDependency, ProjectDependencyRead)
 
 
 @dep_router.get("", response_model=list[ProjectDependencyRead])
 def list_dependencies(
+    response: Response,
     source_project_id: str | None = Query(None),
+    page: PageParams = Depends(),
+    fields: FieldSet = Depends(_dependency_reader.fieldset),
     db: Session = Depends(get_db),
     _user: User = Depends(get_current_user),
 ):
-    q = db.query(ProjectDependency)
+    q = _dependency_reader.query(db, fields)
     if source_project_id:
         q = q.filter(ProjectDependency.source_project_id == source_project_id)
-    return q.all()
+    return _dependency_reader.response(db, paginate(q, response, page), response, fields)
+
+
+@dep_router.get("/analysis")
+def analyze_dependencies(
+    project_id: str | None = Query(None, description="Also return this project's transitive dependencies"),
+    db: Session = Depends(get_db),
+    _user: User = Depends(get_current_user),
+):
+    """Topological order, cycles, critical path and schedule conflicts."""
+    analysis = dependency_analysis.analyze(db)
+    result = analysis.as_dict()
+    if project_id is not None:
+        if project_id not in analysis.prerequisites:
+            raise HTTPException(status_code=404, detail="Project not found")
+        result["closure"] = analysis.closure(project_id)
+    return result
 
 
 @dep_router.post("", response_model=ProjectDependencyRead, status_code=201)
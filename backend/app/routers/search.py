@@ -0,0 +1,29 @@
+"""Full-text search over applications, capabilities, projects, vendors,
+demands, processes and data objects (see :mod:`app.services.search_service`)."""
+from fastapi import APIRouter, Depends, HTTPException, Query
+from sqlalchemy.orm import Session
+
+from app.database import get_db
+from app.models.search import SearchDocument
+from app.models.user import User
+from app.auth import get_current_user
+from app.services.search_service import SOURCES_BY_TYPE, search
+from app.services.table_versions import conditional_get
+
+router = APIRouter(prefix="/search", tags=["search"], dependencies=[Depends(conditional_get(SearchDocument))])
+
+
+@router.get("")
+def search_landscape(
+    q: str = Query(..., min_length=1, max_length=200),
+    limit: int = Query(5, ge=1, le=50, description="Hits per entity type"),
+    types: list[str] | None = Query(None, description="Only these entity types (repeatable)"),
+    db: Session = Depends(get_db),
+    _user: User = Depends(get_current_user),
+):
+    """Ranked hits grouped by entity type.  Words match as prefixes; a query
+    without hits is retried with close spellings (``corrected`` is then set)."""
+    unknown = [t for t in types or () if t not in SOURCES_BY_TYPE]
+    if unknown:
+        raise HTTPException(status_code=400, detail=f"Unknown type(s): {', '.join(unknown)}")
+    return search(db, q, limit, types)
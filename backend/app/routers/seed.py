@@ -1,8 +1,8 @@
-from fastapi import APIRouter, Depends
+from fastapi import APIRouter, Depends, Query
 from sqlalchemy.orm import Session
 
 from app.database import get_db
-from app.services.seed_service import seed_database
+from app.services.seed_service import seed_audit_detail, seed_database
 from app.services.audit_service import write_audit
 from app.models.user import User
 from app.auth import require_role
@@ -11,9 +11,15 @@ router = APIRouter(tags=["seed"])
 
 
 @router.post("/seed", status_code=200)
-def seed_data(db: Session = Depends(get_db), user: User = Depends(require_role("admin"))):
-    count = seed_database(db)
+def seed_data(
+    if_changed: bool = Query(False, description="Skip if the seed file is unchanged since the last seed"),
+    db: Session = Depends(get_db),
+    user: User = Depends(require_role("admin")),
+):
+    report = seed_database(db, if_changed=if_changed)
+    if report["skipped"]:
+        return {"message": "Seed file unchanged, nothing to do", **report}
     # seed_database commits internally; commit audit entry separately
-    write_audit(db, user, "CREATE", "seed", detail="Database seeded")
+    write_audit(db, user, "CREATE", "seed", detail=seed_audit_detail(report["sha256"]))
     db.commit()
-    return {"message": "Database seeded successfully", "counts": count}
+    return {"message": "Database seeded successfully", **report}
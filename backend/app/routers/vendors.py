@@ -1,57 +1,74 @@
-from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi import APIRouter, Depends, HTTPException, Query, Response
 from sqlalchemy.orm import Session
 
 from app.database import get_db
 from app.models.vendor import Vendor
 from app.models.user import User
 from app.auth import get_current_user, require_role
+from app.services.table_versions import conditional_get
 from app.services.audit_service import write_audit
+from app.services.id_allocator import next_id
+from app.services.list_reader import FieldSet, ListReader
+from app.services.pagination import PageParams, paginate
+from app.schemas.batch import BatchGetRequest, BatchGetResponse
 from app.schemas.vendor import VendorCreate, VendorRead, VendorUpdate
 
-router = APIRouter(prefix="/vendors", tags=["vendors"])
-
-
-def _generate_vendor_id(db: Session) -> str:
-    existing = db.query(Vendor.id).all()
-    nums = []
-    for (vid,) in existing:
-        if vid.startswith("VND-"):
-            try:
-                nums.append(int(vid[4:]))
-            except ValueError:
-                pass
-    next_num = max(nums, default=0) + 1
-    return f"VND-{next_num:03d}"
+router = APIRouter(prefix="/vendors", tags=["vendors"], dependencies=[Depends(conditional_get(Vendor))])
+_reader = ListReader(Vendor, VendorRead)
 
 
 @router.get("", response_model=list[VendorRead])
 def list_vendors(
+    response: Response,
     category: str | None = Query(None),
     status: str | None = Query(None),
+    page: PageParams = Depends(),
+    fields: FieldSet = Depends(_reader.fieldset),
+    ids: list | None = Depends(_reader.id_list),
     db: Session = Depends(get_db),
     _user: User = Depends(get_current_user),
 ):
-    q = db.query(Vendor)
+    if ids is not None:
+        return _reader.by_ids_response(db, ids, response, fields)
+    q = _reader.query(db, fields)
     if category:
         q = q.filter(Vendor.category == category)
     if status:
         q = q.filter(Vendor.status == status)
-    return q.all()
+    return _reader.response(db, paginate(q, response, page), response, fields)
+
+
+@router.post("/by-ids", response_model=BatchGetResponse[VendorRead])
+def get_vendors_by_ids(
+    data: BatchGetRequest,
+    response: Response,
+    db: Session = Depends(get_db),
+    _user: User = Depends(get_current_user),
+):
+    """Fetch many vendors at once, in request order; unknown ids are listed in ``missing``."""
+    ids = _reader.coerce_ids(data.ids)
+    return _reader.by_ids_response(db, ids, response, _reader.fieldset_from_list(data.fields), envelope=True)
 
 
 @router.get("/{vendor_id}", response_model=VendorRead)
-def get_vendor(vendor_id: str, db: Session = Depends(get_db), _user: User = Depends(get_current_user)):
-    vendor = db.query(Vendor).filter(Vendor.id == vendor_id).first()
+def get_vendor(
+    vendor_id: str,
+    response: Response,
+    fields: FieldSet = Depends(_reader.fieldset),
+    db: Session = Depends(get_db),
+    _user: User = Depends(get_current_user),
+):
+    vendor = _reader.query(db, fields).filter(Vendor.id == vendor_id).first()
     if not vendor:
         raise HTTPException(status_code=404, detail="Vendor not found")
-    return vendor
+    return _reader.item_response(db, vendor, response, fields)
 
 
 @router.post("", response_model=VendorRead, status_code=201)
 def create_vendor(data: VendorCreate, db: Session = Depends(get_db), user: User = Depends(require_role("admin", "editor"))):
     vendor_dict = data.model_dump()
     if vendor_dict.get("id") is None:
-        vendor_dict["id"] = _generate_vendor_id(db)
+        vendor_dict["id"] = next_id(db, Vendor, "VND")
     vendor = Vendor(**vendor_dict)
     db.add(vendor)
     write_audit(db, user, "CREATE", "vendor", vendor.id)
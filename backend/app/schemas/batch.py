@@ -0,0 +1,50 @@
+from typing import Any, Generic, Literal, TypeVar
+
+from pydantic import BaseModel, Field
+
+T = TypeVar("T")
+
+MAX_BATCH_IDS = 5000
+
+
+class BatchGetRequest(BaseModel):
+    ids: list[str | int] = Field(..., max_length=MAX_BATCH_IDS)
+    fields: list[str] | None = None
+
+
+class BatchGetResponse(BaseModel, Generic[T]):
+    items: list[T]
+    missing: list[str | int]
+
+
+MAX_BATCH_OPERATIONS = 1000
+
+
+class BatchOperation(BaseModel):
+    op: Literal["create", "update", "delete"]
+    entity: str
+    # Required for update/delete; composite keys are written like their audit
+    # ids, e.g. "CAP-001/APP-002".
+    id: str | None = None
+    data: dict[str, Any] | None = None
+    # Expected version of a versioned entity, as in the ``If-Match`` header.
+    if_match: int | None = None
+
+
+class BatchWriteRequest(BaseModel):
+    operations: list[BatchOperation] = Field(..., min_length=1, max_length=MAX_BATCH_OPERATIONS)
+
+
+class BatchOperationResult(BaseModel):
+    index: int
+    op: str
+    entity: str
+    id: str | None = None
+    status: int
+    version: int | None = None
+    error: str | None = None
+
+
+class BatchWriteResponse(BaseModel):
+    committed: bool
+    results: list[BatchOperationResult]
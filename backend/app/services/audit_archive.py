@@ -0,0 +1,168 @@
+"""Audit log retention: old entries move to compressed monthly archive files.
+
+:func:`archive_entries` moves entries older than a cutoff out of
+``audit_log`` into ``AUDIT_ARCHIVE_DIR/audit-YYYY-MM.jsonl.gz`` (one gzip
+member per run, JSON lines, partitioned by the entry's UTC month), so the hot
+table and database backups stay small.  Each chunk is written and fsynced
+before its rows are deleted; a crash in between leaves an entry in both
+places, which :func:`search` ignores.
+
+:func:`search` reads the archive on demand for ``include_archive`` audit-log
+queries: month files are scanned newest first and only as far back as the
+page needs.
+
+Run ``python -m app.services.audit_archive`` (e.g. daily from cron) or
+``POST /api/admin/audit-log/archive`` to apply ``AUDIT_RETENTION_DAYS``.
+The cutoff of the latest run that moved entries is kept in
+``archived-before`` next to the month files; readers that need complete
+history from the live table (incremental exports) check
+:func:`archived_before`.
+"""
+import gzip
+import json
+import os
+import threading
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+
+from sqlalchemy import delete, select
+from sqlalchemy.orm import Session
+
+from app.config import settings
+from app.models.audit_log import AuditLog
+from app.services.table_versions import bump_versions
+
+ARCHIVE_CHUNK_SIZE = 5000
+_HORIZON_FILE = "archived-before"
+_table = AuditLog.__table__
+_lock = threading.Lock()
+
+
+def _month(timestamp: datetime) -> str:
+    return timestamp.strftime("%Y-%m")
+
+
+def _path(archive_dir: Path, month: str) -> Path:
+    return archive_dir / f"audit-{month}.jsonl.gz"
+
+
+def _append(path: Path, records: list[dict]):
+    data = "".join(json.dumps(r, separators=(",", ":")) + "\n" for r in records).encode("utf-8")
+    with _lock, open(path, "ab") as raw:
+        with gzip.GzipFile(fileobj=raw, mode="ab", compresslevel=6) as gz:
+            gz.write(data)
+        raw.flush()
+        os.fsync(raw.fileno())
+
+
+def archived_before(archive_dir: str | None = None) -> datetime | None:
+    """Entries older than this (naive UTC) may have left ``audit_log``; None if none have."""
+    path = Path(archive_dir or settings.AUDIT_ARCHIVE_DIR) / _HORIZON_FILE
+    try:
+        return datetime.fromisoformat(path.read_text(encoding="utf-8").strip())
+    except FileNotFoundError:
+        return None
+
+
+def _record_horizon(directory: Path, cutoff: datetime):
+    with _lock:
+        current = archived_before(str(directory))
+        if current is not None and current >= cutoff:
+            return
+        tmp = directory / f"{_HORIZON_FILE}.tmp"
+        tmp.write_text(cutoff.isoformat(), encoding="utf-8")
+        os.replace(tmp, directory / _HORIZON_FILE)
+
+
+def retention_cutoff(days: int) -> datetime:
+    """Entries older than this (naive UTC, like stored timestamps) are archived."""
+    return datetime.now(timezone.utc).replace(tzinfo=None) - timedelta(days=days)
+
+
+def archive_entries(db: Session, older_than: datetime, archive_dir: str | None = None) -> dict:
+    """Move entries with ``timestamp < older_than`` to the archive. Commits per chunk."""
+    directory = Path(archive_dir or settings.AUDIT_ARCHIVE_DIR)
+    directory.mkdir(parents=True, exist_ok=True)
+    archived, months = 0, set()
+    while True:
+        rows = db.execute(
+            select(*_table.c).where(_table.c.timestamp < older_than)
+            .order_by(_table.c.timestamp, _table.c.id).limit(ARCHIVE_CHUNK_SIZE)
+        ).mappings().all()
+        if not rows:
+            break
+        by_month: dict[str, list[dict]] = {}
+        for row in rows:
+            record = {**row, "timestamp": row["timestamp"].isoformat()}
+            by_month.setdefault(_month(row["timestamp"]), []).append(record)
+        for month, records in by_month.items():
+            _append(_path(directory, month), records)
+        db.execute(delete(_table).where(_table.c.id.in_([row["id"] for row in rows])))
+        bump_versions(db.connection(), [_table.name])
+        db.commit()
+        archived += len(rows)
+        months.update(by_month)
+    if archived:
+        _record_horizon(directory, older_than)
+    return {"archived": archived, "months": sorted(months)}
+
+
+def _matches(record: dict, filters: dict, since, upper, position) -> bool:
+    if any(value and record.get(column) != value for column, value in filters.items()):
+        return False
+    timestamp = record["timestamp"]
+    if since is not None and timestamp < since:
+        return False
+    if upper is not None and timestamp >= upper:
+        return False
+    return position is None or (timestamp, record["id"]) < position
+
+
+def search(
+    filters: dict,
+    limit: int,
+    position: tuple[datetime, int] | None = None,
+    since: datetime | None = None,
+    until: datetime | None = None,
+    archive_dir: str | None = None,
+) -> list[AuditLog]:
+    """Up to ``limit`` archived entries matching ``filters``, newest first, below ``position``.
+
+    Entries are returned as transient ``AuditLog`` objects.
+    """
+    directory = Path(archive_dir or settings.AUDIT_ARCHIVE_DIR)
+    if not directory.is_dir():
+        return []
+    newest = min((t for t in (until, position and position[0]) if t is not None), default=None)
+    found = []
+    for path in sorted(directory.glob("audit-*.jsonl.gz"), reverse=True):
+        month = path.name[len("audit-"):-len(".jsonl.gz")]
+        if newest is not None and month > _month(newest):
+            continue
+        if since is not None and month < _month(since):
+            break
+        with gzip.open(path, "rt", encoding="utf-8") as f:
+            for line in f:
+                record = json.loads(line)
+                record["timestamp"] = datetime.fromisoformat(record["timestamp"])
+                if _matches(record, filters, since, until, position):
+                    found.append(record)
+        # Older months only hold older entries.
+        if len(found) >= limit:
+            break
+    found.sort(key=lambda r: (r["timestamp"], r["id"]), reverse=True)
+    return [AuditLog(**record) for record in found[:limit]]
+
+
+if __name__ == "__main__":
+    from app.database import Base, SessionLocal, engine
+
+    if settings.AUDIT_RETENTION_DAYS <= 0:
+        raise SystemExit("AUDIT_RETENTION_DAYS is not set; nothing to archive")
+    Base.metadata.create_all(bind=engine)
+    session = SessionLocal()
+    try:
+        result = archive_entries(session, retention_cutoff(settings.AUDIT_RETENTION_DAYS))
+        print(f"Archived {result['archived']} audit entries into {len(result['months'])} month file(s)")
+    finally:
+        session.close()
@@ -0,0 +1,114 @@
+"""Audit log reads that stay fast as the log grows.
+
+Listings are newest first and page by ``(timestamp, id)``: the cursor holds
+the last entry's position and the next page starts right below it, so every
+page is one range scan on an index of ``audit_log`` (see the model) instead of
+``OFFSET`` skipping over all earlier rows.
+
+The total is counted only up to :data:`COUNT_CAP`.  Beyond that an unfiltered
+listing reports the table-size estimate of the database and a filtered one
+reports the cap, with ``totalIsEstimate`` set either way.  Archived entries
+(see :mod:`app.services.audit_archive`) are merged into a page on request but
+never counted.
+"""
+from datetime import datetime, timezone
+from typing import Callable
+
+from fastapi import HTTPException
+from sqlalchemy import func, text, tuple_
+from sqlalchemy.orm import Query as OrmQuery, Session
+
+from app.models.audit_log import AuditLog
+from app.services.pagination import COUNT_CAP, decode_cursor, encode_cursor
+
+
+def as_stored(value: datetime | None) -> datetime | None:
+    """``value`` as naive UTC, the way timestamps are stored."""
+    if value is not None and value.tzinfo is not None:
+        value = value.astimezone(timezone.utc).replace(tzinfo=None)
+    return value
+
+
+def filtered(db: Session, since: datetime | None = None, until: datetime | None = None, **filters) -> OrmQuery:
+    """Entries in ``[since, until)`` whose columns equal the given non-empty ``filters``."""
+    q = db.query(AuditLog)
+    for column, value in filters.items():
+        if value:
+            q = q.filter(getattr(AuditLog, column) == value)
+    if since is not None:
+        q = q.filter(AuditLog.timestamp >= since)
+    if until is not None:
+        q = q.filter(AuditLog.timestamp < until)
+    return q
+
+
+def decode_position(before: str) -> tuple[datetime, int]:
+    timestamp, entry_id = decode_cursor(before, 2)
+    try:
+        return datetime.fromisoformat(timestamp), int(entry_id)
+    except (TypeError, ValueError):
+        raise HTTPException(status_code=400, detail="Invalid pagination cursor")
+
+
+def page(
+    q: OrmQuery,
+    limit: int,
+    before: str | None = None,
+    offset: int = 0,
+    archived: Callable[[tuple | None, int], list[AuditLog]] | None = None,
+) -> tuple[list[AuditLog], str | None]:
+    """One page of ``q``, newest first, and the cursor of the next page (or None).
+
+    ``archived(position, n)`` returns up to ``n`` archived entries below
+    ``position``; they are merged with the hot rows by ``(timestamp, id)``.
+    """
+    position = decode_position(before) if before is not None else None
+    if position is not None:
+        q = q.filter(tuple_(AuditLog.timestamp, AuditLog.id) < tuple_(*position))
+    elif offset:
+        q = q.offset(offset)
+    entries = q.order_by(AuditLog.timestamp.desc(), AuditLog.id.desc()).limit(limit + 1).all()
+    if archived is not None:
+        # An entry caught between writing the archive and deleting the row is in both.
+        merged = {(e.timestamp, e.id): e for e in archived(position, limit + 1)}
+        merged.update({(e.timestamp, e.id): e for e in entries})
+        entries = sorted(merged.values(), key=lambda e: (e.timestamp, e.id), reverse=True)[:limit + 1]
+    if len(entries) <= limit:
+        return entries, None
+    entries = entries[:limit]
+    last = entries[-1]
+    return entries, encode_cursor((last.timestamp.isoformat(), last.id))
+
+
+def _table_estimate(db: Session) -> int:
+    if db.get_bind().dialect.name == "postgresql":
+        estimate = db.execute(
+            text("SELECT reltuples::bigint FROM pg_class WHERE oid = 'audit_log'::regclass")
+        ).scalar()
+        if estimate and estimate > 0:
+            return estimate
+    # Ids are only ever appended and old entries leave from the low end.
+    low, high = db.query(func.min(AuditLog.id), func.max(AuditLog.id)).one()
+    return 0 if low is None else high - low + 1
+
+
+def count(db: Session, q: OrmQuery, is_filtered: bool) -> tuple[int, bool]:
+    """``(total, is_estimate)`` for ``q`` without counting past :data:`COUNT_CAP`."""
+    capped = q.with_entities(AuditLog.id).order_by(None).limit(COUNT_CAP + 1).subquery()
+    total = db.query(func.count()).select_from(capped).scalar()
+    if total <= COUNT_CAP:
+        return total, False
+    return (COUNT_CAP if is_filtered else max(_table_estimate(db), COUNT_CAP)), True
+
+
+def entry_dict(e: AuditLog) -> dict:
+    return {
+        "id": e.id,
+        "timestamp": e.timestamp.isoformat() if e.timestamp else None,
+        "userId": e.user_id,
+        "userEmail": e.user_email,
+        "action": e.action,
+        "entityType": e.entity_type,
+        "entityId": e.entity_id,
+        "detail": e.detail,
+    }
@@ -1,8 +1,262 @@
-"""Helper to write audit log entries."""
+"""Audit log entries: written with the caller's transaction or in batches.
+
+By default (no running writer, or entity types listed in
+``AUDIT_STRICT_ENTITY_TYPES``) an entry is an ``AuditLog`` row inside the
+caller's transaction: it commits or rolls back with the change it records.
+
+When :data:`audit_writer` runs (``AUDIT_ASYNC``, started by the app), other
+entries are held on the session until its transaction commits, then handed
+to an in-process queue.  A background thread writes the queue with one
+``insert()`` executemany per ``AUDIT_BATCH_SIZE`` entries, at least every
+``AUDIT_FLUSH_INTERVAL_SECONDS``.  Batches the database does not take (and
+entries arriving while the queue is full) are appended to a per-process
+JSON-lines spool file in ``AUDIT_SPOOL_DIR`` and replayed after the next
+successful write, or on startup for spools left by dead processes.
+
+Queued entries are lost if the process is killed before they are written;
+entity types that must never lose an entry belong in the strict list.
+"""
+import json
+import logging
+import os
+import queue
+import threading
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+
+from sqlalchemy import event, insert
+from sqlalchemy.exc import SQLAlchemyError
 from sqlalchemy.orm import Session
 
+from app.config import settings
 from app.models.audit_log import AuditLog
 from app.models.user import User
+from app.services.table_versions import bump_versions
+
+logger = logging.getLogger(__name__)
+
+_PENDING_KEY = "audit_pending"
+_SPOOL_PREFIX = "audit-"
+
+
+def audit_entry(
+    user: User | None,
+    action: str,
+    entity_type: str,
+    entity_id: str | None = None,
+    detail: str | None = None,
+) -> dict:
+    """An ``audit_log`` row as a dict, stamped now."""
+    return {
+        "timestamp": datetime.now(timezone.utc),
+        "user_id": user.id if user else None,
+        "user_email": user.email if user else None,
+        "action": action,
+        "entity_type": entity_type,
+        "entity_id": entity_id,
+        "detail": detail,
+    }
+
+
+def _insert_entries(connection, entries: list[dict]):
+    connection.execute(insert(AuditLog), entries)
+    bump_versions(connection, [AuditLog.__tablename__])
+
+
+class AuditWriter:
+    def __init__(
+        self,
+        batch_size: int,
+        flush_interval: float,
+        max_queue: int,
+        spool_dir: str,
+        strict_entity_types: list[str],
+    ):
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.spool_dir = Path(spool_dir)
+        self.strict_entity_types = frozenset(strict_entity_types)
+        self._queue: queue.Queue[dict] = queue.Queue(max_queue)
+        self._session_factory = None
+        self._thread: threading.Thread | None = None
+        self._wake = threading.Event()
+        self._stopping = threading.Event()
+        self._flush_lock = threading.Lock()
+        self._spool_lock = threading.Lock()
+        self.written = 0
+        self.spooled = 0
+        self.replayed = 0
+
+    @property
+    def running(self) -> bool:
+        return self._thread is not None
+
+    @property
+    def spool_path(self) -> Path:
+        return self.spool_dir / f"{_SPOOL_PREFIX}{os.getpid()}.jsonl"
+
+    def is_strict(self, entity_type: str) -> bool:
+        return not self.running or entity_type in self.strict_entity_types
+
+    def start(self, session_factory):
+        """Start the background thread; replays spools left by dead processes first."""
+        if self.running:
+            return
+        self._session_factory = session_factory
+        self._stopping.clear()
+        self._replay_orphaned_spools()
+        self._thread = threading.Thread(target=self._run, name="audit-writer", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        """Write everything still queued and stop the thread."""
+        if not self.running:
+            return
+        self._stopping.set()
+        self._wake.set()
+        self._thread.join()
+        self._thread = None
+
+    def submit(self, entries: list[dict]):
+        overflow = []
+        for entry in entries:
+            try:
+                self._queue.put_nowait(entry)
+            except queue.Full:
+                overflow.append(entry)
+        if overflow:
+            self._spool(overflow)
+        if self._queue.qsize() >= self.batch_size:
+            self._wake.set()
+
+    def _run(self):
+        while not self._stopping.is_set():
+            self._wake.wait(self.flush_interval)
+            self._wake.clear()
+            self.flush()
+        self.flush()
+
+    def flush(self):
+        """Write all queued entries now (also used to read one's own writes)."""
+        if not self.running:
+            return
+        with self._flush_lock:
+            while True:
+                batch = []
+                while len(batch) < self.batch_size:
+                    try:
+                        batch.append(self._queue.get_nowait())
+                    except queue.Empty:
+                        break
+                if not batch:
+                    break
+                if not self._write(batch):
+                    self._spool(batch)
+                    return
+            self._replay(self.spool_path)
+
+    def _write(self, entries: list[dict]) -> bool:
+        try:
+            with self._session_factory() as db:
+                _insert_entries(db.connection(), entries)
+                db.commit()
+        except SQLAlchemyError:
+            logger.warning("Audit log write failed; spooling %d entries", len(entries), exc_info=True)
+            return False
+        self.written += len(entries)
+        return True
+
+    def _spool(self, entries: list[dict]):
+        lines = "".join(
+            json.dumps({**e, "timestamp": e["timestamp"].isoformat()}) + "\n" for e in entries
+        )
+        with self._spool_lock:
+            self.spool_dir.mkdir(parents=True, exist_ok=True)
+            with open(self.spool_path, "a", encoding="utf-8") as f:
+                f.write(lines)
+                f.flush()
+                os.fsync(f.fileno())
+            self.spooled += len(entries)
+
+    def _replay(self, path: Path):
+        """Write a spool file's entries and remove it; kept if the database still fails."""
+        with self._spool_lock:
+            if not path.exists():
+                return
+            claimed = path.with_suffix(".replaying")
+            os.replace(path, claimed)
+        entries = []
+        with open(claimed, encoding="utf-8") as f:
+            for line in f:
+                if line.strip():
+                    entry = json.loads(line)
+                    entry["timestamp"] = datetime.fromisoformat(entry["timestamp"])
+                    entries.append(entry)
+        for start in range(0, len(entries), self.batch_size):
+            if not self._write(entries[start:start + self.batch_size]):
+                self._spool(entries[start:])
+                break
+            self.replayed += len(entries[start:start + self.batch_size])
+        claimed.unlink()
+
+    def _replay_orphaned_spools(self):
+        if not self.spool_dir.is_dir():
+            return
+        for path in sorted(self.spool_dir.glob(f"{_SPOOL_PREFIX}*")):
+            if path.suffix not in (".jsonl", ".replaying"):
+                continue
+            try:
+                pid = int(path.stem.removeprefix(_SPOOL_PREFIX))
+            except ValueError:
+                continue
+            if pid != os.getpid() and _process_alive(pid):
+                continue
+            self._replay(path)
+
+    def stats(self) -> dict:
+        return {
+            "running": self.running,
+            "queued": self._queue.qsize(),
+            "written": self.written,
+            "spooled": self.spooled,
+            "replayed": self.replayed,
+        }
+
+
+def _process_alive(pid: int) -> bool:
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    return True
+
+
+audit_writer = AuditWriter(
+    batch_size=settings.AUDIT_BATCH_SIZE,
+    flush_interval=settings.AUDIT_FLUSH_INTERVAL_SECONDS,
+    max_queue=settings.AUDIT_QUEUE_MAX_ENTRIES,
+    spool_dir=settings.AUDIT_SPOOL_DIR,
+    strict_entity_types=settings.AUDIT_STRICT_ENTITY_TYPES,
+)
+
+
+def flush_audit_log():
+    """Route dependency: write this process's queued entries before the route
+    (and its ETag) reads the audit log."""
+    audit_writer.flush()
+
+
+def visibility_lag() -> timedelta:
+    """How long a committed entry of another worker may still sit in its queue.
+
+    Readers that page the log by time (incremental exports) should overlap by
+    this much; entries held in a spool file after a failed write can be later.
+    """
+    if not audit_writer.running:
+        return timedelta(0)
+    return timedelta(seconds=2 * audit_writer.flush_interval)
 
 
 def write_audit(
@@ -13,13 +267,38 @@ def write_audit(
     entity_id: str | None = None,
     detail: str | None = None,
 ):
-    entry = AuditLog(
-        user_id=user.id if user else None,
-        user_email=user.email if user else None,
-        action=action,
-        entity_type=entity_type,
-        entity_id=entity_id,
-        detail=detail,
-    )
-    db.add(entry)
+    if audit_writer.is_strict(entity_type):
+        db.add(AuditLog(**audit_entry(user, action, entity_type, entity_id, detail)))
+    else:
+        _hold(db, [audit_entry(user, action, entity_type, entity_id, detail)])
     # Don't commit here — let the caller's transaction handle it.
+
+
+def write_audit_many(db: Session, entries: list[dict]):
+    """Record many :func:`audit_entry` dicts at once; strict ones with one bulk insert."""
+    strict = [e for e in entries if audit_writer.is_strict(e["entity_type"])]
+    if strict:
+        _insert_entries(db.connection(), strict)
+    if len(strict) < len(entries):
+        _hold(db, [e for e in entries if not audit_writer.is_strict(e["entity_type"])])
+
+
+def _hold(db: Session, entries: list[dict]):
+    """Keep ``entries`` on the session until its transaction ends."""
+    if not db.in_transaction():
+        db.begin()
+    db.info.setdefault(_PENDING_KEY, []).extend(entries)
+
+
+@event.listens_for(Session, "after_commit")
+def _submit_pending(session: Session):
+    entries = session.info.pop(_PENDING_KEY, None)
+    if entries:
+        audit_writer.submit(entries)
+
+
+@event.listens_for(Session, "after_transaction_end")
+def _discard_pending(session: Session, transaction):
+    # Entries of a transaction that did not commit describe changes that never happened.
+    if transaction.parent is None and not transaction.nested:
+        session.info.pop(_PENDING_KEY, None)
@@ -4,16 +4,32 @@ from jose import JWTError, jwt
 from passlib.context import CryptContext
 
 from app.config import settings
+from app.services.password_pool import PasswordPool, hash_in_worker, verify_in_worker
 
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto", bcrypt__rounds=settings.BCRYPT_ROUNDS)
+password_pool = PasswordPool(settings.PASSWORD_HASH_WORKERS)
 
 
 def hash_password(password: str) -> str:
-    return pwd_context.hash(password)
+    """Blocks the calling thread until the pool is done; routes await the async variants."""
+    return password_pool.run(hash_in_worker, password, settings.BCRYPT_ROUNDS)
 
 
 def verify_password(plain: str, hashed: str) -> bool:
-    return pwd_context.verify(plain, hashed)
+    return password_pool.run(verify_in_worker, plain, hashed)
+
+
+async def hash_password_async(password: str) -> str:
+    return await password_pool.run_async(hash_in_worker, password, settings.BCRYPT_ROUNDS)
+
+
+async def verify_password_async(plain: str, hashed: str) -> bool:
+    return await password_pool.run_async(verify_in_worker, plain, hashed)
+
+
+def password_needs_rehash(hashed: str) -> bool:
+    """True if the hash was made with a different cost factor than configured."""
+    return pwd_context.needs_update(hashed)
 
 
 def create_access_token(data: dict) -> str:
@@ -0,0 +1,264 @@
+"""Transactional batch writes across entity types (``POST /batch``).
+
+A batch is an ordered list of create/update/delete operations, applied
+all-or-nothing in one transaction:
+
+1. every payload is validated against the entity's ``*Create``/``*Update``
+   schema;
+2. the rows addressed by the batch are loaded with one ``IN`` query per entity
+   type, and ids for creates without one are reserved with one
+   :func:`allocate_ids` call per prefix;
+3. the operations are replayed in order against those rows, so later
+   operations see earlier ones (create then update, delete then re-create);
+4. if all of them succeeded, the changes go out in a single flush — the unit
+   of work sends same-table INSERTs, UPDATEs and DELETEs as executemany, and
+   the rollup and table-version listeners see the whole batch — and the
+   audit entries are recorded together (see :func:`write_audit_many`).
+
+If any operation fails nothing is written, but every operation is still
+checked and reported so a client can fix all problems in one round trip.
+"""
+from dataclasses import dataclass
+
+from fastapi import HTTPException
+from pydantic import BaseModel, ValidationError
+from sqlalchemy import inspect, tuple_
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+
+from app.models.application import Application, CapabilityMapping
+from app.models.compliance import ComplianceAssessment
+from app.models.data_object import DataObject
+from app.models.demand import Demand
+from app.models.entity import LegalEntity
+from app.models.integration import Integration
+from app.models.kpi import ManagementKPI
+from app.models.process import E2EProcess
+from app.models.project import Project, ProjectDependency
+from app.models.user import User
+from app.models.vendor import Vendor
+from app.schemas.application import (
+    ApplicationCreate, ApplicationUpdate, CapabilityMappingCreate, CapabilityMappingUpdate,
+)
+from app.schemas.batch import BatchOperation, BatchOperationResult, BatchWriteResponse
+from app.schemas.compliance import ComplianceAssessmentCreate, ComplianceAssessmentUpdate
+from app.schemas.data_object import DataObjectCreate, DataObjectUpdate
+from app.schemas.demand import DemandCreate, DemandUpdate
+from app.schemas.entity import LegalEntityCreate, LegalEntityUpdate
+from app.schemas.integration import IntegrationCreate, IntegrationUpdate
+from app.schemas.kpi import ManagementKPICreate, ManagementKPIUpdate
+from app.schemas.process import E2EProcessCreate, E2EProcessUpdate
+from app.schemas.project import ProjectCreate, ProjectDependencyCreate, ProjectDependencyUpdate, ProjectUpdate
+from app.schemas.vendor import VendorCreate, VendorUpdate
+from app.services.audit_service import audit_entry, write_audit_many
+from app.services.id_allocator import allocate_ids
+
+_IN_CHUNK_SIZE = 500
+_ACTIONS = {"create": "CREATE", "update": "UPDATE", "delete": "DELETE"}
+_SUCCESS_STATUS = {"create": 201, "update": 200, "delete": 204}
+# Reported for operations that were valid but not applied because another one failed.
+NOT_APPLIED_STATUS = 424
+
+
+@dataclass(frozen=True)
+class BatchEntity:
+    model: type
+    create_schema: type[BaseModel]
+    update_schema: type[BaseModel]
+    audit_type: str
+    id_prefix: str | None = None  # None: the key is part of the create payload
+    versioned: bool = False       # has a version column checked by if_match
+
+    @property
+    def key_columns(self) -> list[str]:
+        return [col.key for col in inspect(self.model).primary_key]
+
+
+# Keyed like the entity routes.  Domains and capabilities are left out: they
+# are created with nested children and have database-generated ids.
+BATCH_ENTITIES = {
+    "applications": BatchEntity(Application, ApplicationCreate, ApplicationUpdate, "application", "APP", versioned=True),
+    "capability-mappings": BatchEntity(
+        CapabilityMapping, CapabilityMappingCreate, CapabilityMappingUpdate, "capability_mapping",
+    ),
+    "projects": BatchEntity(Project, ProjectCreate, ProjectUpdate, "project", "PRJ"),
+    "project-dependencies": BatchEntity(
+        ProjectDependency, ProjectDependencyCreate, ProjectDependencyUpdate, "project_dependency",
+    ),
+    "vendors": BatchEntity(Vendor, VendorCreate, VendorUpdate, "vendor", "VND"),
+    "demands": BatchEntity(Demand, DemandCreate, DemandUpdate, "demand", "DEM"),
+    "integrations": BatchEntity(Integration, IntegrationCreate, IntegrationUpdate, "integration", "INT"),
+    "processes": BatchEntity(E2EProcess, E2EProcessCreate, E2EProcessUpdate, "process", "PRC"),
+    "entities": BatchEntity(LegalEntity, LegalEntityCreate, LegalEntityUpdate, "legal_entity", "ENT"),
+    "data-objects": BatchEntity(DataObject, DataObjectCreate, DataObjectUpdate, "data_object", "DO", versioned=True),
+    "compliance": BatchEntity(
+        ComplianceAssessment, ComplianceAssessmentCreate, ComplianceAssessmentUpdate, "compliance_assessment", "CA",
+    ),
+    "kpis": BatchEntity(ManagementKPI, ManagementKPICreate, ManagementKPIUpdate, "kpi", "KPI"),
+}
+
+
+class _OperationError(Exception):
+    def __init__(self, status: int, detail: str):
+        super().__init__(detail)
+        self.status = status
+        self.detail = detail
+
+
+@dataclass
+class _Step:
+    index: int
+    op: BatchOperation
+    entity: BatchEntity | None = None
+    key: tuple | None = None
+    values: dict | None = None
+    version: int | None = None
+    error: _OperationError | None = None
+
+    @property
+    def entity_id(self) -> str | None:
+        return "/".join(str(part) for part in self.key) if self.key else self.op.id
+
+    def result(self, status: int | None = None, detail: str | None = None) -> BatchOperationResult:
+        if self.error is not None:
+            status, detail = self.error.status, self.error.detail
+        return BatchOperationResult(
+            index=self.index, op=self.op.op, entity=self.op.entity, id=self.entity_id,
+            status=status if status is not None else _SUCCESS_STATUS[self.op.op],
+            version=self.version if status is None else None,
+            error=detail,
+        )
+
+
+def _validation_message(exc: ValidationError) -> str:
+    return "; ".join(f"{'.'.join(str(p) for p in e['loc']) or 'data'}: {e['msg']}" for e in exc.errors())
+
+
+def _prepare(step: _Step, user: User):
+    op = step.op
+    entity = BATCH_ENTITIES.get(op.entity)
+    if entity is None:
+        raise _OperationError(400, f"Unknown entity type: {op.entity}. Available: {', '.join(BATCH_ENTITIES)}")
+    step.entity = entity
+    if op.op == "delete" and user.role != "admin":
+        raise _OperationError(403, "Insufficient permissions")
+    if op.if_match is not None and not entity.versioned:
+        raise _OperationError(400, f"{op.entity} are not versioned; if_match is not supported")
+
+    if op.op == "create":
+        try:
+            step.values = entity.create_schema.model_validate(op.data or {}).model_dump()
+        except ValidationError as exc:
+            raise _OperationError(422, _validation_message(exc))
+        key = tuple(step.values.get(k) for k in entity.key_columns)
+        if all(part is not None for part in key):
+            step.key = key
+        elif entity.id_prefix is None:
+            raise _OperationError(422, f"{', '.join(entity.key_columns)} required")
+        return
+
+    if not op.id:
+        raise _OperationError(400, f"id is required for {op.op}")
+    parts = tuple(op.id.split("/")) if len(entity.key_columns) > 1 else (op.id,)
+    if len(parts) != len(entity.key_columns):
+        raise _OperationError(400, f"id must be {'/'.join(entity.key_columns)}")
+    step.key = parts
+    if op.op == "update":
+        try:
+            step.values = entity.update_schema.model_validate(op.data or {}).model_dump(exclude_unset=True)
+        except ValidationError as exc:
+            raise _OperationError(422, _validation_message(exc))
+
+
+def _load(db: Session, entity: BatchEntity, keys: set[tuple]) -> dict[tuple, object]:
+    """The existing rows among ``keys``, one ``IN`` query per chunk."""
+    columns = [getattr(entity.model, k) for k in entity.key_columns]
+    keys = list(keys)
+    found = {}
+    for start in range(0, len(keys), _IN_CHUNK_SIZE):
+        chunk = keys[start:start + _IN_CHUNK_SIZE]
+        if len(columns) == 1:
+            condition = columns[0].in_([k[0] for k in chunk])
+        else:
+            condition = tuple_(*columns).in_(chunk)
+        for obj in db.query(entity.model).filter(condition):
+            found[tuple(getattr(obj, k) for k in entity.key_columns)] = obj
+    return found
+
+
+def _apply(db: Session, step: _Step, rows: dict):
+    op, entity = step.op, step.entity
+    slot = (op.entity, step.key)
+    current = rows.get(slot)
+    if op.op == "create":
+        if current is not None:
+            raise _OperationError(409, f"{step.entity_id} already exists")
+        obj = entity.model(**step.values)
+        if entity.versioned:
+            step.version = obj.version = 1
+        db.add(obj)
+        rows[slot] = obj
+        return
+
+    if current is None:
+        raise _OperationError(404, f"{step.entity_id} not found")
+    if op.if_match is not None and (current.version or 1) != op.if_match:
+        raise _OperationError(409, "Conflict: entity was modified by another user")
+    if op.op == "update":
+        for key, value in step.values.items():
+            setattr(current, key, value)
+        if entity.versioned:
+            current.version = (current.version or 1) + 1
+            step.version = current.version
+    elif inspect(current).pending:
+        db.expunge(current)
+        rows[slot] = None
+    else:
+        db.delete(current)
+        rows[slot] = None
+
+
+def apply_batch(db: Session, user: User, operations: list[BatchOperation]) -> BatchWriteResponse:
+    """Apply ``operations`` in order in one transaction, or none of them. Commits."""
+    steps = [_Step(index, op) for index, op in enumerate(operations)]
+    for step in steps:
+        try:
+            _prepare(step, user)
+        except _OperationError as exc:
+            step.error = exc
+
+    valid = [s for s in steps if s.error is None]
+    rows: dict[tuple, object] = {}
+    for name, entity in BATCH_ENTITIES.items():
+        keys = {s.key for s in valid if s.op.entity == name and s.key is not None}
+        if keys:
+            found = _load(db, entity, keys)
+            rows.update(((name, key), found.get(key)) for key in keys)
+        pending = [s for s in valid if s.op.entity == name and s.key is None]
+        if pending:
+            ids = allocate_ids(db, entity.model, entity.id_prefix, len(pending))
+            for step, new_id in zip(pending, ids):
+                step.values["id"] = new_id
+                step.key = (new_id,)
+
+    for step in valid:
+        try:
+            _apply(db, step, rows)
+        except _OperationError as exc:
+            step.error = exc
+
+    if any(s.error is not None for s in steps):
+        db.rollback()
+        return BatchWriteResponse(committed=False, results=[
+            s.result(NOT_APPLIED_STATUS, "Not applied: another operation in the batch failed") for s in steps
+        ])
+
+    try:
+        db.flush()
+    except IntegrityError as exc:
+        db.rollback()
+        raise HTTPException(status_code=409, detail=f"Batch rejected by the database: {exc.orig}")
+    results = [s.result() for s in steps]
+    write_audit_many(db, [audit_entry(user, _ACTIONS[s.op.op], s.entity.audit_type, s.entity_id) for s in steps])
+    db.commit()
+    return BatchWriteResponse(committed=True, results=results)
@@ -0,0 +1,251 @@
+"""Schedule analysis of the project dependency graph.
+
+A ``ProjectDependency`` row says its source project needs its target project,
+so the target has to finish first.  :func:`analyze` derives from these rows and
+the project periods (``start``/``end`` like ``Q1/2026`` or ISO dates):
+
+* a topological order, prerequisites first;
+* the cycles, which no order can satisfy;
+* the critical path, the chain of dependent projects with the longest total
+  duration;
+* schedule conflicts, where a prerequisite ends after its dependent starts.
+
+The result is cached per process.  The ``projects`` and
+``project_dependencies`` table versions tell whether anything was written;
+only if the dependencies or project periods actually differ is the analysis
+recomputed, so renaming a project or editing its budget costs one small read.
+"""
+import calendar
+import heapq
+import re
+import threading
+from dataclasses import dataclass, field
+from datetime import date
+
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+from app.models.project import Project, ProjectDependency
+from app.models.table_version import TableVersion
+from app.services.table_versions import EPOCH_KEY
+
+_QUARTER = re.compile(r"^Q([1-4])\s*/\s*(\d{4})$", re.IGNORECASE)
+_MONTH = re.compile(r"^(\d{4})-(\d{1,2})$")
+_YEAR = re.compile(r"^(\d{4})$")
+
+_TABLES = (Project.__tablename__, ProjectDependency.__tablename__)
+
+
+def parse_period(value: str | None, end: bool = False) -> date | None:
+    """First (or with ``end`` last) day of a period like ``Q3/2026``, ``2026-07`` or ``2026-07-15``."""
+    if not value:
+        return None
+    value = value.strip()
+    if m := _QUARTER.match(value):
+        year, month = int(m.group(2)), (int(m.group(1)) - 1) * 3 + 1
+        if end:
+            month += 2
+    elif m := _MONTH.match(value):
+        year, month = int(m.group(1)), int(m.group(2))
+    elif m := _YEAR.match(value):
+        year, month = int(m.group(1)), 12 if end else 1
+    else:
+        try:
+            return date.fromisoformat(value)
+        except ValueError:
+            return None
+    if not 1 <= month <= 12:
+        return None
+    return date(year, month, calendar.monthrange(year, month)[1] if end else 1)
+
+
+@dataclass(frozen=True)
+class DependencyAnalysis:
+    order: list[str]
+    cycles: list[list[str]]
+    critical_path: list[str]
+    critical_days: int
+    conflicts: list[dict]
+    undated: list[str]
+    # project -> projects it needs / projects that need it
+    prerequisites: dict[str, list[str]] = field(repr=False)
+    dependents: dict[str, list[str]] = field(repr=False)
+
+    def closure(self, project_id: str) -> dict:
+        """Every project ``project_id`` needs, and every project needing it, transitively."""
+        return {
+            "projectId": project_id,
+            "dependsOn": _reachable(self.prerequisites, project_id),
+            "dependents": _reachable(self.dependents, project_id),
+        }
+
+    def as_dict(self) -> dict:
+        return {
+            "order": self.order,
+            "cycles": self.cycles,
+            "criticalPath": {"projects": self.critical_path, "durationDays": self.critical_days},
+            "conflicts": self.conflicts,
+            "undated": self.undated,
+        }
+
+
+def _reachable(adjacency: dict[str, list[str]], start: str) -> list[str]:
+    seen, stack = {start}, [start]
+    while stack:
+        for other in adjacency.get(stack.pop(), ()):
+            if other not in seen:
+                seen.add(other)
+                stack.append(other)
+    seen.discard(start)
+    return sorted(seen)
+
+
+def _cycles(nodes: list[str], dependents: dict[str, list[str]]) -> list[list[str]]:
+    """Strongly connected components with more than one project, or a self-dependency."""
+    index: dict[str, int] = {}
+    low: dict[str, int] = {}
+    stack: list[str] = []
+    on_stack: set[str] = set()
+    found = []
+    for root in nodes:
+        if root in index:
+            continue
+        work = [(root, 0)]
+        while work:
+            node, position = work.pop()
+            if position == 0:
+                index[node] = low[node] = len(index)
+                stack.append(node)
+                on_stack.add(node)
+            children = dependents.get(node, ())
+            while position < len(children):
+                other = children[position]
+                position += 1
+                if other not in index:
+                    work.append((node, position))
+                    work.append((other, 0))
+                    break
+                if other in on_stack:
+                    low[node] = min(low[node], index[other])
+            else:
+                if low[node] == index[node]:
+                    component = []
+                    while True:
+                        member = stack.pop()
+                        on_stack.discard(member)
+                        component.append(member)
+                        if member == node:
+                            break
+                    if len(component) > 1 or node in dependents.get(node, ()):
+                        found.append(sorted(component))
+                if work:
+                    parent = work[-1][0]
+                    low[parent] = min(low[parent], low[node])
+    return sorted(found, key=lambda c: (-len(c), c))
+
+
+def compute(periods: dict[str, tuple[str | None, str | None]], edges: list[tuple[str, str]]) -> DependencyAnalysis:
+    """Analyse ``edges`` of ``(source, target)`` = "source needs target"."""
+    nodes = sorted(set(periods).union(*edges))
+    prerequisites: dict[str, list[str]] = {n: [] for n in nodes}
+    dependents: dict[str, list[str]] = {n: [] for n in nodes}
+    for source, target in sorted(set(edges)):
+        prerequisites[source].append(target)
+        dependents[target].append(source)
+
+    dates = {}
+    for n in nodes:
+        start, end = periods.get(n, (None, None))
+        dates[n] = (parse_period(start), parse_period(end, end=True))
+    duration = {n: (e - s).days + 1 if s and e and e >= s else 0 for n, (s, e) in dates.items()}
+
+    # Kahn's algorithm, smallest id first among ready projects so the order is stable.
+    waiting = {n: len(prerequisites[n]) for n in nodes}
+    ready = [n for n in nodes if waiting[n] == 0]
+    heapq.heapify(ready)
+    order = []
+    finish: dict[str, int] = {}
+    via: dict[str, str | None] = {}
+    while ready:
+        node = heapq.heappop(ready)
+        order.append(node)
+        before = max(prerequisites[node], key=lambda p: (finish[p], p), default=None)
+        finish[node] = duration[node] + (finish[before] if before else 0)
+        via[node] = before
+        for other in dependents[node]:
+            waiting[other] -= 1
+            if waiting[other] == 0:
+                heapq.heappush(ready, other)
+
+    # Projects in or behind a cycle never become ready; the critical path ignores them.
+    critical_path, critical_days = [], 0
+    if finish:
+        last = max(finish, key=lambda n: (finish[n], n))
+        critical_days = finish[last]
+        node = last
+        while node is not None:
+            critical_path.append(node)
+            node = via[node]
+        critical_path.reverse()
+
+    conflicts = []
+    for source, target in sorted(set(edges)):
+        needed_end, start = dates[target][1], dates[source][0]
+        if needed_end and start and needed_end >= start:
+            conflicts.append({
+                "source": source, "target": target,
+                "targetEnd": needed_end.isoformat(), "sourceStart": start.isoformat(),
+            })
+
+    return DependencyAnalysis(
+        order=order,
+        cycles=_cycles(nodes, dependents),
+        critical_path=critical_path,
+        critical_days=critical_days,
+        conflicts=conflicts,
+        undated=[n for n in nodes if not duration[n]],
+        prerequisites=prerequisites,
+        dependents=dependents,
+    )
+
+
+class _Cache:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.clear()
+
+    def clear(self):
+        self.versions = None
+        self.inputs = None
+        self.analysis: DependencyAnalysis | None = None
+        self.computed = 0
+
+    def get(self, db: Session) -> DependencyAnalysis:
+        keys = (EPOCH_KEY, *_TABLES)
+        stored = dict(db.execute(
+            select(TableVersion.table_name, TableVersion.version).where(TableVersion.table_name.in_(keys))
+        ).all())
+        versions = tuple(stored.get(k, 0) for k in keys)
+        with self._lock:
+            if versions == self.versions:
+                return self.analysis
+        periods = {pid: (start, end) for pid, start, end in db.execute(select(Project.id, Project.start, Project.end))}
+        edges = [tuple(row) for row in db.execute(
+            select(ProjectDependency.source_project_id, ProjectDependency.target_project_id)
+        )]
+        inputs = (periods, sorted(edges))
+        with self._lock:
+            if inputs != self.inputs:
+                self.analysis = compute(periods, edges)
+                self.inputs = inputs
+                self.computed += 1
+            self.versions = versions
+            return self.analysis
+
+
+analysis_cache = _Cache()
+
+
+def analyze(db: Session) -> DependencyAnalysis:
+    """The analysis of the current dependencies, recomputed only when its inputs changed."""
+    return analysis_cache.get(db)
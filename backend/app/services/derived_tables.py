@@ -0,0 +1,128 @@
+"""Tables derived from the entity tables: rollups, entity links, search index.
+
+Each derived table is registered here by its service as a
+:class:`DerivedTable`:
+
+* ``maintain(session, changes)`` is called from one ``after_flush`` listener
+  on every :class:`Session` with the objects the flush wrote, and updates
+  the derived rows in the same transaction;
+* ``rebuild(db)`` recomputes the table from its sources.  Writes that bypass
+  the ORM (the bulk import and seed loader) call :func:`rebuild_for` with the
+  tables they wrote;
+* :func:`ensure_all` builds empty derived tables at startup, for databases
+  that predate them.
+
+The repair command rebuilds all of them, or the ones named::
+
+    python -m app.services.derived_tables [rollups|links|search ...]
+"""
+import time
+from collections.abc import Callable, Iterable
+from dataclasses import dataclass
+
+from sqlalchemy import Table, event, inspect, select
+from sqlalchemy.orm import Session
+
+
+@dataclass(frozen=True)
+class Change:
+    """An object written by a flush; ``had``/``has``: it existed before/after."""
+    obj: object
+    had: bool
+    has: bool
+
+
+def history_value(obj, attribute: str, old: bool):
+    """The attribute's value before (``old``) or after the flush being processed."""
+    hist = inspect(obj).attrs[attribute].history
+    current = (hist.deleted or hist.unchanged) if old else (hist.added or hist.unchanged)
+    return current[0] if current else None
+
+
+def flushed_changes(session: Session) -> list[Change]:
+    # new/dirty/deleted and attribute history still describe the flushed changes in after_flush.
+    return (
+        [Change(obj, False, True) for obj in session.new]
+        + [Change(obj, True, True) for obj in session.dirty if session.is_modified(obj, include_collections=False)]
+        + [Change(obj, True, False) for obj in session.deleted]
+    )
+
+
+@dataclass(frozen=True)
+class DerivedTable:
+    name: str
+    model: type
+    sources: frozenset[Table]
+    maintain: Callable[[Session, list[Change]], None]
+    rebuild: Callable[[Session], int]
+
+    def is_empty(self, db: Session) -> bool:
+        key = next(iter(self.model.__table__.primary_key.columns))
+        return db.execute(select(key).limit(1)).first() is None
+
+
+_registry: dict[str, DerivedTable] = {}
+
+
+def register(derived: DerivedTable) -> DerivedTable:
+    _registry[derived.name] = derived
+    return derived
+
+
+def derived_tables() -> list[DerivedTable]:
+    return [_registry[name] for name in sorted(_registry)]
+
+
+@event.listens_for(Session, "after_flush")
+def _maintain_derived_tables(session: Session, _flush_context):
+    changes = flushed_changes(session)
+    if changes:
+        for derived in derived_tables():
+            derived.maintain(session, changes)
+
+
+def rebuild_for(db: Session, tables: Iterable[Table]) -> dict[str, float]:
+    """Rebuild the derived tables fed by ``tables``; milliseconds per rebuild. Does not commit."""
+    written = set(tables)
+    timings = {}
+    for derived in derived_tables():
+        if derived.sources & written:
+            started = time.perf_counter()
+            derived.rebuild(db)
+            timings[derived.name] = round((time.perf_counter() - started) * 1000, 1)
+    return timings
+
+
+def ensure_all(db: Session):
+    """Build each derived table that is still empty. Commits."""
+    for derived in derived_tables():
+        if derived.is_empty(db):
+            derived.rebuild(db)
+            db.commit()
+
+
+# The services register their tables on import; they import this module first.
+from app.services import link_service, rollup_service, search_service  # noqa: E402,F401
+
+
+if __name__ == "__main__":
+    import sys
+
+    from app.database import Base, SessionLocal, engine
+    # Run as a script this file is __main__; the services registered with the imported module.
+    from app.services.derived_tables import derived_tables as registered
+
+    available = {derived.name: derived for derived in registered()}
+    names = sys.argv[1:] or list(available)
+    unknown = [n for n in names if n not in available]
+    if unknown:
+        sys.exit(f"Unknown derived tables: {', '.join(unknown)}. Available: {', '.join(available)}")
+    Base.metadata.create_all(bind=engine)
+    session = SessionLocal()
+    try:
+        for name in names:
+            count = available[name].rebuild(session)
+            session.commit()
+            print(f"Rebuilt {name}: {count} rows")
+    finally:
+        session.close()
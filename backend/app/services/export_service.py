@@ -0,0 +1,284 @@
+"""Serialization of the landscape into the camelCase export document.
+
+Every section of ``/export/json`` is described by an :class:`ExportSection`.
+Rows are read in batches (``yield_per``, server-side cursors on PostgreSQL)
+and turned into dicts one at a time, so the streaming exports (JSON, NDJSON,
+CSV) never hold more than one batch of rows in memory.
+
+Incremental exports (``updated_since``) are answered from the audit log: a
+row is included when an audit entry for it was written at or after the given
+time.  A seed or bulk import since that time counts as a change of every row.
+Entries moved to the audit archive are not consulted: a time before the
+archive cutoff (:func:`archived_after`) cannot be answered incrementally.
+"""
+import csv
+import io
+import json
+from collections.abc import Iterator
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from functools import cached_property
+
+from sqlalchemy import String, cast, select
+from sqlalchemy.orm import Session, selectinload
+
+from app.models.domain import Domain, Capability
+from app.models.application import Application, CapabilityMapping
+from app.models.project import Project, ProjectDependency
+from app.models.vendor import Vendor
+from app.models.demand import Demand
+from app.models.integration import Integration
+from app.models.process import E2EProcess
+from app.models.entity import LegalEntity
+from app.models.compliance import ComplianceAssessment
+from app.models.kpi import ManagementKPI
+from app.models.audit_log import AuditLog
+from app.services import audit_archive
+
+EXPORT_BATCH_SIZE = 500
+_FLUSH_BYTES = 64 * 1024
+
+
+def to_camel(name: str) -> str:
+    components = name.split("_")
+    return components[0] + "".join(x.title() for x in components[1:])
+
+
+def dumps(obj) -> str:
+    """Encode exactly like ``JSONResponse`` does."""
+    return json.dumps(obj, ensure_ascii=False, allow_nan=False, separators=(",", ":"))
+
+
+def normalize_since(since: datetime | None) -> datetime | None:
+    """Audit timestamps are stored as naive UTC."""
+    if since is not None and since.tzinfo is not None:
+        since = since.astimezone(timezone.utc).replace(tzinfo=None)
+    return since
+
+
+def archived_after(since: datetime | None) -> datetime | None:
+    """The audit archive cutoff if changes at or after ``since`` may have been
+    archived, so an incremental export from the live log would miss them."""
+    since = normalize_since(since)
+    cutoff = audit_archive.archived_before()
+    if since is not None and cutoff is not None and since < cutoff:
+        return cutoff
+    return None
+
+
+def _reseeded_since(db: Session, since: datetime) -> bool:
+    return db.query(AuditLog.id).filter(
+        AuditLog.entity_type.in_(("seed", "import")), AuditLog.timestamp >= since,
+    ).first() is not None
+
+
+def _changed_ids(entity_type: str, since: datetime):
+    return select(AuditLog.entity_id).where(
+        AuditLog.entity_type == entity_type, AuditLog.timestamp >= since,
+    )
+
+
+@dataclass(frozen=True)
+class ExportSection:
+    key: str
+    model: type
+    entity_type: str  # ``entity_type`` written to the audit log for this table
+    # column -> factory used when the stored value is falsy (mirrors ``x or []``)
+    empty: dict = field(default_factory=dict)
+    renames: dict = field(default_factory=dict)
+
+    @cached_property
+    def columns(self) -> list:
+        return list(self.model.__table__.columns)
+
+    @cached_property
+    def fields(self) -> list[tuple[str, str]]:
+        """``(camelCase key, column name)`` pairs in column order."""
+        return [(self.renames.get(c.key) or to_camel(c.key), c.key) for c in self.columns]
+
+    def serialize(self, values) -> dict:
+        out = {}
+        for (camel, col), value in zip(self.fields, values):
+            if not value and col in self.empty:
+                value = self.empty[col]()
+            out[camel] = value
+        return out
+
+    def audit_key(self):
+        """SQL expression matching ``AuditLog.entity_id`` for a row of this table."""
+        pk = [cast(c, String) for c in self.model.__table__.primary_key.columns]
+        key = pk[0]
+        for col in pk[1:]:
+            key = key + "/" + col
+        return key
+
+    def changed_since(self, since: datetime):
+        return self.audit_key().in_(_changed_ids(self.entity_type, since))
+
+    def select(self):
+        return select(*self.columns)
+
+    def iter_rows(
+        self, db: Session, batch_size: int = EXPORT_BATCH_SIZE, since: datetime | None = None,
+    ) -> Iterator[dict]:
+        """Flat records, one per table row."""
+        stmt = self.select()
+        if since is not None:
+            stmt = stmt.where(self.changed_since(since))
+        for row in db.execute(stmt.execution_options(yield_per=batch_size)):
+            yield self.serialize(row)
+
+    def iter_records(
+        self, db: Session, batch_size: int = EXPORT_BATCH_SIZE, since: datetime | None = None,
+    ) -> Iterator[dict]:
+        """Records as they appear in the export document."""
+        return self.iter_rows(db, batch_size, since)
+
+
+class DomainSection(ExportSection):
+    """Domains are exported with their capabilities and sub-capabilities nested."""
+
+    def changed_since(self, since: datetime):
+        changed_caps = select(Capability.domain_id).where(
+            Capability.id.in_(_changed_ids("capability", since))
+        )
+        return super().changed_since(since) | Domain.id.in_(changed_caps)
+
+    def iter_records(
+        self, db: Session, batch_size: int = EXPORT_BATCH_SIZE, since: datetime | None = None,
+    ) -> Iterator[dict]:
+        q = db.query(Domain).options(
+            selectinload(Domain.capabilities).selectinload(Capability.sub_capabilities)
+        )
+        if since is not None:
+            q = q.filter(self.changed_since(since))
+        for d in q.yield_per(batch_size):
+            record = self.serialize(getattr(d, col) for _, col in self.fields)
+            record["capabilities"] = [
+                {
+                    "id": cap.id,
+                    "name": cap.name,
+                    "maturity": cap.maturity,
+                    "targetMaturity": cap.target_maturity,
+                    "criticality": cap.criticality,
+                    "subCapabilities": [{"id": sc.id, "name": sc.name} for sc in cap.sub_capabilities],
+                }
+                for cap in d.capabilities
+            ]
+            yield record
+
+
+EXPORT_SECTIONS: list[ExportSection] = [
+    DomainSection("domains", Domain, "domain", empty={"kpis": list}),
+    ExportSection("applications", Application, "application", empty={
+        "scores": dict, "technology": list, "entities": list, "regulations": list,
+        "version": lambda: 1,
+    }),
+    ExportSection("capabilityMappings", CapabilityMapping, "capability_mapping"),
+    ExportSection("projects", Project, "project", empty={
+        "secondary_domains": list, "capabilities": list, "affected_apps": list,
+        "e2e_processes": list, "media_break_refs": list,
+    }),
+    ExportSection("projectDependencies", ProjectDependency, "project_dependency"),
+    ExportSection("vendors", Vendor, "vendor"),
+    ExportSection("demands", Demand, "demand", empty={
+        "related_domains": list, "related_apps": list, "related_vendors": list,
+    }, renames={"is_ai_use_case": "isAIUseCase"}),
+    ExportSection("integrations", Integration, "integration"),
+    ExportSection("e2eProcesses", E2EProcess, "process", empty={"domains": list, "kpis": list}),
+    ExportSection("legalEntities", LegalEntity, "legal_entity"),
+    ExportSection("complianceAssessments", ComplianceAssessment, "compliance_assessment", empty={"audit_trail": list}),
+    ExportSection("managementKPIs", ManagementKPI, "kpi"),
+]
+
+SECTIONS_BY_KEY = {section.key: section for section in EXPORT_SECTIONS}
+
+
+def export_document(db: Session) -> dict:
+    """Build the complete export document in memory."""
+    return {section.key: list(section.iter_records(db)) for section in EXPORT_SECTIONS}
+
+
+def streamed(session_factory, produce, *args, **kwargs) -> Iterator[bytes]:
+    """Run ``produce(db, *args, **kwargs)`` on a session of its own, closed when done.
+
+    A ``StreamingResponse`` body is iterated after the request's ``get_db``
+    session has been closed, so it must not read through that session.
+    """
+    db = session_factory()
+    try:
+        yield from produce(db, *args, **kwargs)
+    finally:
+        db.close()
+
+
+def iter_export_json(db: Session, batch_size: int = EXPORT_BATCH_SIZE) -> Iterator[bytes]:
+    """Yield the export document as JSON, section by section, in ~64 KiB chunks."""
+    buf: list[str] = ["{"]
+    size = 1
+    for i, section in enumerate(EXPORT_SECTIONS):
+        head = ("," if i else "") + dumps(section.key) + ":["
+        buf.append(head)
+        size += len(head)
+        for j, record in enumerate(section.iter_records(db, batch_size)):
+            chunk = ("," if j else "") + dumps(record)
+            buf.append(chunk)
+            size += len(chunk)
+            if size >= _FLUSH_BYTES:
+                yield "".join(buf).encode("utf-8")
+                buf, size = [], 0
+        buf.append("]")
+        size += 1
+    buf.append("}")
+    yield "".join(buf).encode("utf-8")
+
+
+def _resolve_since(db: Session, since: datetime | None) -> datetime | None:
+    since = normalize_since(since)
+    if since is not None and _reseeded_since(db, since):
+        return None
+    return since
+
+
+def iter_export_ndjson(
+    db: Session, since: datetime | None = None, batch_size: int = EXPORT_BATCH_SIZE,
+) -> Iterator[bytes]:
+    """Yield one ``{"entity": ..., "data": ...}`` line per record of every section."""
+    since = _resolve_since(db, since)
+    buf: list[str] = []
+    size = 0
+    for section in EXPORT_SECTIONS:
+        prefix = '{"entity":' + dumps(section.key) + ',"data":'
+        for record in section.iter_records(db, batch_size, since):
+            line = prefix + dumps(record) + "}\n"
+            buf.append(line)
+            size += len(line)
+            if size >= _FLUSH_BYTES:
+                yield "".join(buf).encode("utf-8")
+                buf, size = [], 0
+    if buf:
+        yield "".join(buf).encode("utf-8")
+
+
+def _csv_cell(value):
+    if isinstance(value, (list, dict)):
+        return dumps(value)
+    return value
+
+
+def iter_export_csv(
+    db: Session, section: ExportSection, since: datetime | None = None,
+    batch_size: int = EXPORT_BATCH_SIZE,
+) -> Iterator[bytes]:
+    """Yield the flat rows of one section as CSV with a camelCase header line."""
+    since = _resolve_since(db, since)
+    out = io.StringIO()
+    writer = csv.writer(out)
+    writer.writerow([camel for camel, _ in section.fields])
+    for record in section.iter_rows(db, batch_size, since):
+        writer.writerow([_csv_cell(v) for v in record.values()])
+        if out.tell() >= _FLUSH_BYTES:
+            yield out.getvalue().encode("utf-8")
+            out.seek(0)
+            out.truncate()
+    yield out.getvalue().encode("utf-8")
@@ -0,0 +1,82 @@
+"""Allocation of human-readable entity IDs (``APP-001``, ``PRJ-014``, ...).
+
+Each prefix has a counter row in ``id_sequences``.  Allocating is a single
+``UPDATE ... SET last_value = last_value + n`` followed by a primary-key read,
+both inside the caller's transaction, so concurrent creates in several
+workers serialize on the counter row instead of racing on ``max(id) + 1``.
+
+The counter is initialized from the highest existing ID the first time a
+prefix is used.  If an allocated ID turns out to be taken (explicit IDs from
+clients or a bulk import), the counter is re-synchronized from the table and
+the allocation retried.
+"""
+from sqlalchemy import insert, update
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+
+from app.models.id_sequence import IdSequence
+
+
+def format_id(prefix: str, number: int, width: int = 3) -> str:
+    return f"{prefix}-{number:0{width}d}"
+
+
+def _max_existing(db: Session, model, prefix: str) -> int:
+    """Highest numeric suffix of ``<prefix>-<n>`` IDs in the table (full scan)."""
+    nums = []
+    for (existing,) in db.query(model.id).filter(model.id.like(f"{prefix}-%")):
+        try:
+            nums.append(int(existing[len(prefix) + 1:]))
+        except ValueError:
+            pass
+    return max(nums, default=0)
+
+
+def _ensure_sequence(db: Session, model, prefix: str):
+    if db.get(IdSequence, prefix) is not None:
+        return
+    start = _max_existing(db, model, prefix)
+    try:
+        with db.begin_nested():
+            db.execute(insert(IdSequence).values(prefix=prefix, last_value=start))
+    except IntegrityError:
+        pass  # another worker initialized it first
+
+
+def _bump(db: Session, prefix: str, count: int) -> int:
+    db.execute(
+        update(IdSequence)
+        .where(IdSequence.prefix == prefix)
+        .values(last_value=IdSequence.last_value + count)
+        .execution_options(synchronize_session=False)
+    )
+    return db.query(IdSequence.last_value).filter(IdSequence.prefix == prefix).scalar()
+
+
+def _resync(db: Session, model, prefix: str):
+    start = _max_existing(db, model, prefix)
+    db.execute(
+        update(IdSequence)
+        .where(IdSequence.prefix == prefix, IdSequence.last_value < start)
+        .values(last_value=start)
+        .execution_options(synchronize_session=False)
+    )
+
+
+def allocate_ids(db: Session, model, prefix: str, count: int = 1, width: int = 3) -> list[str]:
+    """Reserve ``count`` consecutive IDs for ``model`` and return them.
+
+    Does not commit; the reservation becomes durable with the caller's commit.
+    """
+    _ensure_sequence(db, model, prefix)
+    last = _bump(db, prefix, count)
+    ids = [format_id(prefix, n, width) for n in range(last - count + 1, last + 1)]
+    if db.query(model.id).filter(model.id.in_(ids)).first() is not None:
+        _resync(db, model, prefix)
+        last = _bump(db, prefix, count)
+        ids = [format_id(prefix, n, width) for n in range(last - count + 1, last + 1)]
+    return ids
+
+
+def next_id(db: Session, model, prefix: str, width: int = 3) -> str:
+    return allocate_ids(db, model, prefix, 1, width)[0]
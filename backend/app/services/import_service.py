@@ -0,0 +1,291 @@
+"""Bulk loading of export documents into the database.
+
+An export document (the shape produced by ``/export/json``) is validated and
+flattened into plain row dicts per table first.  Rows are then written with
+Core ``insert()`` executemany in chunks of :data:`IMPORT_CHUNK_SIZE` inside
+the caller's transaction — no ORM objects, no per-row flushes.
+
+Modes:
+
+* ``replace`` — empty every table that has a section in the document, then insert.
+* ``merge``   — insert or update by primary key; rows not in the document are kept.
+"""
+import time
+from collections import defaultdict
+from collections.abc import Iterable
+from dataclasses import dataclass
+
+from sqlalchemy import Boolean, Float, Integer, JSON, String, Table, delete, insert, tuple_
+from sqlalchemy.orm import Session
+
+from app.database import upsert_insert
+from app.models.domain import Domain, Capability, SubCapability
+from app.services.export_service import EXPORT_SECTIONS, to_camel
+from app.services.derived_tables import rebuild_for
+from app.services.table_versions import bump_versions
+
+IMPORT_CHUNK_SIZE = 1000
+MAX_REPORTED_ERRORS = 50
+IMPORT_MODES = ("replace", "merge")
+
+# Tables in insert order; deletes run in reverse.
+TABLE_ORDER = [
+    Domain.__table__,
+    Capability.__table__,
+    SubCapability.__table__,
+    *(section.model.__table__ for section in EXPORT_SECTIONS if section.model is not Domain),
+]
+
+
+class ImportValidationError(ValueError):
+    def __init__(self, errors: list[dict]):
+        super().__init__(f"{len(errors)} invalid record(s)")
+        self.errors = errors
+
+
+@dataclass
+class _Field:
+    key: str      # camelCase key in the document
+    column: object
+
+    def coerce(self, value):
+        if value is None:
+            return None
+        col_type = self.column.type
+        if isinstance(col_type, JSON):
+            return value
+        if isinstance(col_type, Boolean):
+            if isinstance(value, bool):
+                return value
+        elif isinstance(col_type, Integer):
+            if isinstance(value, int) and not isinstance(value, bool):
+                return value
+            if isinstance(value, float) and value.is_integer():
+                return int(value)
+            if isinstance(value, str) and value.strip().lstrip("-").isdigit():
+                return int(value)
+        elif isinstance(col_type, Float):
+            if isinstance(value, (int, float)) and not isinstance(value, bool):
+                return float(value)
+            if isinstance(value, str):
+                try:
+                    return float(value)
+                except ValueError:
+                    pass
+        elif isinstance(col_type, String):
+            if isinstance(value, str):
+                return value
+            if isinstance(value, (int, float)) and not isinstance(value, bool):
+                return str(value)
+        raise ValueError(f"expected {col_type.python_type.__name__}")
+
+
+def _column_default(column):
+    default = column.default
+    if default is None:
+        return None
+    if default.is_callable:
+        return default.arg(None)
+    return default.arg
+
+
+class _RowBuilder:
+    """Turns camelCase records of one table into validated column dicts."""
+
+    def __init__(self, table: Table, renames: dict | None = None, parent_key: str | None = None):
+        renames = renames or {}
+        self.table = table
+        self.parent_key = parent_key
+        self.fields = [
+            _Field(renames.get(c.key) or to_camel(c.key), c)
+            for c in table.columns
+            if c.key != parent_key
+        ]
+        self.required = {
+            c.key for c in table.columns
+            if (c.primary_key or not c.nullable) and c.default is None
+        }
+        self.key_columns = [c.key for c in table.primary_key.columns]
+        self.key_field = next(f.key for f in self.fields if f.column.key == self.key_columns[-1])
+
+    def build(self, record, section: str, index: int, errors: list, seen: dict, parent=None) -> dict | None:
+        """The row, or None after appending its errors.
+
+        ``seen`` maps the primary keys of the table's rows built so far to
+        where they came from; a second record with the same key is an error.
+        """
+        if not isinstance(record, dict):
+            errors.append({"section": section, "index": index, "error": "record must be an object"})
+            return None
+        row = {}
+        ok = True
+        for f in self.fields:
+            if f.key in record:
+                try:
+                    row[f.column.key] = f.coerce(record[f.key])
+                except ValueError as exc:
+                    errors.append({"section": section, "index": index, "field": f.key, "error": str(exc)})
+                    ok = False
+                    continue
+            else:
+                row[f.column.key] = _column_default(f.column)
+            if row[f.column.key] is None and not f.column.nullable:
+                row[f.column.key] = _column_default(f.column)
+            if row[f.column.key] is None and f.column.key in self.required:
+                errors.append({"section": section, "index": index, "field": f.key, "error": "field required"})
+                ok = False
+        if self.parent_key is not None:
+            row[self.parent_key] = parent
+        if not ok:
+            return None
+        key = tuple(row[k] for k in self.key_columns)
+        if key in seen:
+            errors.append({
+                "section": section, "index": index, "field": self.key_field,
+                "error": f"duplicate of {seen[key]}",
+            })
+            return None
+        seen[key] = f"{section}[{index}]"
+        return row
+
+
+_SECTION_BUILDERS = {
+    section.key: _RowBuilder(section.model.__table__, section.renames)
+    for section in EXPORT_SECTIONS
+}
+_CAPABILITY_BUILDER = _RowBuilder(Capability.__table__, parent_key="domain_id")
+_SUB_CAPABILITY_BUILDER = _RowBuilder(SubCapability.__table__, parent_key="capability_id")
+
+
+def _records(document: dict, key: str, errors: list) -> list:
+    records = document.get(key)
+    if records is None:
+        return []
+    if not isinstance(records, list):
+        errors.append({"section": key, "error": "section must be an array"})
+        return []
+    return records
+
+
+def parse_document(document: dict) -> dict[Table, list[dict]]:
+    """Validate an export document and flatten it into rows per table.
+
+    Only tables whose section is present in the document are returned.
+    Raises :class:`ImportValidationError` listing the invalid records.
+    """
+    if not isinstance(document, dict):
+        raise ImportValidationError([{"error": "document must be an object"}])
+    errors: list[dict] = []
+    tables: dict[Table, list[dict]] = {}
+    seen: dict[Table, dict] = defaultdict(dict)
+
+    if "domains" in document:
+        domains, caps, sub_caps = [], [], []
+        for i, d in enumerate(_records(document, "domains", errors)):
+            row = _SECTION_BUILDERS["domains"].build(d, "domains", i, errors, seen[Domain.__table__])
+            if row is None:
+                continue
+            domains.append(row)
+            for j, cap in enumerate(d.get("capabilities") or []):
+                cap_row = _CAPABILITY_BUILDER.build(
+                    cap, f"domains[{i}].capabilities", j, errors, seen[Capability.__table__], parent=row["id"],
+                )
+                if cap_row is None:
+                    continue
+                caps.append(cap_row)
+                for k, sc in enumerate(cap.get("subCapabilities") or []):
+                    sc_row = _SUB_CAPABILITY_BUILDER.build(
+                        sc, f"domains[{i}].capabilities[{j}].subCapabilities", k, errors,
+                        seen[SubCapability.__table__], parent=cap_row["id"],
+                    )
+                    if sc_row is not None:
+                        sub_caps.append(sc_row)
+        tables[Domain.__table__] = domains
+        tables[Capability.__table__] = caps
+        tables[SubCapability.__table__] = sub_caps
+
+    for section in EXPORT_SECTIONS:
+        if section.model is Domain or section.key not in document:
+            continue
+        builder = _SECTION_BUILDERS[section.key]
+        rows = []
+        for i, record in enumerate(_records(document, section.key, errors)):
+            row = builder.build(record, section.key, i, errors, seen[section.model.__table__])
+            if row is not None:
+                rows.append(row)
+        tables[section.model.__table__] = rows
+
+    if errors:
+        raise ImportValidationError(errors[:MAX_REPORTED_ERRORS])
+    return tables
+
+
+def _chunks(rows: list, size: int) -> Iterable[list]:
+    for start in range(0, len(rows), size):
+        yield rows[start:start + size]
+
+
+def _upsert(db: Session, table: Table, chunk: list[dict]):
+    pk = [c.key for c in table.primary_key.columns]
+    dialect_insert = upsert_insert(db.get_bind())
+    if dialect_insert is not None:
+        stmt = dialect_insert(table)
+        stmt = stmt.on_conflict_do_update(
+            index_elements=pk,
+            set_={c.key: stmt.excluded[c.key] for c in table.columns if c.key not in pk},
+        )
+        db.execute(stmt, chunk)
+        return
+    # Portable fallback: delete the incoming keys, then insert.
+    pk_cols = list(table.primary_key.columns)
+    if len(pk_cols) == 1:
+        db.execute(delete(table).where(pk_cols[0].in_([r[pk[0]] for r in chunk])))
+    else:
+        db.execute(delete(table).where(tuple_(*pk_cols).in_([tuple(r[k] for k in pk) for r in chunk])))
+    db.execute(insert(table), chunk)
+
+
+def load_tables(
+    db: Session,
+    tables: dict[Table, list[dict]],
+    mode: str = "replace",
+    chunk_size: int = IMPORT_CHUNK_SIZE,
+) -> dict:
+    """Write pre-validated rows in bulk. Does not commit."""
+    if mode not in IMPORT_MODES:
+        raise ValueError(f"mode must be one of {IMPORT_MODES}")
+    started = time.perf_counter()
+    counts: dict[str, int] = {}
+    timings: dict[str, float] = {}
+
+    ordered = [t for t in TABLE_ORDER if t in tables]
+    if mode == "replace":
+        for table in reversed(ordered):
+            db.execute(delete(table))
+
+    for table in ordered:
+        rows = tables[table]
+        t0 = time.perf_counter()
+        for chunk in _chunks(rows, chunk_size):
+            if mode == "replace":
+                db.execute(insert(table), chunk)
+            else:
+                _upsert(db, table, chunk)
+        counts[table.name] = len(rows)
+        timings[table.name] = round((time.perf_counter() - t0) * 1000, 1)
+
+    # Core writes bypass the session events that maintain derived tables and versions.
+    bump_versions(db.connection(), [t.name for t in ordered])
+    timings.update(rebuild_for(db, ordered))
+
+    return {
+        "mode": mode,
+        "counts": counts,
+        "timings_ms": timings,
+        "total_ms": round((time.perf_counter() - started) * 1000, 1),
+    }
+
+
+def import_document(db: Session, document: dict, mode: str = "merge") -> dict:
+    """Validate and bulk-load an export document. Does not commit."""
+    return load_tables(db, parse_document(document), mode)
@@ -0,0 +1,93 @@
+"""Index advisor built from the filters list endpoints actually receive.
+
+:func:`~app.services.pagination.paginate` reports every list query here: the
+columns its WHERE clause compares — read from the SQL expression, so each
+router is covered without instrumenting it — and how long the query took.
+:meth:`IndexAdvisor.report` joins these per-process statistics with the
+indexes of the live database.  A filter counts as served when an index
+(or the primary key) starts with one of its columns; otherwise the report
+suggests one.
+"""
+import threading
+from dataclasses import dataclass
+
+from sqlalchemy import inspect
+from sqlalchemy.orm import Session
+from sqlalchemy.sql import visitors
+from sqlalchemy.sql.elements import BinaryExpression
+from sqlalchemy.sql.schema import Column
+
+
+def filter_columns(whereclause, table) -> tuple[str, ...]:
+    """Names of ``table``'s columns compared in ``whereclause``, in first-seen order."""
+    if whereclause is None:
+        return ()
+    names = []
+    for element in visitors.iterate(whereclause):
+        if isinstance(element, BinaryExpression):
+            left = element.left
+            if isinstance(left, Column) and left.table is table and left.name not in names:
+                names.append(left.name)
+    return tuple(names)
+
+
+@dataclass
+class _FilterStats:
+    requests: int = 0
+    seconds: float = 0.0
+    max_seconds: float = 0.0
+    rows: int = 0
+
+
+class IndexAdvisor:
+    def __init__(self):
+        self._stats: dict[tuple[str, tuple[str, ...]], _FilterStats] = {}
+        self._lock = threading.Lock()
+
+    def record(self, table: str, columns: tuple[str, ...], seconds: float, rows: int):
+        if not columns:
+            return
+        with self._lock:
+            stats = self._stats.setdefault((table, columns), _FilterStats())
+            stats.requests += 1
+            stats.seconds += seconds
+            stats.max_seconds = max(stats.max_seconds, seconds)
+            stats.rows += rows
+
+    def clear(self):
+        with self._lock:
+            self._stats.clear()
+
+    def report(self, db: Session) -> list[dict]:
+        """Observed filters, most total time first, with the index serving each."""
+        with self._lock:
+            observed = {key: _FilterStats(**vars(stats)) for key, stats in self._stats.items()}
+        inspector = inspect(db.get_bind())
+        leading: dict[str, dict[str, str]] = {}
+        entries = []
+        for (table, columns), stats in sorted(observed.items(), key=lambda item: -item[1].seconds):
+            if table not in leading:
+                indexes = [(ix["name"], ix["column_names"]) for ix in inspector.get_indexes(table)]
+                pk = inspector.get_pk_constraint(table)
+                indexes.append((pk.get("name") or "primary key", pk["constrained_columns"]))
+                leading[table] = {}
+                for name, index_columns in indexes:
+                    if index_columns:
+                        leading[table].setdefault(index_columns[0], name)
+            index = next((leading[table][c] for c in columns if c in leading[table]), None)
+            entries.append({
+                "table": table,
+                "columns": list(columns),
+                "requests": stats.requests,
+                "avgMs": round(stats.seconds / stats.requests * 1000, 2),
+                "maxMs": round(stats.max_seconds * 1000, 2),
+                "avgRows": round(stats.rows / stats.requests, 1),
+                "index": index,
+                "suggestion": None if index else (
+                    f"CREATE INDEX ix_{table}_{'_'.join(columns)} ON {table} ({', '.join(columns)})"
+                ),
+            })
+        return entries
+
+
+index_advisor = IndexAdvisor()
@@ -0,0 +1,310 @@
+"""In-memory graph of the integrations between applications.
+
+Every integration is a directed edge ``source_app_id -> target_app_id``.
+Applications are numbered in first-seen order and edges live in slots of
+two ``array('i')`` endpoint arrays; each node keeps ``array('i')`` lists of
+its outgoing and incoming edge slots.  Traversals walk these integer arrays,
+so neighbourhoods, impact sets, shortest paths and strongly connected
+components over tens of thousands of edges take milliseconds.
+
+The graph follows ORM writes incrementally: a session listener collects the
+integration changes of each flush and applies them once the transaction
+commits.  It also counts the ``integrations`` table-version bumps it has
+seen; when the stored version differs from that count (a bulk import, a
+write by another process) :meth:`IntegrationGraph.current` reloads the table.
+"""
+import threading
+from array import array
+from collections import deque
+
+from sqlalchemy import event, select
+from sqlalchemy.orm import Session
+
+from app.models.integration import Integration
+from app.models.table_version import TableVersion
+from app.services.derived_tables import flushed_changes, history_value
+from app.services.table_versions import EPOCH_KEY
+
+_PENDING_KEY = "integration_graph_pending"
+_table = Integration.__table__
+
+DOWNSTREAM = "downstream"
+UPSTREAM = "upstream"
+BOTH = "both"
+
+
+class IntegrationGraph:
+    def __init__(self):
+        self._lock = threading.RLock()
+        # (database epoch, integrations table version) the graph reflects.
+        self.version: tuple[int, int] | None = None
+        self._reset()
+
+    def _reset(self):
+        self._node_ids: list[str] = []
+        self._node_index: dict[str, int] = {}
+        self._out: list[array] = []
+        self._in: list[array] = []
+        self._src = array("i")
+        self._dst = array("i")
+        self._edge_ids: list[str | None] = []
+        self._edge_slot: dict[str, int] = {}
+        self._free_slots: list[int] = []
+        self._components: list[list[int]] | None = None
+
+    # ── maintenance ─────────────────────────────────────────────
+
+    def current(self, db: Session) -> "IntegrationGraph":
+        """The graph, reloaded first if the table changed behind its back."""
+        versions = dict(db.execute(
+            select(TableVersion.table_name, TableVersion.version)
+            .where(TableVersion.table_name.in_((EPOCH_KEY, _table.name)))
+        ).all())
+        stored = (versions.get(EPOCH_KEY, 0), versions.get(_table.name, 0))
+        with self._lock:
+            if self.version != stored:
+                self.load(db, stored)
+        return self
+
+    def load(self, db: Session, version: tuple[int, int]):
+        rows = db.execute(select(_table.c.id, _table.c.source_app_id, _table.c.target_app_id)).all()
+        with self._lock:
+            self._reset()
+            for edge_id, source, target in rows:
+                self._add_edge(edge_id, source, target)
+            self.version = version
+
+    def apply(self, changes: list[tuple[str, tuple | None, tuple | None]], bumps: int):
+        """Apply committed ``(edge id, old endpoints, new endpoints)`` changes."""
+        with self._lock:
+            if self.version is None:
+                return
+            for edge_id, old, new in changes:
+                if old is not None:
+                    self._remove_edge(edge_id)
+                if new is not None:
+                    self._add_edge(edge_id, *new)
+            self.version = (self.version[0], self.version[1] + bumps)
+
+    def clear(self):
+        with self._lock:
+            self._reset()
+            self.version = None
+
+    def _node(self, app_id: str) -> int:
+        index = self._node_index.get(app_id)
+        if index is None:
+            index = len(self._node_ids)
+            self._node_ids.append(app_id)
+            self._node_index[app_id] = index
+            self._out.append(array("i"))
+            self._in.append(array("i"))
+        return index
+
+    def _add_edge(self, edge_id: str, source: str | None, target: str | None):
+        if not source or not target or edge_id in self._edge_slot:
+            return
+        s, t = self._node(source), self._node(target)
+        if self._free_slots:
+            slot = self._free_slots.pop()
+            self._src[slot], self._dst[slot], self._edge_ids[slot] = s, t, edge_id
+        else:
+            slot = len(self._edge_ids)
+            self._src.append(s)
+            self._dst.append(t)
+            self._edge_ids.append(edge_id)
+        self._edge_slot[edge_id] = slot
+        self._out[s].append(slot)
+        self._in[t].append(slot)
+        self._components = None
+
+    def _remove_edge(self, edge_id: str):
+        slot = self._edge_slot.pop(edge_id, None)
+        if slot is None:
+            return
+        self._out[self._src[slot]].remove(slot)
+        self._in[self._dst[slot]].remove(slot)
+        self._edge_ids[slot] = None
+        self._free_slots.append(slot)
+        self._components = None
+
+    # ── queries ─────────────────────────────────────────────────
+
+    def __contains__(self, app_id: str) -> bool:
+        return app_id in self._node_index
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {"apps": len(self._node_ids), "integrations": len(self._edge_slot)}
+
+    def _steps(self, node: int, direction: str):
+        """``(edge slot, neighbour)`` pairs of ``node`` in ``direction``."""
+        if direction != UPSTREAM:
+            for slot in self._out[node]:
+                yield slot, self._dst[slot]
+        if direction != DOWNSTREAM:
+            for slot in self._in[node]:
+                yield slot, self._src[slot]
+
+    def _bfs(self, start: int, direction: str, max_depth: int | None) -> dict[int, int]:
+        distance = {start: 0}
+        queue = deque([start])
+        while queue:
+            node = queue.popleft()
+            d = distance[node]
+            if max_depth is not None and d >= max_depth:
+                continue
+            for _slot, other in self._steps(node, direction):
+                if other not in distance:
+                    distance[other] = d + 1
+                    queue.append(other)
+        return distance
+
+    def neighbors(self, app_id: str, depth: int = 1, direction: str = BOTH) -> dict:
+        """Applications within ``depth`` hops and the integrations between them."""
+        with self._lock:
+            start = self._node_index.get(app_id)
+            if start is None:
+                return {"nodes": [{"id": app_id, "distance": 0}], "edges": []}
+            distance = self._bfs(start, direction, depth)
+            edges = []
+            for node in distance:
+                for slot in self._out[node]:
+                    if self._dst[slot] in distance:
+                        edges.append({
+                            "id": self._edge_ids[slot],
+                            "source": self._node_ids[node],
+                            "target": self._node_ids[self._dst[slot]],
+                        })
+            return {
+                "nodes": [{"id": self._node_ids[n], "distance": d} for n, d in distance.items()],
+                "edges": sorted(edges, key=lambda e: e["id"]),
+            }
+
+    def impact(self, app_id: str, direction: str = DOWNSTREAM, max_depth: int | None = None) -> list[dict]:
+        """Applications transitively reachable from ``app_id``, nearest first."""
+        with self._lock:
+            start = self._node_index.get(app_id)
+            if start is None:
+                return []
+            distance = self._bfs(start, direction, max_depth)
+            del distance[start]
+            return [{"id": self._node_ids[n], "distance": d} for n, d in distance.items()]
+
+    def shortest_path(self, source: str, target: str, directed: bool = True) -> dict | None:
+        """Fewest-hop path as application and integration ids, or None."""
+        with self._lock:
+            start, goal = self._node_index.get(source), self._node_index.get(target)
+            if start is None or goal is None:
+                return None
+            direction = DOWNSTREAM if directed else BOTH
+            via: dict[int, tuple[int, int] | None] = {start: None}
+            queue = deque([start])
+            while queue and goal not in via:
+                node = queue.popleft()
+                for slot, other in self._steps(node, direction):
+                    if other not in via:
+                        via[other] = (node, slot)
+                        queue.append(other)
+            if goal not in via:
+                return None
+            apps, integrations = [goal], []
+            step = via[goal]
+            while step is not None:
+                node, slot = step
+                apps.append(node)
+                integrations.append(self._edge_ids[slot])
+                step = via[node]
+            return {
+                "apps": [self._node_ids[n] for n in reversed(apps)],
+                "integrations": list(reversed(integrations)),
+            }
+
+    def strongly_connected_components(self, min_size: int = 2) -> list[list[str]]:
+        """Components of at least ``min_size`` applications, largest first."""
+        with self._lock:
+            if self._components is None:
+                self._components = self._tarjan()
+            return [
+                sorted(self._node_ids[n] for n in component)
+                for component in self._components if len(component) >= min_size
+            ]
+
+    def _tarjan(self) -> list[list[int]]:
+        # Iterative Tarjan: recursion would overflow on long chains.
+        count = len(self._node_ids)
+        index = [-1] * count
+        low = [0] * count
+        on_stack = [False] * count
+        stack: list[int] = []
+        components: list[list[int]] = []
+        counter = 0
+        for root in range(count):
+            if index[root] != -1:
+                continue
+            work = [(root, 0)]
+            while work:
+                node, position = work.pop()
+                if position == 0:
+                    index[node] = low[node] = counter
+                    counter += 1
+                    stack.append(node)
+                    on_stack[node] = True
+                out = self._out[node]
+                while position < len(out):
+                    other = self._dst[out[position]]
+                    position += 1
+                    if index[other] == -1:
+                        work.append((node, position))
+                        work.append((other, 0))
+                        break
+                    if on_stack[other]:
+                        low[node] = min(low[node], index[other])
+                else:
+                    if low[node] == index[node]:
+                        component = []
+                        while True:
+                            member = stack.pop()
+                            on_stack[member] = False
+                            component.append(member)
+                            if member == node:
+                                break
+                        components.append(component)
+                    if work:
+                        parent = work[-1][0]
+                        low[parent] = min(low[parent], low[node])
+        components.sort(key=len, reverse=True)
+        return components
+
+
+integration_graph = IntegrationGraph()
+
+
+def _endpoints(obj: Integration, old: bool) -> tuple:
+    return tuple(history_value(obj, attr, old) for attr in ("source_app_id", "target_app_id"))
+
+
+@event.listens_for(Session, "after_flush")
+def _collect_changes(session: Session, _flush_context):
+    changes = [
+        (c.obj.id, _endpoints(c.obj, old=True) if c.had else None, _endpoints(c.obj, old=False) if c.has else None)
+        for c in flushed_changes(session) if isinstance(c.obj, Integration)
+    ]
+    if changes:
+        # Each such flush bumps the table version once (see table_versions).
+        pending = session.info.setdefault(_PENDING_KEY, [[], 0])
+        pending[0].extend(changes)
+        pending[1] += 1
+
+
+@event.listens_for(Session, "after_commit")
+def _apply_changes(session: Session):
+    pending = session.info.pop(_PENDING_KEY, None)
+    if pending:
+        integration_graph.apply(*pending)
+
+
+@event.listens_for(Session, "after_transaction_end")
+def _discard_changes(session: Session, transaction):
+    if transaction.parent is None and not transaction.nested:
+        session.info.pop(_PENDING_KEY, None)
@@ -0,0 +1,148 @@
+"""Indexed link table mirrored from the JSON list columns.
+
+Relationships such as ``projects.affected_apps`` or
+``data_objects.consuming_app_ids`` are stored as JSON lists on the owning
+row.  ``entity_links`` holds one ``(relation, owner_id, target_id)`` row per
+list element, with an index leading on ``target_id``, so "which projects
+touch APP-123" is an index probe instead of a scan that parses every list.
+The JSON columns stay the source of truth; the API shape is unchanged.
+
+Each flush's old and new lists of the tracked columns are diffed and the
+difference applied in the same transaction; the table is registered as the
+``links`` derived table (see :mod:`app.services.derived_tables`).
+"""
+from collections import defaultdict
+from dataclasses import dataclass
+
+from sqlalchemy import delete, insert, select, tuple_
+from sqlalchemy.orm import Session
+
+from app.models.application import Application
+from app.models.data_object import DataObject
+from app.models.demand import Demand
+from app.models.link import EntityLink
+from app.models.process import E2EProcess
+from app.models.project import Project
+from app.services.derived_tables import Change, DerivedTable, history_value, register
+from app.services.table_versions import bump_versions
+
+_table = EntityLink.__table__
+
+
+@dataclass(frozen=True)
+class LinkRelation:
+    """One JSON list column.
+
+    Elements are stored as strings; list elements that are objects (like
+    ``{"appId": ..., "action": ...}``) contribute their ``key`` entry.
+    """
+    name: str
+    model: type
+    attribute: str
+    key: str | None = None
+
+    def targets(self, value) -> set[str]:
+        found = set()
+        for item in value or ():
+            if self.key is not None:
+                item = item.get(self.key) if isinstance(item, dict) else None
+            if item is not None and item != "":
+                found.add(str(item))
+        return found
+
+
+LINKS = [
+    LinkRelation("application_entities", Application, "entities"),
+    LinkRelation("application_technology", Application, "technology"),
+    LinkRelation("application_regulations", Application, "regulations"),
+    LinkRelation("project_apps", Project, "affected_apps", key="appId"),
+    LinkRelation("project_capabilities", Project, "capabilities"),
+    LinkRelation("project_domains", Project, "secondary_domains"),
+    LinkRelation("project_processes", Project, "e2e_processes"),
+    LinkRelation("demand_apps", Demand, "related_apps"),
+    LinkRelation("demand_vendors", Demand, "related_vendors"),
+    LinkRelation("demand_domains", Demand, "related_domains"),
+    LinkRelation("data_object_sources", DataObject, "source_app_ids"),
+    LinkRelation("data_object_consumers", DataObject, "consuming_app_ids"),
+    LinkRelation("process_domains", E2EProcess, "domains"),
+]
+
+LINKS_BY_NAME = {link.name: link for link in LINKS}
+
+_LINKS_BY_MODEL: dict[type, list[LinkRelation]] = defaultdict(list)
+for _link in LINKS:
+    _LINKS_BY_MODEL[_link.model].append(_link)
+
+TRACKED_TABLES = frozenset(model.__table__ for model in _LINKS_BY_MODEL)
+
+
+def _collect(changes: list[Change]) -> tuple[list[dict], list[tuple]]:
+    """Rows to insert and ``(relation, owner_id, target_id)`` keys to delete."""
+    added, removed = [], []
+    for change in changes:
+        obj, had, has = change.obj, change.had, change.has
+        for link in _LINKS_BY_MODEL.get(type(obj), ()):
+            before = link.targets(history_value(obj, link.attribute, old=True)) if had else set()
+            after = link.targets(history_value(obj, link.attribute, old=False)) if has else set()
+            if before == after:
+                continue
+            old_id = history_value(obj, "id", old=True) if had else None
+            new_id = obj.id
+            if had and old_id != new_id:
+                # Renamed owner: move every link, not just the changed ones.
+                removed += [(link.name, old_id, t) for t in before]
+                before = set()
+            removed += [(link.name, old_id or new_id, t) for t in before - after]
+            added += [{"relation": link.name, "owner_id": new_id, "target_id": t} for t in after - before]
+    return added, removed
+
+
+def _maintain_links(session: Session, changes: list[Change]):
+    added, removed = _collect(changes)
+    if not added and not removed:
+        return
+    connection = session.connection()
+    if removed:
+        key = tuple_(_table.c.relation, _table.c.owner_id, _table.c.target_id)
+        connection.execute(delete(_table).where(key.in_(removed)))
+    if added:
+        connection.execute(insert(_table), added)
+    bump_versions(connection, [_table.name])
+
+
+def rebuild_links(db: Session) -> int:
+    """Recompute every link from the JSON columns. Does not commit."""
+    db.execute(delete(_table))
+    rows = []
+    for link in LINKS:
+        model = link.model
+        for owner_id, value in db.execute(select(model.id, getattr(model, link.attribute))):
+            rows += [{"relation": link.name, "owner_id": owner_id, "target_id": t} for t in link.targets(value)]
+    if rows:
+        db.execute(insert(_table), rows)
+    bump_versions(db.connection(), [_table.name])
+    return len(rows)
+
+
+register(DerivedTable("links", EntityLink, TRACKED_TABLES, _maintain_links, rebuild_links))
+
+
+def linked(relation: str, target_id):
+    """Filter for a list query: the owner references ``target_id`` in ``relation``."""
+    link = LINKS_BY_NAME[relation]
+    owners = select(_table.c.owner_id).where(
+        _table.c.target_id == str(target_id), _table.c.relation == relation
+    )
+    return link.model.id.in_(owners)
+
+
+def references(db: Session, target_id, relations: list[str] | None = None) -> dict[str, list[str]]:
+    """Owner ids referencing ``target_id``, per relation: ``{relation: [owner_id, ...]}``."""
+    stmt = select(_table.c.relation, _table.c.owner_id).where(_table.c.target_id == str(target_id))
+    if relations is not None:
+        stmt = stmt.where(_table.c.relation.in_(relations))
+    result: dict[str, list[str]] = {}
+    for relation, owner_id in db.execute(stmt.order_by(_table.c.relation, _table.c.owner_id)):
+        result.setdefault(relation, []).append(owner_id)
+    return result
+
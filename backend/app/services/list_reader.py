@@ -0,0 +1,237 @@
+"""Column-level read path for list endpoints.
+
+Returning ORM objects from a list endpoint costs an ORM instance with
+identity-map bookkeeping per row, then a Pydantic model validated from its
+attributes, then a dict for the encoder.  :class:`ListReader` selects just the
+columns of the route's ``*Read`` schema, turns each row tuple into a dict and
+encodes the whole list with a precompiled ``TypeAdapter`` over a ``TypedDict``
+mirror of the schema — no ORM instances and no model construction.
+
+Routes keep their ``response_model``, so the OpenAPI schema is unchanged;
+:meth:`ListReader.response` returns a ready ``Response`` that FastAPI sends
+as is.  Nested lists (domains -> capabilities -> sub-capabilities) are loaded
+with one ``IN`` query per level.
+
+:meth:`ListReader.by_ids_response` serves ``?ids=`` and ``POST .../by-ids``:
+the requested rows come from ``IN`` queries, in request order, with the ids
+that do not exist reported back.
+
+``?fields=`` (see :attr:`ListReader.fieldset`) narrows both the SELECT and the
+response to some of the schema's fields; primary-key fields are always
+included so rows stay addressable and keyset pagination keeps working.
+"""
+import threading
+from collections import OrderedDict, defaultdict
+from typing import get_args, get_origin
+
+from fastapi import HTTPException, Query, Response
+from pydantic import BaseModel, TypeAdapter
+from sqlalchemy import inspect
+from sqlalchemy.orm import Query as OrmQuery, Session
+from typing_extensions import TypedDict
+
+from app.encoding import JSON, MSGPACK, dumps_msgpack, response_format
+
+_IN_CHUNK_SIZE = 500
+# ``?ids=`` travels in the URL; longer lists go through ``POST .../by-ids``.
+MAX_QUERY_IDS = 200
+MISSING_IDS_HEADER = "X-Missing-Ids"
+# Projections kept per reader, least recently used dropped first.
+MAX_PROJECTIONS = 64
+
+# Requested fields (sorted), or None for the whole schema.
+FieldSet = tuple[str, ...] | None
+
+
+def row_type(schema: type[BaseModel], fields: FieldSet = None) -> type:
+    """A ``TypedDict`` with the fields of ``schema``; nested models become row types too.
+
+    Not cached: ``fields`` comes from the client, so build these only for a
+    reader's bounded projection cache.
+    """
+    annotations = {}
+    for name, field in schema.model_fields.items():
+        if fields is not None and name not in fields:
+            continue
+        annotation = field.annotation
+        args = get_args(annotation)
+        if get_origin(annotation) is list and args and isinstance(args[0], type) and issubclass(args[0], BaseModel):
+            annotation = list[row_type(args[0])]
+        annotations[name] = annotation
+    suffix = "" if fields is None else "_" + "_".join(annotations)
+    return TypedDict(f"{schema.__name__}Row{suffix}", annotations)
+
+
+class _Projection:
+    """Columns, nested lists and serializers for one set of requested fields."""
+
+    def __init__(self, reader: "ListReader", fields: FieldSet):
+        wanted = None if fields is None else set(fields) | set(reader.key_fields)
+        self.fields = [f for f in reader.column_fields if wanted is None or f in wanted]
+        self.columns = [getattr(reader.model, f) for f in self.fields]
+        self.children = {f: c for f, c in reader.children.items() if wanted is None or f in wanted}
+        row = row_type(reader.schema, None if wanted is None else tuple(f for f in reader.schema.model_fields if f in wanted))
+        self.list_adapter = TypeAdapter(list[row])
+        self.item_adapter = TypeAdapter(row)
+        key_type = reader.key_type
+        self.batch_adapter = TypeAdapter(
+            TypedDict(f"{reader.schema.__name__}Batch", {"items": list[row], "missing": list[key_type]})
+        )
+
+
+class ListReader:
+    """Serialize rows of ``model`` as ``schema`` without ORM instances.
+
+    ``children`` maps a nested list field of the schema to the foreign-key
+    attribute on the child model and the child's reader.
+    """
+
+    def __init__(self, model, schema: type[BaseModel], children: dict[str, tuple[str, "ListReader"]] | None = None):
+        self.model = model
+        self.schema = schema
+        self.children = children or {}
+        self.column_fields = [name for name in schema.model_fields if name not in self.children]
+        self.key_fields = [col.key for col in inspect(model).primary_key]
+        self.key_type = inspect(model).primary_key[0].type.python_type
+        self.fieldset = self._fieldset_dependency()
+        self.id_list = self._id_list_dependency()
+        self._full = _Projection(self, None)
+        self._projections: OrderedDict[tuple[str, ...], _Projection] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def _fieldset_dependency(self):
+        available = ", ".join(self.schema.model_fields)
+
+        def fieldset(
+            fields: str | None = Query(None, description=f"Comma-separated subset of: {available}"),
+        ) -> FieldSet:
+            if not fields:
+                return None
+            names = tuple(sorted({f.strip() for f in fields.split(",") if f.strip()}))
+            unknown = [n for n in names if n not in self.schema.model_fields]
+            if unknown:
+                raise HTTPException(
+                    status_code=400,
+                    detail=f"Unknown fields: {', '.join(unknown)}. Available: {available}",
+                )
+            return names
+
+        return fieldset
+
+    def _id_list_dependency(self):
+        def id_list(
+            ids: str | None = Query(
+                None,
+                description=f"Comma-separated ids to fetch in one request (max {MAX_QUERY_IDS}); "
+                "filters and pagination are ignored, missing ids are listed in X-Missing-Ids",
+            ),
+        ) -> list | None:
+            if ids is None:
+                return None
+            values = [v.strip() for v in ids.split(",") if v.strip()]
+            if len(values) > MAX_QUERY_IDS:
+                raise HTTPException(
+                    status_code=400,
+                    detail=f"At most {MAX_QUERY_IDS} ids per GET; use POST .../by-ids for longer lists",
+                )
+            return self.coerce_ids(values)
+
+        return id_list
+
+    def coerce_ids(self, ids: list) -> list:
+        """Ids converted to the primary-key type, duplicates removed, order kept."""
+        try:
+            return list(dict.fromkeys(self.key_type(i) for i in ids))
+        except (TypeError, ValueError):
+            raise HTTPException(status_code=400, detail=f"Ids must be of type {self.key_type.__name__}")
+
+    def fieldset_from_list(self, fields: list[str] | None) -> FieldSet:
+        """Validate a field list given in a request body like ``?fields=``."""
+        return self.fieldset(",".join(fields)) if fields else None
+
+    def _projection(self, fields: FieldSet) -> _Projection:
+        if fields is None:
+            return self._full
+        with self._lock:
+            projection = self._projections.get(fields)
+            if projection is not None:
+                self._projections.move_to_end(fields)
+                return projection
+        projection = _Projection(self, fields)
+        with self._lock:
+            self._projections[fields] = projection
+            if len(self._projections) > MAX_PROJECTIONS:
+                self._projections.popitem(last=False)
+        return projection
+
+    def query(self, db: Session, fields: FieldSet = None) -> OrmQuery:
+        """``db.query`` over the (requested) schema columns; rows come back as tuples."""
+        return db.query(*self._projection(fields).columns)
+
+    def records(self, db: Session, rows, fields: FieldSet = None) -> list[dict]:
+        projection = self._projection(fields)
+        records = [dict(zip(projection.fields, row)) for row in rows]
+        if projection.children:
+            key = self.key_fields[0]
+            for field, (foreign_key, reader) in projection.children.items():
+                groups = reader.grouped(db, foreign_key, [r[key] for r in records])
+                for record in records:
+                    record[field] = groups.get(record[key], [])
+        return records
+
+    def by_ids(self, db: Session, ids: list, fields: FieldSet = None) -> tuple[list[dict], list]:
+        """Records for ``ids`` in request order, and the ids that do not exist."""
+        column = getattr(self.model, self.key_fields[0])
+        rows = []
+        for start in range(0, len(ids), _IN_CHUNK_SIZE):
+            rows.extend(self.query(db, fields).filter(column.in_(ids[start:start + _IN_CHUNK_SIZE])).all())
+        found = {record[self.key_fields[0]]: record for record in self.records(db, rows, fields)}
+        return [found[i] for i in ids if i in found], [i for i in ids if i not in found]
+
+    def grouped(self, db: Session, foreign_key: str, parent_ids: list) -> dict:
+        groups = defaultdict(list)
+        column = getattr(self.model, foreign_key)
+        for start in range(0, len(parent_ids), _IN_CHUNK_SIZE):
+            rows = self.query(db).filter(column.in_(parent_ids[start:start + _IN_CHUNK_SIZE])).all()
+            for record in self.records(db, rows):
+                groups[record[foreign_key]].append(record)
+        return groups
+
+    @staticmethod
+    def _render(adapter: TypeAdapter, content) -> tuple[bytes, str]:
+        if response_format.get() == MSGPACK:
+            return dumps_msgpack(adapter.dump_python(content, mode="json")), MSGPACK
+        return adapter.dump_json(content), JSON
+
+    @staticmethod
+    def _respond(body: bytes, media_type: str, response: Response) -> Response:
+        result = Response(body, media_type=media_type)
+        result.headers.add_vary_header("Accept")
+        result.raw_headers.extend(
+            (key, value) for key, value in response.headers.raw if key not in (b"content-length", b"vary")
+        )
+        return result
+
+    def response(self, db: Session, rows, response: Response, fields: FieldSet = None) -> Response:
+        """Encode ``rows`` as a list and carry over headers set on the route's ``response``."""
+        records = self.records(db, rows, fields)
+        return self._respond(*self._render(self._projection(fields).list_adapter, records), response)
+
+    def item_response(self, db: Session, row, response: Response, fields: FieldSet = None) -> Response:
+        """Encode a single row, as a detail endpoint returns it."""
+        record = self.records(db, [row], fields)[0]
+        return self._respond(*self._render(self._projection(fields).item_adapter, record), response)
+
+    def by_ids_response(
+        self, db: Session, ids: list, response: Response, fields: FieldSet = None, envelope: bool = False,
+    ) -> Response:
+        """The rows for ``ids``: a plain list with missing ids in a header, or
+        ``{"items": [...], "missing": [...]}`` when ``envelope`` is set."""
+        items, missing = self.by_ids(db, ids, fields)
+        projection = self._projection(fields)
+        if envelope:
+            return self._respond(*self._render(projection.batch_adapter, {"items": items, "missing": missing}), response)
+        result = self._respond(*self._render(projection.list_adapter, items), response)
+        if missing:
+            result.headers[MISSING_IDS_HEADER] = ",".join(str(i) for i in missing)
+        return result
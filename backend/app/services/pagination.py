@@ -0,0 +1,112 @@
+"""Opt-in keyset (cursor) pagination for list endpoints.
+
+Without ``limit``/``after`` a list endpoint keeps returning the full array.
+With ``limit`` the query is ordered by the model's primary key, one page is
+returned and the position of the last row is handed back as an opaque cursor
+in the ``X-Next-Cursor`` header.  The first page additionally carries an
+``X-Total-Estimate`` header with the number of rows matching the filters,
+counted only up to :data:`COUNT_CAP`.  Beyond that an unfiltered listing on
+PostgreSQL reports the planner's row estimate and anything else the cap.
+
+Every call also reports its filter columns and duration to the index advisor.
+"""
+import base64
+import json
+import time
+
+from fastapi import HTTPException, Query, Response
+from sqlalchemy import inspect, text, tuple_
+from sqlalchemy.orm import Query as OrmQuery
+
+from app.services.index_advisor import filter_columns, index_advisor
+
+DEFAULT_PAGE_SIZE = 100
+MAX_PAGE_SIZE = 1000
+COUNT_CAP = 10000
+
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+TOTAL_ESTIMATE_HEADER = "X-Total-Estimate"
+
+
+class PageParams:
+    """Query parameters shared by every paginated list endpoint."""
+
+    def __init__(
+        self,
+        limit: int | None = Query(None, ge=1, le=MAX_PAGE_SIZE, description="Page size; enables cursor pagination"),
+        after: str | None = Query(None, description="Opaque cursor from the previous page's X-Next-Cursor header"),
+    ):
+        self.limit = limit
+        self.after = after
+
+    @property
+    def enabled(self) -> bool:
+        return self.limit is not None or self.after is not None
+
+
+def encode_cursor(values: tuple) -> str:
+    raw = json.dumps(list(values), separators=(",", ":")).encode("utf-8")
+    return base64.urlsafe_b64encode(raw).decode("ascii").rstrip("=")
+
+
+def decode_cursor(cursor: str, width: int) -> tuple:
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        values = json.loads(base64.urlsafe_b64decode(padded.encode("ascii")))
+    except (ValueError, UnicodeError):
+        raise HTTPException(status_code=400, detail="Invalid pagination cursor")
+    if not isinstance(values, list) or len(values) != width:
+        raise HTTPException(status_code=400, detail="Invalid pagination cursor")
+    return tuple(values)
+
+
+def _key_columns(q: OrmQuery) -> list:
+    model = q.column_descriptions[0]["entity"]
+    return list(inspect(model).primary_key)
+
+
+def paginate(q: OrmQuery, response: Response, page: PageParams):
+    """Return ``q.all()``, or a single keyset page when pagination is requested."""
+    table = q.column_descriptions[0]["entity"].__table__
+    columns = filter_columns(q.whereclause, table)
+    started = time.perf_counter()
+    rows = _page(q, response, page) if page.enabled else q.all()
+    index_advisor.record(table.name, columns, time.perf_counter() - started, len(rows))
+    return rows
+
+
+def _total_estimate(q: OrmQuery, keys: list) -> int:
+    total = q.with_entities(*keys).order_by(None).limit(COUNT_CAP + 1).count()
+    if total <= COUNT_CAP:
+        return total
+    if q.whereclause is None and q.session.get_bind().dialect.name == "postgresql":
+        table = q.column_descriptions[0]["entity"].__table__.name
+        estimate = q.session.execute(
+            text("SELECT reltuples::bigint FROM pg_class WHERE oid = to_regclass(:table)"), {"table": table}
+        ).scalar()
+        if estimate and estimate > COUNT_CAP:
+            return estimate
+    return COUNT_CAP
+
+
+def _page(q: OrmQuery, response: Response, page: PageParams):
+    keys = _key_columns(q)
+    limit = page.limit or DEFAULT_PAGE_SIZE
+
+    if page.after is None:
+        response.headers[TOTAL_ESTIMATE_HEADER] = str(_total_estimate(q, keys))
+    else:
+        last = decode_cursor(page.after, len(keys))
+        if len(keys) == 1:
+            q = q.filter(keys[0] > last[0])
+        else:
+            q = q.filter(tuple_(*keys) > tuple_(*last))
+
+    rows = q.order_by(*keys).limit(limit + 1).all()
+    if len(rows) > limit:
+        rows = rows[:limit]
+        last_row = rows[-1]
+        response.headers[NEXT_CURSOR_HEADER] = encode_cursor(
+            tuple(getattr(last_row, col.key) for col in keys)
+        )
+    return rows
@@ -0,0 +1,118 @@
+"""Dedicated process pool for bcrypt work.
+
+bcrypt is deliberately slow.  Running it on FastAPI's request threadpool lets
+a burst of logins occupy every thread and stall unrelated API calls, so all
+hashing and verification is sent to a small, fixed-size process pool instead.
+``in_flight``/``queued`` expose how far the pool is behind.  A pool broken by
+a dying worker is replaced on the next submission.
+
+The worker functions only depend on passlib so spawned workers start fast.
+With ``workers=0`` the work runs in the calling thread (tests, tiny setups).
+"""
+import asyncio
+import atexit
+import multiprocessing
+import threading
+from concurrent.futures import Future, ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+
+from passlib.context import CryptContext
+
+_contexts: dict[int, CryptContext] = {}
+_verify_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+
+
+def _context(rounds: int) -> CryptContext:
+    ctx = _contexts.get(rounds)
+    if ctx is None:
+        ctx = CryptContext(schemes=["bcrypt"], deprecated="auto", bcrypt__rounds=rounds)
+        _contexts[rounds] = ctx
+    return ctx
+
+
+def hash_in_worker(password: str, rounds: int) -> str:
+    return _context(rounds).hash(password)
+
+
+def verify_in_worker(plain: str, hashed: str) -> bool:
+    return _verify_context.verify(plain, hashed)
+
+
+class PasswordPool:
+    def __init__(self, workers: int):
+        self.workers = workers
+        self._executor: ProcessPoolExecutor | None = None
+        self._lock = threading.Lock()
+        self._in_flight = 0
+        atexit.register(self.shutdown)
+
+    def _get_executor(self) -> ProcessPoolExecutor:
+        with self._lock:
+            if self._executor is None:
+                self._executor = ProcessPoolExecutor(
+                    max_workers=self.workers,
+                    mp_context=multiprocessing.get_context("spawn"),
+                )
+            return self._executor
+
+    def _replace(self, broken: ProcessPoolExecutor):
+        with self._lock:
+            if self._executor is broken:
+                self._executor = None
+        broken.shutdown(wait=False, cancel_futures=True)
+
+    def _done(self, _future):
+        with self._lock:
+            self._in_flight -= 1
+
+    def submit(self, fn, *args) -> Future:
+        if self.workers <= 0:
+            future: Future = Future()
+            try:
+                future.set_result(fn(*args))
+            except Exception as exc:
+                future.set_exception(exc)
+            return future
+        with self._lock:
+            self._in_flight += 1
+        try:
+            future = self._submit_to_pool(fn, *args)
+        except BaseException:
+            self._done(None)
+            raise
+        future.add_done_callback(self._done)
+        return future
+
+    def _submit_to_pool(self, fn, *args) -> Future:
+        executor = self._get_executor()
+        try:
+            return executor.submit(fn, *args)
+        except BrokenProcessPool:
+            self._replace(executor)
+            return self._get_executor().submit(fn, *args)
+
+    def run(self, fn, *args):
+        """Run ``fn`` in the pool and block until it is done (startup, scripts;
+        request handlers await :meth:`run_async` instead)."""
+        return self.submit(fn, *args).result()
+
+    async def run_async(self, fn, *args):
+        """Run ``fn`` in the pool without holding a thread while waiting."""
+        return await asyncio.wrap_future(self.submit(fn, *args))
+
+    @property
+    def in_flight(self) -> int:
+        return self._in_flight
+
+    @property
+    def queued(self) -> int:
+        return max(0, self._in_flight - self.workers)
+
+    def stats(self) -> dict:
+        return {"workers": self.workers, "in_flight": self.in_flight, "queued": self.queued}
+
+    def shutdown(self):
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=False, cancel_futures=True)
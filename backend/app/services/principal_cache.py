@@ -0,0 +1,88 @@
+"""Bounded TTL/LRU cache of authenticated users.
+
+``get_current_user`` would otherwise run ``SELECT ... FROM users`` on every
+API call.  Entries are keyed by ``(user id, token)`` and hold a snapshot of
+the user's columns; every hit hands out a fresh, session-less ``User`` built
+from that snapshot, so callers can read it freely without touching the DB.
+
+Writes to a user (admin update/delete, profile update, login) must call
+:func:`PrincipalCache.invalidate_user`.  Invalidation is per process: other
+workers notice a change at the latest after ``AUTH_CACHE_TTL_SECONDS``.
+"""
+import threading
+import time
+from collections import OrderedDict
+
+from app.config import settings
+from app.models.user import User
+
+_SNAPSHOT_COLUMNS = [c.key for c in User.__table__.columns if c.key != "password_hash"]
+
+
+class PrincipalCache:
+    def __init__(self, ttl_seconds: float, max_entries: int):
+        self.ttl = ttl_seconds
+        self.max_entries = max_entries
+        self._entries: OrderedDict[tuple[int, str], tuple[float, dict]] = OrderedDict()
+        self._keys_by_user: dict[int, set[tuple[int, str]]] = {}
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    @property
+    def enabled(self) -> bool:
+        return self.ttl > 0 and self.max_entries > 0
+
+    def get(self, user_id: int, token: str) -> User | None:
+        if not self.enabled:
+            return None
+        key = (user_id, token)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            expires, snapshot = entry
+            if expires < time.monotonic():
+                self._remove(key)
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+        return User(**snapshot)
+
+    def put(self, token: str, user: User):
+        if not self.enabled:
+            return
+        key = (user.id, token)
+        snapshot = {col: getattr(user, col) for col in _SNAPSHOT_COLUMNS}
+        with self._lock:
+            self._entries[key] = (time.monotonic() + self.ttl, snapshot)
+            self._entries.move_to_end(key)
+            self._keys_by_user.setdefault(user.id, set()).add(key)
+            while len(self._entries) > self.max_entries:
+                self._remove(next(iter(self._entries)))
+
+    def invalidate_user(self, user_id: int):
+        with self._lock:
+            for key in self._keys_by_user.pop(user_id, set()):
+                self._entries.pop(key, None)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._keys_by_user.clear()
+
+    def _remove(self, key: tuple[int, str]):
+        self._entries.pop(key, None)
+        keys = self._keys_by_user.get(key[0])
+        if keys is not None:
+            keys.discard(key)
+            if not keys:
+                del self._keys_by_user[key[0]]
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+principal_cache = PrincipalCache(settings.AUTH_CACHE_TTL_SECONDS, settings.AUTH_CACHE_MAX_ENTRIES)
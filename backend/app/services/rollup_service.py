@@ -0,0 +1,203 @@
+"""Portfolio rollups maintained incrementally from ORM writes.
+
+``portfolio_rollups`` holds one row per ``(dimension, group_key)`` with the
+number of entities in the group plus count and sum of a numeric value (cost,
+budget, maturity), so dashboards read O(groups) rows instead of aggregating
+the landscape on every request.
+
+Each flush's inserts, updates and deletes of the tracked models become
+per-group deltas, applied in the same transaction; the table is registered
+as the ``rollups`` derived table (see :mod:`app.services.derived_tables`).
+"""
+from collections import defaultdict
+from dataclasses import dataclass
+
+from sqlalchemy import delete, func, insert, select, update
+from sqlalchemy.orm import Session
+
+from app.database import upsert_insert
+from app.models.application import Application
+from app.models.compliance import ComplianceAssessment
+from app.models.demand import Demand
+from app.models.domain import Capability, Domain
+from app.models.integration import Integration
+from app.models.project import Project
+from app.models.rollup import PortfolioRollup
+from app.models.vendor import Vendor
+from app.services.derived_tables import Change, DerivedTable, history_value, register
+from app.services.table_versions import bump_versions
+
+_table = PortfolioRollup.__table__
+
+
+@dataclass(frozen=True)
+class Rollup:
+    """One dimension over one model.
+
+    Entities are grouped by ``key`` (an attribute name) or, for whole-table
+    counts, by the constant ``label``.  ``value`` names the attribute that is
+    counted and summed when it is not NULL.  Entities whose key is NULL are
+    not counted.
+    """
+    dimension: str
+    model: type
+    key: str | None = None
+    label: str | None = None
+    value: str | None = None
+
+    def group(self, values: dict) -> str | None:
+        if self.key is None:
+            return self.label
+        key = values[self.key]
+        return None if key is None else str(key)
+
+    @property
+    def attributes(self) -> list[str]:
+        return [a for a in (self.key, self.value) if a is not None]
+
+
+ROLLUPS = [
+    Rollup("summary", Application, label="applications"),
+    Rollup("summary", Domain, label="domains"),
+    Rollup("summary", Project, label="projects"),
+    Rollup("summary", Vendor, label="vendors"),
+    Rollup("summary", Demand, label="demands"),
+    Rollup("summary", Integration, label="integrations"),
+    Rollup("summary", ComplianceAssessment, label="complianceAssessments"),
+    Rollup("app_time_quadrant", Application, key="time_quadrant", value="cost_per_year"),
+    Rollup("app_category", Application, key="category", value="cost_per_year"),
+    Rollup("app_criticality", Application, key="criticality", value="cost_per_year"),
+    Rollup("project_domain", Project, key="primary_domain", value="budget"),
+    Rollup("project_status", Project, key="status", value="budget"),
+    Rollup("compliance_status", ComplianceAssessment, key="status"),
+    Rollup("compliance_regulation", ComplianceAssessment, key="regulation"),
+    Rollup("capability_maturity", Capability, key="domain_id", value="maturity"),
+]
+
+_ROLLUPS_BY_MODEL: dict[type, list[Rollup]] = defaultdict(list)
+for _rollup in ROLLUPS:
+    _ROLLUPS_BY_MODEL[_rollup.model].append(_rollup)
+
+TRACKED_TABLES = frozenset(model.__table__ for model in _ROLLUPS_BY_MODEL)
+
+
+def _values(obj, attributes: list[str], old: bool) -> dict:
+    return {attr: history_value(obj, attr, old) for attr in attributes}
+
+
+def _accumulate(deltas: dict, rollup: Rollup, values: dict, sign: int):
+    group = rollup.group(values)
+    if group is None:
+        return
+    delta = deltas[(rollup.dimension, group)]
+    delta[0] += sign
+    value = values[rollup.value] if rollup.value else None
+    if value is not None:
+        delta[1] += sign
+        delta[2] += sign * value
+
+
+def _collect(changes: list[Change]) -> dict:
+    deltas: dict[tuple[str, str], list] = defaultdict(lambda: [0, 0, 0.0])
+    for change in changes:
+        for rollup in _ROLLUPS_BY_MODEL.get(type(change.obj), ()):
+            if change.had:
+                _accumulate(deltas, rollup, _values(change.obj, rollup.attributes, old=True), -1)
+            if change.has:
+                _accumulate(deltas, rollup, _values(change.obj, rollup.attributes, old=False), 1)
+    return {k: v for k, v in deltas.items() if v[0] or v[1] or v[2]}
+
+
+def _apply(connection, deltas: dict):
+    params = [
+        {"dimension": dimension, "group_key": group, "row_count": count, "value_count": values, "value_sum": total}
+        for (dimension, group), (count, values, total) in sorted(deltas.items())
+    ]
+    dialect_insert = upsert_insert(connection)
+    if dialect_insert is not None:
+        # One upsert: concurrent first writes to a group cannot collide on its key.
+        stmt = dialect_insert(_table)
+        connection.execute(stmt.on_conflict_do_update(
+            index_elements=[_table.c.dimension, _table.c.group_key],
+            set_={
+                "row_count": _table.c.row_count + stmt.excluded.row_count,
+                "value_count": _table.c.value_count + stmt.excluded.value_count,
+                "value_sum": _table.c.value_sum + stmt.excluded.value_sum,
+            },
+        ), params)
+        return
+    for (dimension, group), (rows, values, total) in deltas.items():
+        result = connection.execute(
+            update(_table)
+            .where(_table.c.dimension == dimension, _table.c.group_key == group)
+            .values(
+                row_count=_table.c.row_count + rows,
+                value_count=_table.c.value_count + values,
+                value_sum=_table.c.value_sum + total,
+            )
+        )
+        if result.rowcount == 0:
+            connection.execute(
+                insert(_table).values(
+                    dimension=dimension, group_key=group,
+                    row_count=rows, value_count=values, value_sum=total,
+                )
+            )
+
+
+def _maintain_rollups(session: Session, changes: list[Change]):
+    deltas = _collect(changes)
+    if deltas:
+        _apply(session.connection(), deltas)
+
+
+def rebuild_rollups(db: Session) -> int:
+    """Recompute every rollup from the source tables. Does not commit."""
+    db.execute(delete(_table))
+    rows = []
+    for rollup in ROLLUPS:
+        model = rollup.model
+        value = getattr(model, rollup.value) if rollup.value else None
+        columns = [
+            func.count().label("row_count"),
+            func.count(value).label("value_count"),
+            func.coalesce(func.sum(value), 0).label("value_sum"),
+        ] if value is not None else [func.count().label("row_count")]
+        if rollup.key is None:
+            stmt = select(*columns).select_from(model)
+            groups = [(rollup.label, *row) for row in db.execute(stmt)]
+        else:
+            key = getattr(model, rollup.key)
+            stmt = select(key, *columns).where(key.isnot(None)).group_by(key)
+            groups = [(str(row[0]), *row[1:]) for row in db.execute(stmt)]
+        for group, row_count, *rest in groups:
+            value_count, value_sum = rest if rest else (0, 0.0)
+            rows.append({
+                "dimension": rollup.dimension, "group_key": group,
+                "row_count": row_count, "value_count": value_count, "value_sum": float(value_sum),
+            })
+    if rows:
+        db.execute(insert(_table), rows)
+    bump_versions(db.connection(), [_table.name])
+    return len(rows)
+
+
+register(DerivedTable("rollups", PortfolioRollup, TRACKED_TABLES, _maintain_rollups, rebuild_rollups))
+
+
+def read_rollups(db: Session, dimensions: list[str]) -> dict[str, dict[str, dict]]:
+    """Non-empty groups of the given dimensions: ``{dimension: {group: stats}}``."""
+    result: dict[str, dict[str, dict]] = {d: {} for d in dimensions}
+    stmt = (
+        select(_table)
+        .where(_table.c.dimension.in_(dimensions), _table.c.row_count > 0)
+        .order_by(_table.c.dimension, _table.c.group_key)
+    )
+    for row in db.execute(stmt):
+        result[row.dimension][row.group_key] = {
+            "count": row.row_count,
+            "total": row.value_sum if row.value_count else None,
+            "average": row.value_sum / row.value_count if row.value_count else None,
+        }
+    return result
+
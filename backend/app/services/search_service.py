@@ -0,0 +1,288 @@
+"""Full-text search across the landscape.
+
+``search_documents`` holds one row per searchable entity: a title, a short
+detail line and the remaining text fields as body.  On SQLite an FTS5 index
+(``search_fts``) follows the table through triggers; on PostgreSQL a
+generated ``tsvector`` column with a GIN index does (see the model).
+
+The documents of the entities a flush inserts, updates or deletes are
+rewritten in the same transaction; the table is registered as the ``search``
+derived table (see :mod:`app.services.derived_tables`).
+
+Every query word matches as a prefix.  A query without hits is retried with
+each word widened to the indexed terms within a small edit distance that
+start with the same letter, taken from a vocabulary cached per
+``search_documents`` version.
+"""
+import re
+import threading
+import time
+import unicodedata
+from collections.abc import Mapping
+from dataclasses import dataclass
+
+from sqlalchemy import delete, insert, select, text, tuple_
+from sqlalchemy.orm import Session
+
+from app.models.application import Application
+from app.models.data_object import DataObject
+from app.models.demand import Demand
+from app.models.domain import Capability
+from app.models.process import E2EProcess
+from app.models.project import Project
+from app.models.search import SearchDocument
+from app.models.table_version import TableVersion
+from app.models.vendor import Vendor
+from app.services.derived_tables import Change, DerivedTable, register
+from app.services.table_versions import EPOCH_KEY, bump_versions
+
+_table = SearchDocument.__table__
+
+MAX_QUERY_WORDS = 8
+# Suggestions may miss terms written this long ago; reading the vocabulary scans the index.
+VOCABULARY_MAX_AGE_SECONDS = 60
+_WORD = re.compile(r"\w+", re.UNICODE)
+
+
+@dataclass(frozen=True)
+class SearchSource:
+    """One searchable model: ``title`` attribute, ``detail`` attributes joined
+    for display, and the text ``fields`` searched besides the title."""
+    entity_type: str
+    model: type
+    title: str
+    detail: tuple[str, ...]
+    fields: tuple[str, ...]
+
+    def document(self, values) -> dict:
+        """The ``search_documents`` row for an entity (object or row mapping)."""
+        get = values.get if isinstance(values, Mapping) else lambda attr: getattr(values, attr)
+        return {
+            "entity_type": self.entity_type,
+            "entity_id": str(get("id")),
+            "title": get(self.title),
+            "detail": " · ".join(str(v) for v in (get(a) for a in self.detail) if v not in (None, ""))[:500],
+            "body": " ".join(str(v) for v in (get(a) for a in ("id", *self.fields)) if v not in (None, "")),
+        }
+
+    @property
+    def attributes(self) -> list[str]:
+        return list(dict.fromkeys(("id", self.title, *self.detail, *self.fields)))
+
+
+SOURCES = [
+    SearchSource("application", Application, "name", ("vendor", "category"),
+                 ("vendor", "category", "type", "description", "business_owner", "it_owner", "criticality", "time_quadrant")),
+    SearchSource("capability", Capability, "name", ("domain_id",), ("criticality",)),
+    SearchSource("project", Project, "name", ("category", "status"),
+                 ("category", "sponsor", "project_lead", "status_text", "strategic_contribution")),
+    SearchSource("vendor", Vendor, "name", ("category",),
+                 ("category", "description", "contact_person", "vendor_manager")),
+    SearchSource("demand", Demand, "title", ("category", "status"),
+                 ("description", "category", "status", "requested_by", "business_case")),
+    SearchSource("process", E2EProcess, "name", ("owner",), ("owner", "description")),
+    SearchSource("data_object", DataObject, "name", ("classification", "owner"),
+                 ("description", "classification", "owner", "steward")),
+]
+
+SOURCES_BY_TYPE = {source.entity_type: source for source in SOURCES}
+_SOURCES_BY_MODEL = {source.model: source for source in SOURCES}
+
+TRACKED_TABLES = frozenset(model.__table__ for model in _SOURCES_BY_MODEL)
+
+
+# ── index maintenance ───────────────────────────────────────────
+
+def _write(connection, removed: list[tuple[str, str]], documents: list[dict]):
+    keys = removed + [(d["entity_type"], d["entity_id"]) for d in documents]
+    if keys:
+        connection.execute(delete(_table).where(tuple_(_table.c.entity_type, _table.c.entity_id).in_(keys)))
+    if documents:
+        connection.execute(insert(_table), documents)
+    bump_versions(connection, [_table.name])
+
+
+def _maintain_search_index(session: Session, changes: list[Change]):
+    documents, removed = {}, []
+    for change in changes:
+        source = _SOURCES_BY_MODEL.get(type(change.obj))
+        if source is None:
+            continue
+        if change.has:
+            document = source.document(change.obj)
+            documents[(document["entity_type"], document["entity_id"])] = document
+        else:
+            removed.append((source.entity_type, str(change.obj.id)))
+    if documents or removed:
+        _write(session.connection(), removed, list(documents.values()))
+
+
+def rebuild_search_index(db: Session) -> int:
+    """Recompute every document from the source tables. Does not commit."""
+    db.execute(delete(_table))
+    count = 0
+    for source in SOURCES:
+        columns = [getattr(source.model, a) for a in source.attributes]
+        rows = [source.document(row._mapping) for row in db.execute(select(*columns))]
+        if rows:
+            db.execute(insert(_table), rows)
+        count += len(rows)
+    bump_versions(db.connection(), [_table.name])
+    return count
+
+
+register(DerivedTable("search", SearchDocument, TRACKED_TABLES, _maintain_search_index, rebuild_search_index))
+
+
+# ── queries ─────────────────────────────────────────────────────
+
+def _fold(word: str) -> str:
+    return "".join(c for c in unicodedata.normalize("NFKD", word) if not unicodedata.combining(c))
+
+
+def _distance(a: str, b: str, limit: int) -> int:
+    """Levenshtein distance, or ``limit + 1`` once it is certain to exceed ``limit``."""
+    if abs(len(a) - len(b)) > limit:
+        return limit + 1
+    previous = list(range(len(b) + 1))
+    for i, ca in enumerate(a, 1):
+        current = [i]
+        for j, cb in enumerate(b, 1):
+            current.append(min(previous[j] + 1, current[j - 1] + 1, previous[j - 1] + (ca != cb)))
+        if min(current) > limit:
+            return limit + 1
+        previous = current
+    return previous[-1]
+
+
+class _Vocabulary:
+    """Indexed terms by first letter and length.
+
+    Reloaded when ``search_documents`` changed, at most every
+    :data:`VOCABULARY_MAX_AGE_SECONDS`.  Corrections keep the first letter,
+    which bounds the comparisons per word to a small bucket of the vocabulary.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.clear()
+
+    def clear(self):
+        self.version = None
+        self.loaded_at = 0.0
+        self._terms: dict[tuple[str, int], list[tuple[str, str]]] = {}
+
+    def similar(self, db: Session, word: str, limit: int = 5) -> list[str]:
+        self._refresh(db)
+        folded = _fold(word)
+        max_distance = 1 if len(folded) <= 5 else 2
+        scored = []
+        for length in range(len(folded) - max_distance, len(folded) + max_distance + 1):
+            for term, folded_term in self._terms.get((folded[0], length), ()):
+                d = _distance(folded, folded_term, max_distance)
+                if 0 < d <= max_distance:
+                    scored.append((d, term))
+        return [term for _d, term in sorted(scored)[:limit]]
+
+    def _refresh(self, db: Session):
+        keys = (EPOCH_KEY, _table.name)
+        stored = dict(db.execute(
+            select(TableVersion.table_name, TableVersion.version).where(TableVersion.table_name.in_(keys))
+        ).all())
+        version = tuple(stored.get(k, 0) for k in keys)
+        with self._lock:
+            if self.version is not None and (
+                version == self.version or time.monotonic() - self.loaded_at < VOCABULARY_MAX_AGE_SECONDS
+            ):
+                return
+        if db.get_bind().dialect.name == "postgresql":
+            sql = "SELECT word FROM ts_stat('SELECT search_vector FROM search_documents')"
+        else:
+            sql = "SELECT term FROM search_vocab"
+        terms: dict[tuple[str, int], list[tuple[str, str]]] = {}
+        for (term,) in db.execute(text(sql)):
+            folded = _fold(term)
+            if folded and not term.isdigit():
+                terms.setdefault((folded[0], len(folded)), []).append((term, folded))
+        with self._lock:
+            self._terms, self.version, self.loaded_at = terms, version, time.monotonic()
+
+
+vocabulary = _Vocabulary()
+
+
+def query_words(q: str) -> list[str]:
+    return _WORD.findall(q.lower())[:MAX_QUERY_WORDS]
+
+
+def _match_expression(dialect: str, alternatives: list[list[str]]) -> str:
+    """All words must match; each as a prefix or one of its exact alternatives."""
+    groups = []
+    for word, *others in alternatives:
+        if dialect == "postgresql":
+            terms = [f"{word}:*"] + ["'" + t.replace("'", "''") + "'" for t in others]
+            groups.append("(" + " | ".join(terms) + ")")
+        else:
+            terms = [f'"{word}"*'] + [f'"{t}"' for t in others]
+            groups.append("(" + " OR ".join(terms) + ")")
+    return (" & " if dialect == "postgresql" else " AND ").join(groups)
+
+
+_SQLITE_SEARCH = """
+SELECT entity_type, entity_id, title, detail, score, total FROM (
+    SELECT d.entity_type, d.entity_id, d.title, d.detail, m.score,
+           row_number() OVER (PARTITION BY d.entity_type ORDER BY m.score DESC, d.id) AS position,
+           count(*) OVER (PARTITION BY d.entity_type) AS total
+    FROM (SELECT rowid, -bm25(search_fts, 10.0, 1.0) AS score FROM search_fts WHERE search_fts MATCH :match) m
+    JOIN search_documents d ON d.id = m.rowid
+    {types}
+) ranked WHERE position <= :limit ORDER BY score DESC
+"""
+
+_POSTGRES_SEARCH = """
+SELECT entity_type, entity_id, title, detail, score, total FROM (
+    SELECT d.entity_type, d.entity_id, d.title, d.detail, ts_rank_cd(d.search_vector, q) AS score,
+           row_number() OVER (PARTITION BY d.entity_type ORDER BY ts_rank_cd(d.search_vector, q) DESC, d.id) AS position,
+           count(*) OVER (PARTITION BY d.entity_type) AS total
+    FROM search_documents d, to_tsquery('simple', :match) q
+    WHERE d.search_vector @@ q {types}
+) ranked WHERE position <= :limit ORDER BY score DESC
+"""
+
+
+def _run(db: Session, match: str, limit: int, types: list[str] | None) -> list:
+    dialect = db.get_bind().dialect.name
+    params = {"match": match, "limit": limit}
+    types_sql = ""
+    if types:
+        names = [f":type{i}" for i in range(len(types))]
+        params.update({f"type{i}": t for i, t in enumerate(types)})
+        types_sql = f"{'AND' if dialect == 'postgresql' else 'WHERE'} d.entity_type IN ({', '.join(names)})"
+    sql = _POSTGRES_SEARCH if dialect == "postgresql" else _SQLITE_SEARCH
+    return db.execute(text(sql.format(types=types_sql)), params).all()
+
+
+def search(db: Session, q: str, limit: int = 5, types: list[str] | None = None) -> dict:
+    """Best ``limit`` hits per entity type, groups ordered by their best hit."""
+    words = query_words(q)
+    dialect = db.get_bind().dialect.name
+    corrected = False
+    rows = []
+    if words:
+        rows = _run(db, _match_expression(dialect, [[w] for w in words]), limit, types)
+        if not rows:
+            alternatives = [[w, *(vocabulary.similar(db, w) if len(w) >= 3 else [])] for w in words]
+            if any(len(a) > 1 for a in alternatives):
+                rows = _run(db, _match_expression(dialect, alternatives), limit, types)
+                corrected = bool(rows)
+    groups: dict[str, dict] = {}
+    for entity_type, entity_id, title, detail, score, total in rows:
+        group = groups.setdefault(entity_type, {"type": entity_type, "total": total, "items": []})
+        group["items"].append({"id": entity_id, "title": title, "detail": detail, "score": round(float(score), 4)})
+    return {
+        "query": q,
+        "corrected": corrected,
+        "total": sum(g["total"] for g in groups.values()),
+        "groups": list(groups.values()),
+    }
+
@@ -0,0 +1,119 @@
+"""Per-table change counters and the ETags derived from them.
+
+``table_versions`` holds one counter per table.  An ``after_flush`` listener
+bumps the counter of every table touched by an ORM flush, in the same
+transaction as the write; Core bulk writes call :func:`bump_versions`.
+
+A GET's ETag hashes the request path and query with the counters of the
+tables the route reads, so revalidating costs one primary-key lookup and a
+matching ``If-None-Match`` is answered with ``304`` before the endpoint runs.
+The random ``__epoch__`` row keeps a recreated or restored database from
+reusing ETags handed out by an earlier one.
+"""
+import hashlib
+import secrets
+
+from fastapi import Depends, HTTPException, Request, Response
+from sqlalchemy import event, insert, select, update
+from sqlalchemy.orm import Session
+
+from app.auth import get_current_user
+from app.database import get_db, upsert_insert
+from app.encoding import preferred_format
+from app.models.table_version import TableVersion
+from app.models.user import User
+
+EPOCH_KEY = "__epoch__"
+CACHE_CONTROL = "private, no-cache"
+
+_table = TableVersion.__table__
+
+
+def bump_versions(connection, table_names):
+    """Increment the counters of ``table_names`` inside the current transaction.
+
+    One upsert, so two transactions creating a table's counter at the same
+    time do not collide on its primary key.
+    """
+    names = sorted(set(table_names))
+    if not names:
+        return
+    dialect_insert = upsert_insert(connection)
+    if dialect_insert is not None:
+        stmt = dialect_insert(_table).values([{"table_name": name, "version": 1} for name in names])
+        connection.execute(stmt.on_conflict_do_update(
+            index_elements=[_table.c.table_name], set_={"version": _table.c.version + 1},
+        ))
+        return
+    for name in names:
+        result = connection.execute(
+            update(_table).where(_table.c.table_name == name).values(version=_table.c.version + 1)
+        )
+        if result.rowcount == 0:
+            connection.execute(insert(_table).values(table_name=name, version=1))
+
+
+@event.listens_for(Session, "after_flush")
+def _bump_flushed_tables(session: Session, _flush_context):
+    names = {obj.__table__.name for obj in session.new}
+    names.update(obj.__table__.name for obj in session.deleted)
+    names.update(
+        obj.__table__.name for obj in session.dirty
+        if session.is_modified(obj, include_collections=False)
+    )
+    if names:
+        bump_versions(session.connection(), names)
+
+
+def ensure_epoch(db: Session):
+    """Give this database a random epoch if it has none yet. Commits."""
+    if db.get(TableVersion, EPOCH_KEY) is None:
+        db.execute(insert(_table).values(table_name=EPOCH_KEY, version=secrets.randbelow(2**31)))
+        db.commit()
+
+
+def compute_etag(db: Session, request: Request, table_names: tuple[str, ...]) -> str:
+    keys = (EPOCH_KEY, *table_names)
+    versions = dict(db.execute(select(_table.c.table_name, _table.c.version).where(_table.c.table_name.in_(keys))).all())
+    digest = hashlib.sha256(request.url.path.encode())
+    digest.update(preferred_format(request.headers.get("accept")).encode())
+    for key, value in sorted(request.query_params.multi_items()):
+        digest.update(f"&{key}={value}".encode())
+    for key in keys:
+        digest.update(f";{key}={versions.get(key, 0)}".encode())
+    return f'"{digest.hexdigest()[:32]}"'
+
+
+def etag_matches(if_none_match: str | None, etag: str) -> bool:
+    if not if_none_match:
+        return False
+    candidates = [c.strip() for c in if_none_match.split(",")]
+    return "*" in candidates or any(c.removeprefix("W/") == etag for c in candidates)
+
+
+def conditional_get(*models, auth=get_current_user):
+    """Route dependency adding an ETag to GETs and answering revalidations with 304.
+
+    ``models`` are the models whose tables the route reads; ``auth`` runs first
+    so unauthorized requests never learn whether data changed.  The ETag is
+    also stored on ``request.state.etag`` for endpoints that build their own
+    ``Response``.
+    """
+    table_names = tuple(sorted(model.__tablename__ for model in models))
+
+    def check(
+        request: Request,
+        response: Response,
+        db: Session = Depends(get_db),
+        _user: User = Depends(auth),
+    ):
+        if request.method != "GET":
+            return
+        etag = compute_etag(db, request, table_names)
+        headers = {"ETag": etag, "Cache-Control": CACHE_CONTROL}
+        if etag_matches(request.headers.get("if-none-match"), etag):
+            raise HTTPException(status_code=304, headers=headers)
+        request.state.etag = etag
+        response.headers.update(headers)
+
+    return check
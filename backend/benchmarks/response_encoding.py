@@ -0,0 +1,89 @@
+"""Throughput of GET /api/applications: stdlib JSON vs. orjson vs. MessagePack.
+
+Run from backend/:  python -m benchmarks.response_encoding [rows] [repeats]
+
+Uses an in-memory SQLite database, so the numbers isolate validation,
+serialization and encoding from real database latency.
+"""
+import logging
+import statistics
+import sys
+import time
+
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine, insert
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+
+from app import encoding
+from app.database import Base, get_db
+from app.main import app
+from app.models.application import Application
+from app.services.auth_service import create_access_token
+from app.models.user import User
+
+
+def _setup(rows: int):
+    engine = create_engine("sqlite:///:memory:", connect_args={"check_same_thread": False}, poolclass=StaticPool)
+    Base.metadata.create_all(bind=engine)
+    Session = sessionmaker(bind=engine)
+    db = Session()
+    db.execute(insert(Application.__table__), [
+        {
+            "id": f"APP-{i:05d}", "name": f"Application {i}", "vendor": "Vendor", "category": "ERP",
+            "criticality": "High", "time_quadrant": "Invest", "cost_per_year": 1234.5 + i,
+            "user_count": i, "description": "Lorem ipsum dolor sit amet " * 4,
+            "scores": {"fit": 3, "risk": 2}, "technology": ["java", "postgres"], "entities": [],
+            "regulations": ["GDPR"], "version": 1,
+        }
+        for i in range(rows)
+    ])
+    user = User(email="bench@example.com", name="Bench", password_hash="x", role="admin", is_active=True)
+    db.add(user)
+    db.commit()
+    headers = {"Authorization": "Bearer " + create_access_token({"sub": str(user.id), "role": "admin"})}
+    db.close()
+
+    def override_get_db():
+        session = Session()
+        try:
+            yield session
+        finally:
+            session.close()
+
+    app.dependency_overrides[get_db] = override_get_db
+    return headers
+
+
+def _measure(client, headers, repeats: int) -> float:
+    timings = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        resp = client.get("/api/applications", headers=headers)
+        timings.append(time.perf_counter() - start)
+        assert resp.status_code == 200 and len(resp.content) > 0
+    return statistics.median(timings)
+
+
+def main():
+    rows = int(sys.argv[1]) if len(sys.argv) > 1 else 8000
+    repeats = int(sys.argv[2]) if len(sys.argv) > 2 else 5
+    headers = {**_setup(rows), "Accept-Encoding": "identity"}
+    logging.disable(logging.INFO)
+    client = TestClient(app)
+
+    results = {}
+    fast_json = encoding.orjson
+    encoding.orjson = None  # the stdlib path renders exactly like JSONResponse
+    results["stdlib json"] = _measure(client, headers, repeats)
+    encoding.orjson = fast_json
+    results["orjson" if fast_json else "stdlib json (no orjson)"] = _measure(client, headers, repeats)
+    results["msgpack"] = _measure(client, {**headers, "Accept": "application/msgpack"}, repeats)
+
+    print(f"GET /api/applications, {rows} rows, median of {repeats}")
+    for name, seconds in results.items():
+        print(f"  {name:22s} {seconds * 1000:8.1f} ms  {rows / seconds:10.0f} rows/s")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,13 +1,25 @@
+import os
+
 import pytest
 from sqlalchemy import create_engine
 from sqlalchemy.orm import sessionmaker
 from sqlalchemy.pool import StaticPool
 from fastapi.testclient import TestClient
 
-from app.database import Base, get_db
-from app.main import app
-from app.models.user import User
-from app.services.auth_service import hash_password, create_access_token
+# Tests share one in-memory connection, which a background audit writer
+# cannot use safely; the async pipeline is tested on its own engine.
+os.environ["AUDIT_ASYNC"] = "false"
+
+from app.database import Base, get_db, get_session_factory  # noqa: E402
+from app.main import app  # noqa: E402
+from app.routers.auth import limiter  # noqa: E402
+from app.models.user import User  # noqa: E402
+from app.services.audit_service import audit_writer  # noqa: E402
+from app.services.auth_service import hash_password, create_access_token  # noqa: E402
+from app.services.dependency_analysis import analysis_cache  # noqa: E402
+from app.services.integration_graph import integration_graph  # noqa: E402
+from app.services.principal_cache import principal_cache  # noqa: E402
+from app.services.search_service import vocabulary  # noqa: E402
 
 TEST_ENGINE = create_engine(
     "sqlite:///:memory:",
@@ -20,6 +32,11 @@ TestingSession = sessionmaker(autocommit=False, autoflush=False, bind=TEST_ENGIN
 @pytest.fixture(autouse=True)
 def setup_db():
     Base.metadata.create_all(bind=TEST_ENGINE)
+    principal_cache.clear()
+    integration_graph.clear()
+    analysis_cache.clear()
+    vocabulary.clear()
+    limiter.reset()
     yield
     Base.metadata.drop_all(bind=TEST_ENGINE)
 
@@ -61,11 +78,27 @@ def client(db_session):
             pass
 
     app.dependency_overrides[get_db] = override_get_db
+    app.dependency_overrides[get_session_factory] = lambda: TestingSession
     with TestClient(app) as c:
         yield c
     app.dependency_overrides.clear()
 
 
+@pytest.fixture()
+def running_audit_writer(tmp_path, monkeypatch):
+    """The app's audit writer started as with AUDIT_ASYNC=true.
+
+    Its thread never wakes on its own, so only explicit flushes (on the
+    request's thread) touch the shared connection.
+    """
+    monkeypatch.setattr(audit_writer, "flush_interval", 3600)
+    monkeypatch.setattr(audit_writer, "batch_size", 10_000)
+    monkeypatch.setattr(audit_writer, "spool_dir", tmp_path / "spool")
+    audit_writer.start(TestingSession)
+    yield audit_writer
+    audit_writer.stop()
+
+
 @pytest.fixture()
 def admin_user(db_session):
     return _create_test_user(db_session, "admin")
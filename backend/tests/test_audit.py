@@ -51,3 +51,79 @@ def test_audit_log_records_user(client, admin_headers, admin_user):
 def test_audit_log_requires_admin(client, viewer_headers):
     resp = client.get("/api/admin/audit-log", headers=viewer_headers)
     assert resp.status_code == 403
+
+
+def _audit_rows(db_session, n, **values):
+    from datetime import datetime, timedelta
+    from app.models.audit_log import AuditLog
+
+    base = datetime(2026, 1, 1)
+    for i in range(n):
+        db_session.add(AuditLog(
+            timestamp=base + timedelta(seconds=i // 2), action="UPDATE",
+            entity_type="vendor", entity_id=f"VND-{i:03d}", **values,
+        ))
+    db_session.commit()
+
+
+def test_audit_log_keyset_pages_cover_every_entry_once(client, admin_headers, db_session):
+    _audit_rows(db_session, 25)
+    seen, cursor = [], None
+    while True:
+        params = "limit=10" + (f"&before={cursor}" if cursor else "")
+        data = client.get(f"/api/admin/audit-log?{params}", headers=admin_headers).json()
+        assert data["total"] == 25 and data["totalIsEstimate"] is False
+        seen += [e["id"] for e in data["entries"]]
+        cursor = data["nextCursor"]
+        if cursor is None:
+            break
+    assert len(seen) == 25 == len(set(seen))
+    assert seen == sorted(seen, reverse=True)
+    assert client.get("/api/admin/audit-log?before=nope", headers=admin_headers).status_code == 400
+
+
+def test_audit_log_total_is_capped(client, admin_headers, db_session, monkeypatch):
+    from app.services import audit_query
+
+    monkeypatch.setattr(audit_query, "COUNT_CAP", 5)
+    _audit_rows(db_session, 12)
+    data = client.get("/api/admin/audit-log?limit=3", headers=admin_headers).json()
+    assert (data["total"], data["totalIsEstimate"]) == (12, True)
+    data = client.get("/api/admin/audit-log?limit=3&entity_type=vendor", headers=admin_headers).json()
+    assert (data["total"], data["totalIsEstimate"]) == (5, True)
+
+
+def test_entity_history(client, admin_headers):
+    client.post("/api/capability-mappings", json={"capability_id": "CAP-1", "application_id": "APP-1"}, headers=admin_headers)
+    client.put("/api/capability-mappings/CAP-1/APP-1", json={"role": "Primary"}, headers=admin_headers)
+    client.post("/api/capability-mappings", json={"capability_id": "CAP-2", "application_id": "APP-1"}, headers=admin_headers)
+    data = client.get("/api/admin/audit-log/history/capability_mapping/CAP-1/APP-1", headers=admin_headers).json()
+    assert [e["action"] for e in data["entries"]] == ["UPDATE", "CREATE"]
+    assert data["nextCursor"] is None
+
+
+def test_audit_queries_use_indexes(db_session):
+    from sqlalchemy import text
+
+    plans = {
+        "filter": "SELECT * FROM audit_log WHERE entity_type = 'vendor' ORDER BY timestamp DESC, id DESC LIMIT 10",
+        "history": "SELECT * FROM audit_log WHERE entity_type = 'vendor' AND entity_id = 'VND-1' "
+                   "ORDER BY timestamp DESC, id DESC LIMIT 10",
+        "page": "SELECT * FROM audit_log ORDER BY timestamp DESC, id DESC LIMIT 10",
+    }
+    for name, sql in plans.items():
+        plan = " ".join(row[-1] for row in db_session.execute(text(f"EXPLAIN QUERY PLAN {sql}")))
+        assert "ix_audit_log" in plan, (name, plan)
+        assert "TEMP B-TREE" not in plan, (name, plan)
+
+
+def test_ensure_indexes_adds_missing_indexes(db_session):
+    from sqlalchemy import inspect, text
+    from app.database import ensure_indexes
+
+    bind = db_session.get_bind()
+    db_session.execute(text("DROP INDEX ix_audit_log_entity_history"))
+    db_session.commit()
+    assert ensure_indexes(bind) == ["ix_audit_log_entity_history"]
+    assert "ix_audit_log_entity_history" in {ix["name"] for ix in inspect(bind).get_indexes("audit_log")}
+    assert ensure_indexes(bind) == []
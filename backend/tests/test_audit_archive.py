@@ -0,0 +1,99 @@
+"""Tests for audit log retention and archive search."""
+import gzip
+import json
+from datetime import datetime, timedelta
+
+import pytest
+
+from app.config import settings
+from app.models.audit_log import AuditLog
+from app.services.audit_archive import archive_entries
+
+
+@pytest.fixture(autouse=True)
+def archive_dir(tmp_path, monkeypatch):
+    monkeypatch.setattr(settings, "AUDIT_ARCHIVE_DIR", str(tmp_path))
+    return tmp_path
+
+
+def _entries(db_session, days_ago: list[int]):
+    now = datetime.utcnow()
+    for i, days in enumerate(days_ago):
+        db_session.add(AuditLog(
+            timestamp=now - timedelta(days=days), action="UPDATE",
+            entity_type="vendor" if i % 2 else "application", entity_id=f"E-{i}",
+        ))
+    db_session.commit()
+
+
+def _all_pages(client, headers, query):
+    seen, cursor = [], None
+    while True:
+        url = f"/api/admin/audit-log?limit=2&{query}" + (f"&before={cursor}" if cursor else "")
+        data = client.get(url, headers=headers).json()
+        seen += [e["entityId"] for e in data["entries"]]
+        cursor = data["nextCursor"]
+        if cursor is None:
+            return seen
+
+
+def test_archive_moves_old_entries_to_monthly_files(client, admin_headers, db_session, archive_dir):
+    _entries(db_session, [400, 100, 70, 5, 1])
+    resp = client.post("/api/admin/audit-log/archive?older_than_days=30", headers=admin_headers)
+    assert resp.status_code == 200
+    assert resp.json()["archived"] == 3
+
+    hot = client.get("/api/admin/audit-log", headers=admin_headers).json()
+    assert [e["entityId"] for e in hot["entries"] if e["entityType"] != "audit_log"] == ["E-4", "E-3"]
+    assert hot["entries"][0]["action"] == "ARCHIVE"
+
+    files = sorted(archive_dir.glob("audit-*.jsonl.gz"))
+    assert len(files) == len(resp.json()["months"]) >= 2
+    with gzip.open(files[0], "rt") as f:
+        assert json.loads(f.readline())["entity_id"] == "E-0"
+
+
+def test_include_archive_merges_pages_and_filters(client, admin_headers, db_session):
+    _entries(db_session, [400, 100, 70, 5, 1])
+    archive_entries(db_session, datetime.utcnow() - timedelta(days=30))
+
+    assert _all_pages(client, admin_headers, "include_archive=true") == ["E-4", "E-3", "E-2", "E-1", "E-0"]
+    assert _all_pages(client, admin_headers, "include_archive=true&entity_type=vendor") == ["E-3", "E-1"]
+    since = (datetime.utcnow() - timedelta(days=120)).isoformat()
+    until = (datetime.utcnow() - timedelta(days=3)).isoformat()
+    assert _all_pages(client, admin_headers, f"include_archive=true&since={since}&until={until}") == ["E-3", "E-2", "E-1"]
+    assert _all_pages(client, admin_headers, "") == ["E-4", "E-3"]
+
+    history = client.get("/api/admin/audit-log/history/application/E-0?include_archive=true", headers=admin_headers).json()
+    assert [e["entityId"] for e in history["entries"]] == ["E-0"]
+
+
+def test_entries_in_both_places_are_listed_once(client, admin_headers, db_session, archive_dir):
+    _entries(db_session, [100, 1])
+    archive_entries(db_session, datetime.utcnow() - timedelta(days=30))
+    # Simulate a crash after the archive write but before the delete.
+    with gzip.open(next(archive_dir.glob("*.gz")), "rt") as f:
+        record = json.loads(f.readline())
+    record["timestamp"] = datetime.fromisoformat(record["timestamp"])
+    db_session.add(AuditLog(**record))
+    db_session.commit()
+    assert _all_pages(client, admin_headers, "include_archive=true") == ["E-1", "E-0"]
+
+
+def test_archive_requires_retention_period(client, admin_headers, editor_headers):
+    assert client.post("/api/admin/audit-log/archive", headers=admin_headers).status_code == 400
+    assert client.post("/api/admin/audit-log/archive?older_than_days=1", headers=editor_headers).status_code == 403
+
+
+def test_incremental_export_before_archive_cutoff_is_gone(client, admin_headers, db_session, archive_dir):
+    _entries(db_session, [40, 1])
+    cutoff = datetime.utcnow() - timedelta(days=30)
+    archive_entries(db_session, cutoff)
+    too_old = (cutoff - timedelta(days=1)).isoformat() + "Z"
+    for url in ("/api/export/ndjson", "/api/export/csv/applications"):
+        resp = client.get(f"{url}?updated_since={too_old}", headers=admin_headers)
+        assert resp.status_code == 410
+        assert cutoff.isoformat() in resp.json()["detail"]
+    recent = (cutoff + timedelta(days=1)).isoformat() + "Z"
+    assert client.get(f"/api/export/ndjson?updated_since={recent}", headers=admin_headers).status_code == 200
+    assert client.get("/api/export/ndjson", headers=admin_headers).status_code == 200
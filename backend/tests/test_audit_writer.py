@@ -0,0 +1,97 @@
+"""Tests for the batched audit writer and its spool."""
+import json
+
+import pytest
+from sqlalchemy import create_engine, func, select
+from sqlalchemy.orm import sessionmaker
+
+from app.database import Base
+from app.models.audit_log import AuditLog
+from app.services import audit_service
+from app.services.audit_service import AuditWriter, audit_entry, write_audit
+
+
+@pytest.fixture()
+def file_db(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'audit.db'}")
+    Base.metadata.create_all(bind=engine)
+    yield sessionmaker(bind=engine)
+    engine.dispose()
+
+
+@pytest.fixture()
+def writer(tmp_path, file_db, monkeypatch):
+    writer = AuditWriter(
+        batch_size=2, flush_interval=60, max_queue=100,
+        spool_dir=str(tmp_path / "spool"), strict_entity_types=["compliance_assessment"],
+    )
+    monkeypatch.setattr(audit_service, "audit_writer", writer)
+    writer.start(file_db)
+    yield writer
+    writer.stop()
+
+
+def _count(session_factory):
+    with session_factory() as db:
+        return db.scalar(select(func.count()).select_from(AuditLog))
+
+
+def test_entries_are_queued_until_commit_and_flushed_in_batches(writer, file_db):
+    with file_db() as db:
+        for i in range(5):
+            write_audit(db, None, "UPDATE", "vendor", f"VND-{i}")
+        assert _count(file_db) == 0
+        db.commit()
+    writer.flush()
+    assert _count(file_db) == 5
+    assert writer.stats()["written"] == 5
+
+
+def test_strict_entity_types_write_in_the_transaction(writer, file_db):
+    with file_db() as db:
+        write_audit(db, None, "UPDATE", "compliance_assessment", "CA-001")
+        db.commit()
+    assert _count(file_db) == 1
+    assert writer.stats()["queued"] == 0
+
+
+def test_rolled_back_entries_are_discarded(writer, file_db):
+    with file_db() as db:
+        write_audit(db, None, "DELETE", "vendor", "VND-1")
+        db.rollback()
+        db.commit()
+    writer.flush()
+    assert _count(file_db) == 0
+
+
+def test_failed_writes_are_spooled_and_replayed(writer, file_db):
+    AuditLog.__table__.drop(file_db.kw["bind"])
+    writer.submit([audit_entry(None, "UPDATE", "vendor", "VND-1")])
+    writer.flush()
+    assert writer.spool_path.exists()
+    assert writer.stats()["spooled"] == 1
+
+    AuditLog.__table__.create(file_db.kw["bind"])
+    writer.submit([audit_entry(None, "UPDATE", "vendor", "VND-2")])
+    writer.flush()
+    assert not writer.spool_path.exists()
+    with file_db() as db:
+        assert sorted(db.scalars(select(AuditLog.entity_id))) == ["VND-1", "VND-2"]
+
+
+def test_spools_of_dead_processes_are_replayed_on_start(tmp_path, file_db):
+    spool_dir = tmp_path / "spool"
+    spool_dir.mkdir()
+    entry = {**audit_entry(None, "CREATE", "vendor", "VND-9"), "timestamp": "2026-01-01T00:00:00+00:00"}
+    (spool_dir / "audit-999999999.jsonl").write_text(json.dumps(entry) + "\n")
+    writer = AuditWriter(2, 60, 100, str(spool_dir), [])
+    writer.start(file_db)
+    writer.stop()
+    assert _count(file_db) == 1
+    assert list(spool_dir.iterdir()) == []
+
+
+def test_stop_drains_the_queue(writer, file_db):
+    writer.submit([audit_entry(None, "UPDATE", "vendor", "VND-1")])
+    writer.stop()
+    assert _count(file_db) == 1
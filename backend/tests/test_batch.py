@@ -0,0 +1,123 @@
+"""Tests for the transactional batch write endpoint."""
+from sqlalchemy import select
+
+from app.models.rollup import PortfolioRollup
+from app.services.rollup_service import rebuild_rollups
+
+
+def _batch(client, headers, *operations):
+    return client.post("/api/batch", json={"operations": list(operations)}, headers=headers)
+
+
+def test_batch_applies_operations_in_order(client, admin_headers):
+    resp = _batch(
+        client, admin_headers,
+        {"op": "create", "entity": "applications", "data": {"name": "A"}},
+        {"op": "create", "entity": "applications", "data": {"name": "B"}},
+        {"op": "create", "entity": "capability-mappings", "data": {"capability_id": "CAP-1", "application_id": "APP-001"}},
+        {"op": "update", "entity": "applications", "id": "APP-001", "data": {"criticality": "High"}},
+        {"op": "update", "entity": "capability-mappings", "id": "CAP-1/APP-001", "data": {"role": "Primary"}},
+        {"op": "delete", "entity": "applications", "id": "APP-002"},
+    )
+    assert resp.status_code == 200
+    body = resp.json()
+    assert body["committed"] is True
+    assert [(r["id"], r["status"]) for r in body["results"]] == [
+        ("APP-001", 201), ("APP-002", 201), ("CAP-1/APP-001", 201),
+        ("APP-001", 200), ("CAP-1/APP-001", 200), ("APP-002", 204),
+    ]
+    assert body["results"][3]["version"] == 2
+
+    apps = client.get("/api/applications", headers=admin_headers).json()
+    assert [(a["id"], a["criticality"], a["version"]) for a in apps] == [("APP-001", "High", 2)]
+    mappings = client.get("/api/capability-mappings", headers=admin_headers).json()
+    assert mappings[0]["role"] == "Primary"
+
+    audit = client.get("/api/admin/audit-log?entity_type=capability_mapping", headers=admin_headers).json()
+    assert sorted(e["action"] for e in audit["entries"]) == ["CREATE", "UPDATE"]
+    assert audit["entries"][0]["entityId"] == "CAP-1/APP-001"
+
+
+def test_batch_is_all_or_nothing(client, admin_headers):
+    client.post("/api/vendors", json={"name": "Keep"}, headers=admin_headers)
+    resp = _batch(
+        client, admin_headers,
+        {"op": "create", "entity": "vendors", "data": {"name": "New"}},
+        {"op": "update", "entity": "vendors", "id": "VND-001", "data": {"name": "Renamed"}},
+        {"op": "delete", "entity": "vendors", "id": "VND-404"},
+        {"op": "create", "entity": "nonsense", "data": {}},
+    )
+    assert resp.status_code == 404
+    body = resp.json()
+    assert body["committed"] is False
+    assert [r["status"] for r in body["results"]] == [424, 424, 404, 400]
+    assert [v["name"] for v in client.get("/api/vendors", headers=admin_headers).json()] == ["Keep"]
+    audit = client.get("/api/admin/audit-log?entity_type=vendor", headers=admin_headers).json()
+    assert audit["total"] == 1
+
+
+def test_batch_if_match_per_item(client, admin_headers):
+    client.post("/api/applications", json={"name": "A"}, headers=admin_headers)
+    client.put("/api/applications/APP-001", json={"name": "A2"}, headers=admin_headers)
+
+    stale = _batch(client, admin_headers, {"op": "update", "entity": "applications", "id": "APP-001", "if_match": 1, "data": {"name": "X"}})
+    assert stale.status_code == 409
+    assert stale.json()["results"][0]["error"] == "Conflict: entity was modified by another user"
+
+    resp = _batch(
+        client, admin_headers,
+        {"op": "update", "entity": "applications", "id": "APP-001", "if_match": 2, "data": {"name": "B"}},
+        {"op": "update", "entity": "applications", "id": "APP-001", "if_match": 3, "data": {"name": "C"}},
+    )
+    assert resp.status_code == 200
+    assert [r["version"] for r in resp.json()["results"]] == [3, 4]
+
+    unversioned = _batch(client, admin_headers, {"op": "update", "entity": "vendors", "id": "VND-001", "if_match": 1, "data": {}})
+    assert unversioned.status_code == 400
+
+
+def test_batch_validation_and_permissions(client, admin_headers, editor_headers, viewer_headers):
+    op = {"op": "create", "entity": "vendors", "data": {"name": "V"}}
+    assert _batch(client, viewer_headers, op).status_code == 403
+    assert _batch(client, editor_headers, op).status_code == 200
+    resp = _batch(client, editor_headers, {"op": "delete", "entity": "vendors", "id": "VND-001"})
+    assert resp.status_code == 403
+    resp = _batch(client, admin_headers, {"op": "create", "entity": "vendors", "data": {"name": None}})
+    assert resp.status_code == 422
+    assert "name" in resp.json()["results"][0]["error"]
+    resp = _batch(client, admin_headers, {"op": "create", "entity": "vendors", "data": {"id": "VND-001", "name": "Dup"}})
+    assert resp.status_code == 409
+    assert client.post("/api/batch", json={"operations": []}, headers=admin_headers).status_code == 422
+
+
+def test_batch_create_delete_and_recreate(client, admin_headers):
+    resp = _batch(
+        client, admin_headers,
+        {"op": "create", "entity": "projects", "data": {"id": "PRJ-100", "name": "Temp"}},
+        {"op": "delete", "entity": "projects", "id": "PRJ-100"},
+        {"op": "create", "entity": "projects", "data": {"id": "PRJ-100", "name": "Final"}},
+    )
+    assert resp.status_code == 200
+    projects = client.get("/api/projects", headers=admin_headers).json()
+    assert [(p["id"], p["name"]) for p in projects] == [("PRJ-100", "Final")]
+
+
+def test_batch_keeps_rollups_and_etags_current(client, admin_headers, db_session):
+    first = client.get("/api/applications", headers=admin_headers)
+    _batch(
+        client, admin_headers,
+        *({"op": "create", "entity": "applications", "data": {"name": f"A{i}", "time_quadrant": "Invest", "cost_per_year": 10}} for i in range(3)),
+        {"op": "create", "entity": "projects", "data": {"name": "P", "budget": 5, "status": "green"}},
+    )
+    assert client.get("/api/applications", headers={**admin_headers, "If-None-Match": first.headers["ETag"]}).status_code == 200
+    data = client.get("/api/dashboard/rollups?dimensions=app_time_quadrant", headers=admin_headers).json()
+    assert data["app_time_quadrant"]["Invest"] == {"count": 3, "total": 30.0, "average": 10.0}
+
+    def snapshot():
+        return sorted(tuple(r) for r in db_session.execute(select(
+            PortfolioRollup.dimension, PortfolioRollup.group_key, PortfolioRollup.row_count, PortfolioRollup.value_sum,
+        ).where(PortfolioRollup.row_count > 0)))
+
+    incremental = snapshot()
+    rebuild_rollups(db_session)
+    assert snapshot() == incremental
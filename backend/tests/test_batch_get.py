@@ -0,0 +1,36 @@
+"""Tests for batch get-by-ids."""
+
+
+def _create_vendors(client, headers, n):
+    for i in range(n):
+        client.post("/api/vendors", json={"name": f"V{i}"}, headers=headers)
+
+
+def test_get_by_ids_preserves_order_and_reports_missing(client, admin_headers):
+    _create_vendors(client, admin_headers, 3)
+    resp = client.get("/api/vendors?ids=VND-003,VND-404,VND-001,VND-003", headers=admin_headers)
+    assert resp.status_code == 200
+    assert [v["id"] for v in resp.json()] == ["VND-003", "VND-001"]
+    assert resp.headers["X-Missing-Ids"] == "VND-404"
+
+
+def test_get_by_ids_with_fields(client, admin_headers):
+    _create_vendors(client, admin_headers, 2)
+    resp = client.get("/api/vendors?ids=VND-002,VND-001&fields=name", headers=admin_headers)
+    assert resp.json() == [{"name": "V1", "id": "VND-002"}, {"name": "V0", "id": "VND-001"}]
+    assert "X-Missing-Ids" not in resp.headers
+
+
+def test_post_by_ids(client, admin_headers):
+    domain = client.post("/api/domains", json={"name": "D"}, headers=admin_headers).json()
+    resp = client.post("/api/domains/by-ids", json={"ids": [999, domain["id"]], "fields": ["name"]}, headers=admin_headers)
+    assert resp.status_code == 200
+    assert resp.json() == {"items": [{"name": "D", "id": domain["id"]}], "missing": [999]}
+
+
+def test_by_ids_validation(client, admin_headers):
+    assert client.get("/api/domains?ids=abc", headers=admin_headers).status_code == 400
+    too_many = ",".join(f"APP-{i}" for i in range(201))
+    assert client.get(f"/api/applications?ids={too_many}", headers=admin_headers).status_code == 400
+    resp = client.post("/api/applications/by-ids", json={"ids": ["APP-1"], "fields": ["nope"]}, headers=admin_headers)
+    assert resp.status_code == 400
@@ -0,0 +1,67 @@
+"""Tests for response compression."""
+import gzip
+
+from app.compression import CompressedCache, negotiate
+
+
+def test_negotiate_respects_q_values():
+    encodings = {"br": None, "gzip": None}
+    assert negotiate("gzip, br", encodings) == "br"
+    assert negotiate("br;q=0, gzip", encodings) == "gzip"
+    assert negotiate("identity", encodings) is None
+    assert negotiate("*", encodings) == "br"
+
+
+def test_large_json_is_gzipped_small_is_not(client, admin_headers):
+    for i in range(30):
+        client.post("/api/vendors", json={"name": f"Vendor {i}", "description": "x" * 50}, headers=admin_headers)
+    resp = client.get("/api/vendors", headers={**admin_headers, "Accept-Encoding": "gzip"})
+    assert resp.headers["Content-Encoding"] == "gzip"
+    assert "Accept-Encoding" in resp.headers["Vary"]
+    assert resp.headers["ETag"].endswith('-gzip"')
+    assert len(resp.json()) == 30
+
+    resp = client.get("/api/health", headers={"Accept-Encoding": "gzip"})
+    assert "Content-Encoding" not in resp.headers
+
+    resp = client.get("/api/vendors", headers={**admin_headers, "Accept-Encoding": "identity"})
+    assert "Content-Encoding" not in resp.headers
+
+
+def test_encoded_etag_revalidates(client, admin_headers):
+    for i in range(30):
+        client.post("/api/vendors", json={"name": f"Vendor {i}", "description": "x" * 50}, headers=admin_headers)
+    etag = client.get("/api/vendors", headers={**admin_headers, "Accept-Encoding": "gzip"}).headers["ETag"]
+    resp = client.get("/api/vendors", headers={**admin_headers, "Accept-Encoding": "gzip", "If-None-Match": etag})
+    assert resp.status_code == 304
+    assert resp.headers["ETag"] == etag
+
+
+def test_streamed_export_is_compressed_and_cached(client, admin_headers):
+    from app.main import app
+
+    for i in range(20):
+        client.post("/api/applications", json={"name": f"App {i}", "description": "y" * 100}, headers=admin_headers)
+    plain = client.get("/api/export/json", headers={**admin_headers, "Accept-Encoding": "identity"}).content
+    with client.stream("GET", "/api/export/json", headers={**admin_headers, "Accept-Encoding": "gzip"}) as resp:
+        assert resp.headers["Content-Encoding"] == "gzip"
+        raw = b"".join(resp.iter_raw())
+    assert gzip.decompress(raw) == plain
+
+    middleware = app.middleware_stack
+    while not hasattr(middleware, "cache"):
+        middleware = middleware.app
+    hits = middleware.cache.hits
+    with client.stream("GET", "/api/export/json", headers={**admin_headers, "Accept-Encoding": "gzip"}) as resp:
+        assert b"".join(resp.iter_raw()) == raw
+    assert middleware.cache.hits == hits + 1
+
+
+def test_compressed_cache_is_bounded():
+    cache = CompressedCache(max_bytes=10)
+    cache.put('"a"', b"12345")
+    cache.put('"b"', b"12345")
+    cache.put('"c"', b"12345")
+    assert cache.get('"a"') is None
+    assert cache.get('"c"') == b"12345"
+    assert cache.stats()["bytes"] == 10
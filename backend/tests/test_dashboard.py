@@ -46,3 +46,23 @@ def test_application_categories(client, admin_headers):
 def test_dashboard_requires_auth(client):
     resp = client.get("/api/dashboard/summary")
     assert resp.status_code == 401
+
+
+def test_dashboard_bundle_matches_individual_endpoints(client, admin_headers):
+    client.post("/api/applications", json={"name": "A1", "category": "ERP", "time_quadrant": "Invest", "criticality": "High"}, headers=admin_headers)
+    client.post("/api/applications", json={"name": "A2", "category": "CRM"}, headers=admin_headers)
+    client.post("/api/compliance", json={"app_id": "APP-001", "status": "compliant"}, headers=admin_headers)
+    resp = client.get("/api/dashboard/bundle", headers=admin_headers)
+    assert resp.status_code == 200
+    bundle = resp.json()
+    for widget in ("summary", "time-distribution", "application-categories", "criticality-distribution", "compliance-status"):
+        assert bundle[widget] == client.get(f"/api/dashboard/{widget}", headers=admin_headers).json()
+    assert bundle["summary"]["applications"] == 2
+    assert bundle["compliance-status"] == {"compliant": 1}
+
+
+def test_dashboard_bundle_subset_and_unknown_widget(client, admin_headers):
+    resp = client.get("/api/dashboard/bundle?widgets=summary,time-distribution", headers=admin_headers)
+    assert set(resp.json()) == {"summary", "time-distribution"}
+    resp = client.get("/api/dashboard/bundle?widgets=summary,nope", headers=admin_headers)
+    assert resp.status_code == 400
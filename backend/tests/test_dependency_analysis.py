@@ -0,0 +1,63 @@
+"""Tests for the project dependency analysis."""
+from datetime import date
+
+from app.services.dependency_analysis import analysis_cache, compute, parse_period
+
+
+def test_parse_period():
+    assert parse_period("Q3/2026") == date(2026, 7, 1)
+    assert parse_period("Q3/2026", end=True) == date(2026, 9, 30)
+    assert parse_period("2026-02", end=True) == date(2026, 2, 28)
+    assert parse_period("2026-05-17") == date(2026, 5, 17)
+    assert parse_period("irgendwann") is None
+
+
+def test_order_critical_path_and_conflicts():
+    periods = {
+        "P1": ("Q1/2026", "Q2/2026"),   # 181 days
+        "P2": ("Q3/2026", "Q3/2026"),   # 92 days
+        "P3": ("Q1/2026", "Q4/2026"),   # 365 days
+        "P4": ("Q1/2027", "Q1/2027"),   # 90 days
+    }
+    # P2 needs P1, P4 needs P2 and P3.
+    analysis = compute(periods, [("P2", "P1"), ("P4", "P2"), ("P4", "P3")])
+    assert analysis.order == ["P1", "P2", "P3", "P4"]
+    assert analysis.cycles == []
+    assert (analysis.critical_path, analysis.critical_days) == (["P3", "P4"], 455)
+    assert analysis.conflicts == []
+    assert analysis.closure("P2") == {"projectId": "P2", "dependsOn": ["P1"], "dependents": ["P4"]}
+
+    late = compute({**periods, "P1": ("Q1/2026", "Q3/2026")}, [("P2", "P1")])
+    assert late.conflicts == [{"source": "P2", "target": "P1", "targetEnd": "2026-09-30", "sourceStart": "2026-07-01"}]
+
+
+def test_cycles_are_reported_and_left_out_of_the_order():
+    analysis = compute({}, [("A", "B"), ("B", "C"), ("C", "A"), ("D", "C"), ("E", "E")])
+    assert analysis.cycles == [["A", "B", "C"], ["E"]]
+    assert analysis.order == []
+    assert analysis.undated == ["A", "B", "C", "D", "E"]
+
+
+def test_analysis_endpoint_and_cache(client, admin_headers):
+    client.post("/api/projects", json={"name": "Base", "start": "Q1/2026", "end": "Q2/2026"}, headers=admin_headers)
+    client.post("/api/projects", json={"name": "Next", "start": "Q2/2026", "end": "Q4/2026"}, headers=admin_headers)
+    client.post("/api/project-dependencies", json={"source_project_id": "PRJ-002", "target_project_id": "PRJ-001"}, headers=admin_headers)
+
+    data = client.get("/api/project-dependencies/analysis?project_id=PRJ-001", headers=admin_headers).json()
+    assert data["order"] == ["PRJ-001", "PRJ-002"]
+    assert data["criticalPath"]["projects"] == ["PRJ-001", "PRJ-002"]
+    assert [(c["source"], c["target"]) for c in data["conflicts"]] == [("PRJ-002", "PRJ-001")]
+    assert data["closure"] == {"projectId": "PRJ-001", "dependsOn": [], "dependents": ["PRJ-002"]}
+    assert analysis_cache.computed == 1
+
+    # Changes that do not affect the schedule keep the cached analysis.
+    client.put("/api/projects/PRJ-001", json={"name": "Renamed"}, headers=admin_headers)
+    client.get("/api/project-dependencies/analysis", headers=admin_headers)
+    assert analysis_cache.computed == 1
+
+    client.put("/api/projects/PRJ-002", json={"start": "Q3/2026"}, headers=admin_headers)
+    data = client.get("/api/project-dependencies/analysis", headers=admin_headers).json()
+    assert data["conflicts"] == []
+    assert analysis_cache.computed == 2
+
+    assert client.get("/api/project-dependencies/analysis?project_id=NOPE", headers=admin_headers).status_code == 404
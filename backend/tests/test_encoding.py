@@ -0,0 +1,45 @@
+"""Tests for response encoding and format negotiation."""
+import msgpack
+
+from app import encoding
+from app.encoding import JSON, MSGPACK, dumps_msgpack, preferred_format
+
+
+def test_preferred_format():
+    assert preferred_format(None) == JSON
+    assert preferred_format("application/json") == JSON
+    assert preferred_format("application/msgpack") == MSGPACK
+    assert preferred_format("application/msgpack, */*") == MSGPACK
+    assert preferred_format("application/json, application/msgpack") == JSON
+    assert preferred_format("application/json;q=0.5, application/x-msgpack") == MSGPACK
+
+
+def test_msgpack_encoding_roundtrip():
+    content = {"a": [1, -1, None, True, 1.5, "x"], "n": 300}
+    assert msgpack.unpackb(dumps_msgpack(content)) == content
+
+
+def test_json_only_without_msgpack(client, admin_headers, monkeypatch):
+    monkeypatch.setattr(encoding, "msgpack", None)
+    assert preferred_format("application/msgpack") == JSON
+    resp = client.get("/api/vendors", headers={**admin_headers, "Accept": "application/msgpack"})
+    assert resp.headers["Content-Type"] == "application/json"
+
+
+def test_msgpack_negotiation(client, admin_headers):
+    client.post("/api/vendors", json={"name": "V1"}, headers=admin_headers)
+    as_json = client.get("/api/vendors", headers=admin_headers)
+    assert as_json.headers["Content-Type"] == "application/json"
+    assert "Accept" in as_json.headers["Vary"]
+
+    as_msgpack = client.get("/api/vendors", headers={**admin_headers, "Accept": "application/msgpack"})
+    assert as_msgpack.status_code == 200
+    assert as_msgpack.headers["Content-Type"] == "application/msgpack"
+    assert as_msgpack.content[0] == 0x91  # array of one vendor
+    assert as_msgpack.headers["ETag"] != as_json.headers["ETag"]
+
+
+def test_openapi_documents_response_models(client):
+    spec = client.get("/api/openapi.json").json()
+    schema = spec["paths"]["/api/vendors"]["get"]["responses"]["200"]["content"]["application/json"]["schema"]
+    assert schema["items"]["$ref"].endswith("/VendorRead")
@@ -0,0 +1,67 @@
+"""Tests for ETag / If-None-Match revalidation."""
+
+
+def test_list_etag_roundtrip_and_invalidation(client, admin_headers):
+    client.post("/api/vendors", json={"name": "V1"}, headers=admin_headers)
+    resp = client.get("/api/vendors", headers=admin_headers)
+    etag = resp.headers["ETag"]
+    assert resp.status_code == 200
+    assert resp.headers["Cache-Control"] == "private, no-cache"
+
+    resp = client.get("/api/vendors", headers={**admin_headers, "If-None-Match": etag})
+    assert resp.status_code == 304
+    assert resp.headers["ETag"] == etag
+    assert resp.content == b""
+
+    client.post("/api/vendors", json={"name": "V2"}, headers=admin_headers)
+    resp = client.get("/api/vendors", headers={**admin_headers, "If-None-Match": etag})
+    assert resp.status_code == 200
+    assert resp.headers["ETag"] != etag
+    assert len(resp.json()) == 2
+
+
+def test_etag_depends_on_query_and_table(client, admin_headers):
+    client.post("/api/vendors", json={"name": "V1"}, headers=admin_headers)
+    full = client.get("/api/vendors", headers=admin_headers).headers["ETag"]
+    paged = client.get("/api/vendors?limit=1", headers=admin_headers).headers["ETag"]
+    assert full != paged
+
+    domains = client.get("/api/domains", headers=admin_headers).headers["ETag"]
+    client.post("/api/vendors", json={"name": "V2"}, headers=admin_headers)
+    resp = client.get("/api/domains", headers={**admin_headers, "If-None-Match": domains})
+    assert resp.status_code == 304
+
+
+def test_detail_and_export_etags(client, admin_headers):
+    app = client.post("/api/applications", json={"name": "A"}, headers=admin_headers).json()
+    detail = client.get(f"/api/applications/{app['id']}", headers=admin_headers)
+    assert client.get(
+        f"/api/applications/{app['id']}", headers={**admin_headers, "If-None-Match": detail.headers["ETag"]},
+    ).status_code == 304
+
+    export = client.get("/api/export/json", headers=admin_headers)
+    assert export.status_code == 200
+    etag = export.headers["ETag"]
+    assert client.get("/api/export/json", headers={**admin_headers, "If-None-Match": f'W/{etag}'}).status_code == 304
+    client.put(f"/api/applications/{app['id']}", json={"name": "B"}, headers=admin_headers)
+    assert client.get("/api/export/json", headers={**admin_headers, "If-None-Match": etag}).status_code == 200
+
+
+def test_etag_requires_authentication(client, admin_headers):
+    etag = client.get("/api/vendors", headers=admin_headers).headers["ETag"]
+    assert client.get("/api/vendors", headers={"If-None-Match": etag}).status_code in (401, 403)
+
+
+def test_bump_versions_creates_and_increments_counters(db_session):
+    from sqlalchemy import select
+
+    from app.models.table_version import TableVersion
+    from app.services.table_versions import bump_versions
+
+    connection = db_session.connection()
+    bump_versions(connection, ["alpha"])
+    bump_versions(connection, ["alpha", "beta", "alpha"])
+    versions = dict(db_session.execute(
+        select(TableVersion.table_name, TableVersion.version).where(TableVersion.table_name.in_(["alpha", "beta"]))
+    ).all())
+    assert versions == {"alpha": 2, "beta": 1}
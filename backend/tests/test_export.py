@@ -0,0 +1,123 @@
+"""Tests for the export endpoints."""
+import csv
+import io
+import json
+from datetime import datetime, timezone
+
+from app.models.audit_log import AuditLog
+
+EXPORT_KEYS = [
+    "domains", "applications", "capabilityMappings", "projects", "projectDependencies",
+    "vendors", "demands", "integrations", "e2eProcesses", "legalEntities",
+    "complianceAssessments", "managementKPIs",
+]
+
+
+def test_export_json_streams_same_document_as_buffered(client, admin_headers):
+    client.post("/api/seed", headers=admin_headers)
+    streamed = client.get("/api/export/json", headers=admin_headers)
+    buffered = client.get("/api/export/json?stream=false", headers=admin_headers)
+    assert streamed.status_code == buffered.status_code == 200
+    assert streamed.headers["content-type"] == "application/json"
+    assert streamed.content == buffered.content
+    data = streamed.json()
+    assert list(data.keys()) == EXPORT_KEYS
+    assert data["applications"]
+    assert "subCapabilities" in data["domains"][0]["capabilities"][0]
+
+
+def _file_sessions(tmp_path):
+    """Sessions on a pooled file database, so checked-out connections can be counted."""
+    from sqlalchemy import create_engine
+    from sqlalchemy.orm import sessionmaker
+
+    from app.database import Base
+
+    engine = create_engine(f"sqlite:///{tmp_path / 'export.db'}")
+    Base.metadata.create_all(bind=engine)
+    return engine, sessionmaker(bind=engine)
+
+
+def test_export_json_stream_closes_its_session(client, admin_headers, tmp_path):
+    from app.database import get_session_factory
+    from app.main import app
+
+    engine, factory = _file_sessions(tmp_path)
+    app.dependency_overrides[get_session_factory] = lambda: factory
+    for _ in range(3):
+        assert client.get("/api/export/json", headers=admin_headers).status_code == 200
+    assert engine.pool.checkedout() == 0
+    engine.dispose()
+
+
+def test_incremental_export_streams_close_their_sessions(client, admin_headers, tmp_path):
+    from app.database import get_session_factory
+    from app.main import app
+
+    engine, factory = _file_sessions(tmp_path)
+    app.dependency_overrides[get_session_factory] = lambda: factory
+    for _ in range(3):
+        assert client.get("/api/export/ndjson", headers=admin_headers).status_code == 200
+        assert client.get("/api/export/ndjson?updated_since=2024-01-01T00:00:00Z", headers=admin_headers).status_code == 200
+        assert client.get("/api/export/csv/vendors", headers=admin_headers).status_code == 200
+    assert engine.pool.checkedout() == 0
+    engine.dispose()
+
+
+def test_export_json_empty(client, admin_headers):
+    resp = client.get("/api/export/json", headers=admin_headers)
+    assert resp.status_code == 200
+    assert resp.json() == {key: [] for key in EXPORT_KEYS}
+
+
+def test_export_requires_auth(client):
+    resp = client.get("/api/export/json")
+    assert resp.status_code == 401
+
+
+def test_export_ndjson_tags_each_record(client, admin_headers):
+    client.post("/api/applications", json={"name": "App A"}, headers=admin_headers)
+    client.post("/api/vendors", json={"name": "Vendor A"}, headers=admin_headers)
+    resp = client.get("/api/export/ndjson", headers=admin_headers)
+    assert resp.status_code == 200
+    assert resp.headers["content-type"] == "application/x-ndjson"
+    lines = [json.loads(line) for line in resp.text.splitlines()]
+    assert [line["entity"] for line in lines] == ["applications", "vendors"]
+    assert lines[0]["data"]["name"] == "App A"
+    assert "timeQuadrant" in lines[0]["data"]
+
+
+def test_export_ndjson_updated_since(client, admin_headers, db_session):
+    client.post("/api/applications", json={"id": "APP-001", "name": "Old"}, headers=admin_headers)
+    db_session.query(AuditLog).update({AuditLog.timestamp: datetime(2020, 1, 1)})
+    db_session.commit()
+    client.post("/api/applications", json={"id": "APP-002", "name": "New"}, headers=admin_headers)
+    resp = client.get("/api/export/ndjson?updated_since=2024-01-01T00:00:00Z", headers=admin_headers)
+    ids = [json.loads(line)["data"]["id"] for line in resp.text.splitlines()]
+    assert ids == ["APP-002"]
+
+
+def test_export_ndjson_updated_since_sees_queued_audit_entries(client, admin_headers, running_audit_writer):
+    client.post("/api/vendors", json={"id": "V-1", "name": "Vendor"}, headers=admin_headers)
+    assert running_audit_writer.stats()["queued"] == 1
+    resp = client.get("/api/export/ndjson?updated_since=2024-01-01T00:00:00Z", headers=admin_headers)
+    assert [json.loads(line)["entity"] for line in resp.text.splitlines()] == ["vendors"]
+    watermark = datetime.fromisoformat(resp.headers["X-Export-Watermark"])
+    lag = datetime.now(timezone.utc) - watermark
+    assert lag.total_seconds() >= 2 * running_audit_writer.flush_interval - 5
+
+
+def test_export_csv(client, admin_headers):
+    client.post("/api/applications", json={"name": "App, with comma", "technology": ["Java"]}, headers=admin_headers)
+    resp = client.get("/api/export/csv/applications", headers=admin_headers)
+    assert resp.status_code == 200
+    assert resp.headers["content-type"].startswith("text/csv")
+    rows = list(csv.DictReader(io.StringIO(resp.text)))
+    assert len(rows) == 1
+    assert rows[0]["name"] == "App, with comma"
+    assert json.loads(rows[0]["technology"]) == ["Java"]
+
+
+def test_export_csv_unknown_entity(client, admin_headers):
+    resp = client.get("/api/export/csv/unicorns", headers=admin_headers)
+    assert resp.status_code == 404
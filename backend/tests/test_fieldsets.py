@@ -0,0 +1,46 @@
+"""Tests for sparse fieldsets (?fields=)."""
+
+
+def test_list_fields_projection(client, admin_headers):
+    client.post("/api/applications", json={"name": "A", "description": "long", "scores": {"x": 1}}, headers=admin_headers)
+    resp = client.get("/api/applications?fields=name", headers=admin_headers)
+    assert resp.status_code == 200
+    assert resp.json() == [{"name": "A", "id": "APP-001"}]
+
+
+def test_detail_fields_projection(client, admin_headers):
+    client.post("/api/vendors", json={"name": "V", "category": "Cloud"}, headers=admin_headers)
+    resp = client.get("/api/vendors/VND-001?fields=name,category", headers=admin_headers)
+    assert resp.json() == {"name": "V", "category": "Cloud", "id": "VND-001"}
+    assert client.get("/api/vendors/VND-404?fields=name", headers=admin_headers).status_code == 404
+
+
+def test_unknown_field_rejected(client, admin_headers):
+    resp = client.get("/api/applications?fields=id,password", headers=admin_headers)
+    assert resp.status_code == 400
+    assert "password" in resp.json()["detail"]
+
+
+def test_nested_fields_and_pagination(client, admin_headers):
+    domain = client.post("/api/domains", json={"name": "D"}, headers=admin_headers).json()
+    client.post(f"/api/domains/{domain['id']}/capabilities", json={"name": "C"}, headers=admin_headers)
+    client.post("/api/domains", json={"name": "E"}, headers=admin_headers)
+    assert client.get("/api/domains?fields=name", headers=admin_headers).json() == [
+        {"name": "D", "id": domain["id"]}, {"name": "E", "id": domain["id"] + 1},
+    ]
+    with_caps = client.get("/api/domains?fields=capabilities&limit=1", headers=admin_headers)
+    assert with_caps.headers["X-Next-Cursor"]
+    [row] = with_caps.json()
+    assert set(row) == {"id", "capabilities"}
+    assert row["capabilities"][0]["name"] == "C"
+
+
+def test_projection_cache_is_bounded(client, admin_headers, monkeypatch):
+    from app.routers.vendors import _reader
+    from app.services import list_reader
+
+    monkeypatch.setattr(list_reader, "MAX_PROJECTIONS", 2)
+    client.post("/api/vendors", json={"name": "V", "category": "Cloud"}, headers=admin_headers)
+    for fields in ("name", "category", "name,category", "category"):
+        assert client.get(f"/api/vendors?fields={fields}", headers=admin_headers).status_code == 200
+    assert list(_reader._projections) == [("category", "name"), ("category",)]
@@ -0,0 +1,89 @@
+"""Tests for the in-memory integration graph."""
+import time
+
+from sqlalchemy import insert
+
+from app.models.integration import Integration
+from app.services.integration_graph import IntegrationGraph
+from app.services.table_versions import bump_versions
+
+
+def _link(client, headers, source, target):
+    resp = client.post("/api/integrations", json={"source_app_id": source, "target_app_id": target}, headers=headers)
+    return resp.json()["id"]
+
+
+def _ids(items):
+    return sorted(item["id"] for item in items)
+
+
+def test_neighbors_and_impact(client, admin_headers, viewer_headers):
+    _link(client, admin_headers, "A", "B")
+    _link(client, admin_headers, "B", "C")
+    _link(client, admin_headers, "D", "A")
+
+    data = client.get("/api/graph/apps/A/neighbors", headers=viewer_headers).json()
+    assert _ids(data["nodes"]) == ["A", "B", "D"]
+    assert [(e["source"], e["target"]) for e in data["edges"]] == [("A", "B"), ("D", "A")]
+    data = client.get("/api/graph/apps/A/neighbors?depth=2&direction=downstream", headers=viewer_headers).json()
+    assert {n["id"]: n["distance"] for n in data["nodes"]} == {"A": 0, "B": 1, "C": 2}
+
+    down = client.get("/api/graph/apps/A/impact", headers=viewer_headers).json()
+    assert (down["count"], _ids(down["affected"])) == (2, ["B", "C"])
+    up = client.get("/api/graph/apps/C/impact?direction=upstream", headers=viewer_headers).json()
+    assert _ids(up["affected"]) == ["A", "B", "D"]
+    assert client.get("/api/graph/apps/NOPE/impact", headers=viewer_headers).status_code == 404
+
+
+def test_path_and_components(client, admin_headers):
+    ab = _link(client, admin_headers, "A", "B")
+    bc = _link(client, admin_headers, "B", "C")
+    _link(client, admin_headers, "C", "A")
+    _link(client, admin_headers, "C", "D")
+
+    path = client.get("/api/graph/path?source=A&target=C", headers=admin_headers).json()
+    assert (path["apps"], path["integrations"], path["hops"]) == (["A", "B", "C"], [ab, bc], 2)
+    assert client.get("/api/graph/path?source=D&target=A", headers=admin_headers).status_code == 404
+    undirected = client.get("/api/graph/path?source=D&target=A&directed=false", headers=admin_headers).json()
+    assert undirected["apps"] == ["D", "C", "A"]
+
+    assert client.get("/api/graph/components", headers=admin_headers).json() == {
+        "count": 1, "components": [["A", "B", "C"]],
+    }
+
+
+def test_graph_follows_writes(client, admin_headers, db_session):
+    first = _link(client, admin_headers, "A", "B")
+    assert client.get("/api/graph/stats", headers=admin_headers).json() == {"apps": 2, "integrations": 1}
+
+    client.put(f"/api/integrations/{first}", json={"target_app_id": "C"}, headers=admin_headers)
+    assert _ids(client.get("/api/graph/apps/A/impact", headers=admin_headers).json()["affected"]) == ["C"]
+    client.delete(f"/api/integrations/{first}", headers=admin_headers)
+    assert client.get("/api/graph/apps/A/impact", headers=admin_headers).json()["count"] == 0
+
+    # Core writes bypass the session listener; the version bump triggers a reload.
+    db_session.execute(insert(Integration), [{"id": "INT-900", "source_app_id": "A", "target_app_id": "D"}])
+    bump_versions(db_session.connection(), ["integrations"])
+    db_session.commit()
+    assert _ids(client.get("/api/graph/apps/A/impact", headers=admin_headers).json()["affected"]) == ["D"]
+
+
+def test_large_graph_queries_are_fast(db_session):
+    apps = 10000
+    rows = [
+        {"id": f"INT-{i:05d}", "source_app_id": f"APP-{i % apps}", "target_app_id": f"APP-{(i * 7 + 1) % apps}"}
+        for i in range(50000)
+    ]
+    db_session.execute(insert(Integration), rows)
+    db_session.commit()
+    graph = IntegrationGraph()
+    graph.load(db_session, (0, 0))
+    assert graph.stats() == {"apps": apps, "integrations": 50000}
+
+    started = time.perf_counter()
+    graph.neighbors("APP-0", depth=2)
+    graph.shortest_path("APP-0", "APP-4999")
+    elapsed = time.perf_counter() - started
+    assert elapsed < 0.5, elapsed
+    assert graph.impact("APP-0")  # whole-graph traversal
+    assert graph.strongly_connected_components()
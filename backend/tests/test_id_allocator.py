@@ -0,0 +1,34 @@
+"""Tests for the sequence-backed ID allocator."""
+from app.models.application import Application
+from app.services.id_allocator import allocate_ids, next_id
+
+
+def test_sequential_ids(client, admin_headers):
+    ids = [client.post("/api/applications", json={"name": f"A{i}"}, headers=admin_headers).json()["id"] for i in range(3)]
+    assert ids == ["APP-001", "APP-002", "APP-003"]
+
+
+def test_ids_continue_after_existing_rows(db_session):
+    db_session.add(Application(id="APP-041", name="Existing"))
+    db_session.commit()
+    assert next_id(db_session, Application, "APP") == "APP-042"
+
+
+def test_skips_explicitly_taken_id(client, admin_headers):
+    client.post("/api/applications", json={"name": "First"}, headers=admin_headers)
+    client.post("/api/applications", json={"id": "APP-002", "name": "Explicit"}, headers=admin_headers)
+    resp = client.post("/api/applications", json={"name": "Next"}, headers=admin_headers)
+    assert resp.status_code == 201
+    assert resp.json()["id"] == "APP-003"
+
+
+def test_reserve_block(db_session):
+    block = allocate_ids(db_session, Application, "APP", count=3)
+    assert block == ["APP-001", "APP-002", "APP-003"]
+    assert next_id(db_session, Application, "APP") == "APP-004"
+
+
+def test_compliance_ids(client, admin_headers):
+    first = client.post("/api/compliance", json={"app_id": "APP-001"}, headers=admin_headers).json()
+    second = client.post("/api/compliance", json={"app_id": "APP-001"}, headers=admin_headers).json()
+    assert (first["id"], second["id"]) == ("CA-001", "CA-002")
@@ -0,0 +1,76 @@
+"""Tests for the bulk JSON import endpoint."""
+
+
+def test_import_roundtrip_replace(client, admin_headers):
+    client.post("/api/seed", headers=admin_headers)
+    exported = client.get("/api/export/json", headers=admin_headers).json()
+    client.post("/api/applications", json={"name": "Extra"}, headers=admin_headers)
+
+    resp = client.post("/api/import/json?mode=replace", json=exported, headers=admin_headers)
+    assert resp.status_code == 200
+    report = resp.json()
+    assert report["mode"] == "replace"
+    assert report["counts"]["applications"] == len(exported["applications"])
+    assert report["counts"]["sub_capabilities"] > 0
+    assert "applications" in report["timings_ms"]
+
+    assert client.get("/api/export/json", headers=admin_headers).json() == exported
+
+
+def test_import_merge_updates_and_keeps_rows(client, admin_headers):
+    client.post("/api/applications", json={"id": "APP-001", "name": "Old"}, headers=admin_headers)
+    client.post("/api/applications", json={"id": "APP-002", "name": "Untouched"}, headers=admin_headers)
+    doc = {"applications": [
+        {"id": "APP-001", "name": "Renamed", "costPerYear": 1200},
+        {"id": "APP-003", "name": "New"},
+    ]}
+    resp = client.post("/api/import/json?mode=merge", json=doc, headers=admin_headers)
+    assert resp.status_code == 200
+    apps = {a["id"]: a for a in client.get("/api/applications", headers=admin_headers).json()}
+    assert apps["APP-001"]["name"] == "Renamed"
+    assert apps["APP-001"]["cost_per_year"] == 1200
+    assert apps["APP-002"]["name"] == "Untouched"
+    assert apps["APP-003"]["version"] == 1
+
+
+def test_import_validation_error_rolls_back(client, admin_headers):
+    doc = {"applications": [{"id": "APP-001", "name": "Ok"}, {"id": "APP-002"}, {"name": "No id", "userCount": "many"}]}
+    resp = client.post("/api/import/json", json=doc, headers=admin_headers)
+    assert resp.status_code == 422
+    fields = {(e["index"], e["field"]) for e in resp.json()["detail"]}
+    assert (1, "name") in fields
+    assert (2, "id") in fields
+    assert (2, "userCount") in fields
+    assert client.get("/api/applications", headers=admin_headers).json() == []
+
+
+def test_import_rejects_duplicate_keys(client, admin_headers):
+    client.post("/api/applications", json={"id": "APP-009", "name": "Kept"}, headers=admin_headers)
+    doc = {
+        "applications": [{"id": "APP-001", "name": "A"}, {"id": "APP-002", "name": "B"}, {"id": "APP-001", "name": "C"}],
+        "domains": [
+            {"id": 1, "name": "D", "capabilities": [{"id": "CAP-1", "name": "X"}]},
+            {"id": 2, "name": "E", "capabilities": [{"id": "CAP-1", "name": "Y"}]},
+        ],
+    }
+    for mode in ("merge", "replace"):
+        resp = client.post(f"/api/import/json?mode={mode}", json=doc, headers=admin_headers)
+        assert resp.status_code == 422
+        errors = {(e["section"], e["index"], e["field"]): e["error"] for e in resp.json()["detail"]}
+        assert errors == {
+            ("applications", 2, "id"): "duplicate of applications[0]",
+            ("domains[1].capabilities", 0, "id"): "duplicate of domains[0].capabilities[0]",
+        }
+    assert [a["id"] for a in client.get("/api/applications", headers=admin_headers).json()] == ["APP-009"]
+
+
+def test_import_requires_admin(client, editor_headers):
+    resp = client.post("/api/import/json", json={}, headers=editor_headers)
+    assert resp.status_code == 403
+
+
+def test_import_rebuilds_only_derived_tables_it_feeds(client, admin_headers):
+    resp = client.post("/api/import/json", json={"applications": [{"id": "APP-001", "name": "A"}]}, headers=admin_headers)
+    assert {"links", "rollups", "search"} <= set(resp.json()["timings_ms"])
+    resp = client.post("/api/import/json", json={"managementKPIs": []}, headers=admin_headers)
+    assert not {"links", "rollups", "search"} & set(resp.json()["timings_ms"])
@@ -0,0 +1,44 @@
+"""Tests for the secondary indexes and the index advisor."""
+from sqlalchemy import text
+
+from app.services.index_advisor import index_advisor
+
+
+def test_advisor_reports_filters_and_serving_indexes(client, admin_headers):
+    index_advisor.clear()
+    client.post("/api/applications", json={"name": "A", "category": "ERP"}, headers=admin_headers)
+    for _ in range(2):
+        client.get("/api/applications?category=ERP&criticality=High", headers=admin_headers)
+    client.get("/api/vendors?category=Cloud", headers=admin_headers)
+    client.get("/api/vendors", headers=admin_headers)
+
+    report = {(e["table"], tuple(e["columns"])): e for e in client.get("/api/admin/index-advisor", headers=admin_headers).json()}
+    apps = report[("applications", ("category", "criticality"))]
+    assert apps["requests"] == 2
+    assert apps["index"] in ("ix_applications_category", "ix_applications_criticality")
+    assert apps["suggestion"] is None
+    vendors = report[("vendors", ("category",))]
+    assert vendors["index"] is None
+    assert vendors["suggestion"] == "CREATE INDEX ix_vendors_category ON vendors (category)"
+    assert len(report) == 2
+
+    assert client.delete("/api/admin/index-advisor", headers=admin_headers).status_code == 204
+    assert client.get("/api/admin/index-advisor", headers=admin_headers).json() == []
+
+
+def test_advisor_requires_admin(client, editor_headers):
+    assert client.get("/api/admin/index-advisor", headers=editor_headers).status_code == 403
+
+
+def test_router_filters_use_indexes(db_session):
+    queries = {
+        "ix_integrations_source_app_id": "SELECT * FROM integrations WHERE source_app_id = 'APP-001'",
+        "ix_integrations_target_app_id": "SELECT * FROM integrations WHERE target_app_id = 'APP-001'",
+        "ix_capability_mappings_application_id": "SELECT * FROM capability_mappings WHERE application_id = 'APP-001'",
+        "ix_compliance_assessments_regulation": "SELECT * FROM compliance_assessments WHERE regulation = 'DORA'",
+        "ix_capabilities_domain_id": "SELECT * FROM capabilities WHERE domain_id = 1",
+        "ix_projects_status": "SELECT * FROM projects WHERE status = 'green'",
+    }
+    for index, sql in queries.items():
+        plan = " ".join(row[-1] for row in db_session.execute(text(f"EXPLAIN QUERY PLAN {sql}")))
+        assert index in plan, plan
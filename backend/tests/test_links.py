@@ -0,0 +1,79 @@
+"""Tests for the link table mirrored from JSON list columns."""
+from sqlalchemy import select, text
+
+from app.models.link import EntityLink
+from app.services.link_service import rebuild_links
+
+
+def _snapshot(db):
+    rows = db.execute(
+        select(EntityLink.relation, EntityLink.owner_id, EntityLink.target_id)
+        .order_by(EntityLink.relation, EntityLink.owner_id, EntityLink.target_id)
+    )
+    return [tuple(r) for r in rows]
+
+
+def _ids(resp):
+    return [item["id"] for item in resp.json()]
+
+
+def test_links_follow_create_update_delete(client, admin_headers):
+    client.post("/api/projects", json={
+        "name": "P1", "affected_apps": [{"appId": "APP-001", "action": "ändern"}], "secondary_domains": [3],
+    }, headers=admin_headers)
+    client.post("/api/projects", json={"name": "P2", "affected_apps": [{"appId": "APP-002"}]}, headers=admin_headers)
+    assert _ids(client.get("/api/projects?app_id=APP-001", headers=admin_headers)) == ["PRJ-001"]
+    assert _ids(client.get("/api/projects?domain_id=3", headers=admin_headers)) == ["PRJ-001"]
+
+    client.put("/api/projects/PRJ-002", json={
+        "affected_apps": [{"appId": "APP-001"}, {"appId": "APP-003"}],
+    }, headers=admin_headers)
+    assert _ids(client.get("/api/projects?app_id=APP-001", headers=admin_headers)) == ["PRJ-001", "PRJ-002"]
+    assert _ids(client.get("/api/projects?app_id=APP-002", headers=admin_headers)) == []
+
+    client.delete("/api/projects/PRJ-001", headers=admin_headers)
+    assert _ids(client.get("/api/projects?app_id=APP-001", headers=admin_headers)) == ["PRJ-002"]
+
+
+def test_references_endpoint(client, admin_headers, viewer_headers):
+    client.post("/api/projects", json={"name": "P", "affected_apps": [{"appId": "APP-001"}]}, headers=admin_headers)
+    client.post("/api/demands", json={"title": "D", "related_apps": ["APP-001"]}, headers=admin_headers)
+    client.post("/api/data-objects", json={
+        "name": "O", "source_app_ids": ["APP-002"], "consuming_app_ids": ["APP-001"],
+    }, headers=admin_headers)
+
+    data = client.get("/api/links/APP-001", headers=viewer_headers).json()
+    assert data["references"] == {
+        "data_object_consumers": ["DO-001"], "demand_apps": ["DEM-001"], "project_apps": ["PRJ-001"],
+    }
+    only = client.get("/api/links/APP-001?relation=project_apps", headers=viewer_headers).json()
+    assert only["references"] == {"project_apps": ["PRJ-001"]}
+    assert client.get("/api/links/APP-001?relation=nope", headers=viewer_headers).status_code == 400
+
+
+def test_incremental_links_match_rebuild(client, admin_headers, db_session):
+    client.post("/api/applications", json={"name": "A", "technology": ["Java", "SAP"], "entities": ["LE-1"]}, headers=admin_headers)
+    client.put("/api/applications/APP-001", json={"technology": ["SAP", "Python"]}, headers=admin_headers)
+    client.post("/api/processes", json={"id": "O2C", "name": "Order to Cash", "domains": [1, 2]}, headers=admin_headers)
+    client.post("/api/demands", json={"title": "D", "related_vendors": ["VND-001"]}, headers=admin_headers)
+    client.delete("/api/demands/DEM-001", headers=admin_headers)
+
+    incremental = _snapshot(db_session)
+    assert ("application_technology", "APP-001", "Java") not in incremental
+    rebuild_links(db_session)
+    db_session.commit()
+    assert _snapshot(db_session) == incremental
+
+
+def test_seed_rebuilds_links(client, admin_headers):
+    client.post("/api/seed", headers=admin_headers)
+    projects = client.get("/api/projects?limit=500", headers=admin_headers).json()
+    expected = sorted(p["id"] for p in projects if any(a.get("appId") == "APP-001" for a in p["affected_apps"] or []))
+    assert expected
+    assert sorted(_ids(client.get("/api/projects?app_id=APP-001&limit=500", headers=admin_headers))) == expected
+
+
+def test_reverse_lookup_uses_index(db_session):
+    sql = "SELECT owner_id FROM entity_links WHERE target_id = 'APP-001' AND relation = 'project_apps'"
+    plan = " ".join(row[-1] for row in db_session.execute(text(f"EXPLAIN QUERY PLAN {sql}")))
+    assert "ix_entity_links_target" in plan, plan
@@ -0,0 +1,61 @@
+"""The column-level list path must produce exactly what the ORM path did."""
+from pydantic import TypeAdapter
+
+from app.models import (
+    Application, CapabilityMapping, ComplianceAssessment, DataObject, Demand, Domain,
+    E2EProcess, Integration, LegalEntity, ManagementKPI, Project, ProjectDependency, Vendor,
+)
+from app.schemas.application import ApplicationRead, CapabilityMappingRead
+from app.schemas.compliance import ComplianceAssessmentRead
+from app.schemas.data_object import DataObjectRead
+from app.schemas.demand import DemandRead
+from app.schemas.domain import DomainRead
+from app.schemas.entity import LegalEntityRead
+from app.schemas.integration import IntegrationRead
+from app.schemas.kpi import ManagementKPIRead
+from app.schemas.process import E2EProcessRead
+from app.schemas.project import ProjectDependencyRead, ProjectRead
+from app.schemas.vendor import VendorRead
+
+LIST_ROUTES = [
+    ("/api/applications", Application, ApplicationRead),
+    ("/api/capability-mappings", CapabilityMapping, CapabilityMappingRead),
+    ("/api/compliance", ComplianceAssessment, ComplianceAssessmentRead),
+    ("/api/data-objects", DataObject, DataObjectRead),
+    ("/api/demands", Demand, DemandRead),
+    ("/api/domains", Domain, DomainRead),
+    ("/api/entities", LegalEntity, LegalEntityRead),
+    ("/api/integrations", Integration, IntegrationRead),
+    ("/api/kpis", ManagementKPI, ManagementKPIRead),
+    ("/api/processes", E2EProcess, E2EProcessRead),
+    ("/api/projects", Project, ProjectRead),
+    ("/api/project-dependencies", ProjectDependency, ProjectDependencyRead),
+    ("/api/vendors", Vendor, VendorRead),
+]
+
+
+def test_list_endpoints_match_orm_serialization(client, admin_headers, db_session):
+    assert client.post("/api/seed", headers=admin_headers).status_code == 200
+    client.post("/api/data-objects", json={"name": "Customer", "source_app_id": "APP-001"}, headers=admin_headers)
+    for path, model, schema in LIST_ROUTES:
+        adapter = TypeAdapter(list[schema])
+        expected = adapter.dump_python(adapter.validate_python(db_session.query(model).all(), from_attributes=True), mode="json")
+        resp = client.get(path, headers=admin_headers)
+        assert resp.status_code == 200, path
+        assert resp.json() == expected, path
+
+
+def test_list_reader_keeps_route_headers(client, admin_headers):
+    for i in range(3):
+        client.post("/api/vendors", json={"name": f"V{i}"}, headers=admin_headers)
+    resp = client.get("/api/vendors?limit=2", headers=admin_headers)
+    assert len(resp.json()) == 2
+    assert resp.headers["X-Next-Cursor"]
+    assert resp.headers["X-Total-Estimate"] == "3"
+    assert resp.headers["ETag"]
+
+
+def test_openapi_schema_unchanged(client):
+    spec = client.get("/api/openapi.json").json()
+    schema = spec["paths"]["/api/applications"]["get"]["responses"]["200"]["content"]["application/json"]["schema"]
+    assert schema["items"]["$ref"].endswith("/ApplicationRead")
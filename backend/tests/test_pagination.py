@@ -0,0 +1,60 @@
+"""Tests for opt-in keyset pagination on list endpoints."""
+
+
+def _create_apps(client, headers, n):
+    for i in range(n):
+        client.post("/api/applications", json={"name": f"App {i}", "category": "ERP" if i % 2 else "CRM"}, headers=headers)
+
+
+def test_list_without_limit_returns_plain_array(client, admin_headers):
+    _create_apps(client, admin_headers, 3)
+    resp = client.get("/api/applications", headers=admin_headers)
+    assert resp.status_code == 200
+    assert len(resp.json()) == 3
+    assert "X-Next-Cursor" not in resp.headers
+
+
+def test_paginate_walks_all_pages(client, admin_headers):
+    _create_apps(client, admin_headers, 5)
+    resp = client.get("/api/applications?limit=2", headers=admin_headers)
+    assert resp.status_code == 200
+    assert resp.headers["X-Total-Estimate"] == "5"
+    seen = [a["id"] for a in resp.json()]
+    while "X-Next-Cursor" in resp.headers:
+        resp = client.get(f"/api/applications?limit=2&after={resp.headers['X-Next-Cursor']}", headers=admin_headers)
+        assert resp.status_code == 200
+        seen.extend(a["id"] for a in resp.json())
+    assert seen == sorted(seen)
+    assert len(seen) == len(set(seen)) == 5
+
+
+def test_paginate_respects_filters(client, admin_headers):
+    _create_apps(client, admin_headers, 5)
+    resp = client.get("/api/applications?category=ERP&limit=1", headers=admin_headers)
+    assert resp.headers["X-Total-Estimate"] == "2"
+    assert all(a["category"] == "ERP" for a in resp.json())
+
+
+def test_total_estimate_is_capped(client, admin_headers, monkeypatch):
+    from app.services import pagination
+
+    monkeypatch.setattr(pagination, "COUNT_CAP", 3)
+    _create_apps(client, admin_headers, 5)
+    assert client.get("/api/applications?limit=2", headers=admin_headers).headers["X-Total-Estimate"] == "3"
+    assert client.get("/api/applications?category=ERP&limit=1", headers=admin_headers).headers["X-Total-Estimate"] == "2"
+
+
+def test_paginate_composite_key(client, admin_headers):
+    for cap in ("1.1", "1.2", "1.3"):
+        client.post("/api/capability-mappings", json={"capability_id": cap, "application_id": "APP-001"}, headers=admin_headers)
+    resp = client.get("/api/capability-mappings?limit=2", headers=admin_headers)
+    assert len(resp.json()) == 2
+    cursor = resp.headers["X-Next-Cursor"]
+    resp = client.get(f"/api/capability-mappings?limit=2&after={cursor}", headers=admin_headers)
+    assert [m["capability_id"] for m in resp.json()] == ["1.3"]
+    assert "X-Next-Cursor" not in resp.headers
+
+
+def test_invalid_cursor_rejected(client, admin_headers):
+    resp = client.get("/api/applications?limit=2&after=not-a-cursor", headers=admin_headers)
+    assert resp.status_code == 400
@@ -0,0 +1,66 @@
+"""Tests for off-thread password hashing, rehash-on-login and the login gate."""
+import asyncio
+import os
+from concurrent.futures.process import BrokenProcessPool
+
+import pytest
+from fastapi import HTTPException
+from passlib.context import CryptContext
+
+from app.config import settings
+from app.models.user import User
+from app.routers import auth as auth_router
+from app.services.auth_service import hash_password, verify_password
+from app.services.password_pool import PasswordPool, verify_in_worker
+
+
+def test_hash_and_verify_roundtrip():
+    hashed = hash_password("s3cret")
+    assert hashed.startswith(f"$2b${settings.BCRYPT_ROUNDS:02d}$")
+    assert verify_password("s3cret", hashed)
+    assert not verify_password("wrong", hashed)
+
+
+def test_login_rehashes_with_configured_cost(client, db_session):
+    weak = CryptContext(schemes=["bcrypt"], bcrypt__rounds=4).hash("testpass")
+    user = User(email="old@test.com", name="Old Hash", password_hash=weak, role="viewer", is_active=True)
+    db_session.add(user)
+    db_session.commit()
+    resp = client.post("/api/auth/login", json={"email": "old@test.com", "password": "testpass"})
+    assert resp.status_code == 200
+    db_session.refresh(user)
+    assert user.password_hash.startswith(f"$2b${settings.BCRYPT_ROUNDS:02d}$")
+    assert verify_password("testpass", user.password_hash)
+
+
+def test_health_reports_password_pool(client):
+    data = client.get("/api/health").json()
+    assert set(data["password_pool"]) == {"workers", "in_flight", "queued"}
+
+
+def test_login_gate_rejects_when_saturated(monkeypatch):
+    monkeypatch.setattr(settings, "LOGIN_CONCURRENCY", 1)
+    monkeypatch.setattr(settings, "LOGIN_QUEUE_TIMEOUT_SECONDS", 0.01)
+    monkeypatch.setattr(auth_router, "_login_slots", None)
+
+    async def scenario():
+        async with auth_router._login_slot():
+            with pytest.raises(HTTPException) as exc:
+                async with auth_router._login_slot():
+                    pass
+            return exc.value
+
+    err = asyncio.run(scenario())
+    assert err.status_code == 503
+    assert err.headers["Retry-After"] == "1"
+
+
+def test_broken_pool_is_replaced():
+    pool = PasswordPool(1)
+    try:
+        with pytest.raises(BrokenProcessPool):
+            pool.run(os._exit, 1)
+        assert pool.run(verify_in_worker, "s3cret", hash_password("s3cret"))
+        assert pool.in_flight == 0
+    finally:
+        pool.shutdown()
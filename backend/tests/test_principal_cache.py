@@ -0,0 +1,44 @@
+"""Tests for the authenticated-user cache."""
+from sqlalchemy import event
+
+from tests.conftest import TEST_ENGINE
+
+
+def _count_user_queries(client, path, headers, n):
+    statements = []
+
+    def before(conn, cursor, statement, *args):
+        if "FROM users" in statement:
+            statements.append(statement)
+
+    event.listen(TEST_ENGINE, "before_cursor_execute", before)
+    try:
+        for _ in range(n):
+            assert client.get(path, headers=headers).status_code == 200
+    finally:
+        event.remove(TEST_ENGINE, "before_cursor_execute", before)
+    return len(statements)
+
+
+def test_repeated_requests_hit_cache(client, admin_headers):
+    client.get("/api/dashboard/summary", headers=admin_headers)
+    assert _count_user_queries(client, "/api/dashboard/summary", admin_headers, 5) == 0
+
+
+def test_deactivated_user_rejected_immediately(client, admin_headers, editor_user, editor_headers):
+    assert client.get("/api/auth/me", headers=editor_headers).status_code == 200
+    client.put(f"/api/admin/users/{editor_user.id}", json={"is_active": False}, headers=admin_headers)
+    assert client.get("/api/auth/me", headers=editor_headers).status_code == 401
+
+
+def test_role_change_applies_immediately(client, admin_headers, viewer_user, viewer_headers):
+    assert client.post("/api/vendors", json={"name": "V"}, headers=viewer_headers).status_code == 403
+    client.put(f"/api/admin/users/{viewer_user.id}", json={"role": "editor"}, headers=admin_headers)
+    assert client.post("/api/vendors", json={"name": "V"}, headers=viewer_headers).status_code == 201
+
+
+def test_update_me_refreshes_cached_profile(client, admin_headers):
+    client.get("/api/auth/me", headers=admin_headers)
+    resp = client.put("/api/auth/me", json={"name": "Renamed"}, headers=admin_headers)
+    assert resp.status_code == 200
+    assert client.get("/api/auth/me", headers=admin_headers).json()["name"] == "Renamed"
@@ -0,0 +1,65 @@
+"""Tests for event-maintained portfolio rollups."""
+from sqlalchemy import select
+
+from app.models.rollup import PortfolioRollup
+from app.services.rollup_service import rebuild_rollups
+
+
+def _snapshot(db):
+    rows = db.execute(
+        select(PortfolioRollup.dimension, PortfolioRollup.group_key, PortfolioRollup.row_count,
+               PortfolioRollup.value_count, PortfolioRollup.value_sum)
+        .where(PortfolioRollup.row_count > 0)
+        .order_by(PortfolioRollup.dimension, PortfolioRollup.group_key)
+    )
+    return [tuple(r) for r in rows]
+
+
+def test_rollups_follow_create_update_delete(client, admin_headers):
+    client.post("/api/applications", json={"name": "A", "time_quadrant": "Invest", "cost_per_year": 100}, headers=admin_headers)
+    client.post("/api/applications", json={"name": "B", "time_quadrant": "Invest", "cost_per_year": 50}, headers=admin_headers)
+    data = client.get("/api/dashboard/rollups?dimensions=app_time_quadrant", headers=admin_headers).json()
+    assert data["app_time_quadrant"]["Invest"] == {"count": 2, "total": 150.0, "average": 75.0}
+
+    client.put("/api/applications/APP-002", json={"time_quadrant": "Migrate"}, headers=admin_headers)
+    data = client.get("/api/dashboard/rollups?dimensions=app_time_quadrant", headers=admin_headers).json()
+    assert data["app_time_quadrant"] == {
+        "Invest": {"count": 1, "total": 100.0, "average": 100.0},
+        "Migrate": {"count": 1, "total": 50.0, "average": 50.0},
+    }
+
+    client.delete("/api/applications/APP-001", headers=admin_headers)
+    assert client.get("/api/dashboard/time-distribution", headers=admin_headers).json() == {"Migrate": 1}
+    assert client.get("/api/dashboard/summary", headers=admin_headers).json()["applications"] == 1
+
+
+def test_incremental_rollups_match_rebuild(client, admin_headers, db_session):
+    domain = client.post("/api/domains", json={"name": "D"}, headers=admin_headers).json()
+    client.post(f"/api/domains/{domain['id']}/capabilities", json={"name": "C1", "maturity": 2}, headers=admin_headers)
+    client.post(f"/api/domains/{domain['id']}/capabilities", json={"name": "C2", "maturity": 4}, headers=admin_headers)
+    client.post("/api/projects", json={"name": "P", "primary_domain": domain["id"], "budget": 10, "status": "green"}, headers=admin_headers)
+    client.post("/api/compliance", json={"app_id": "APP-001", "regulation": "GDPR", "status": "open"}, headers=admin_headers)
+    client.delete(f"/api/domains/{domain['id']}", headers=admin_headers)
+
+    incremental = _snapshot(db_session)
+    rebuild_rollups(db_session)
+    db_session.commit()
+    assert _snapshot(db_session) == incremental
+    assert ("capability_maturity", str(domain["id"]), 2, 2, 6.0) not in incremental
+
+
+def test_import_rebuilds_rollups(client, admin_headers):
+    client.post("/api/applications", json={"name": "A", "category": "ERP"}, headers=admin_headers)
+    exported = client.get("/api/export/json", headers=admin_headers).json()
+    exported["applications"].append(dict(exported["applications"][0], id="APP-900", category="CRM"))
+    resp = client.post("/api/import/json?mode=replace", json=exported, headers=admin_headers)
+    assert resp.status_code == 200
+    categories = client.get("/api/dashboard/application-categories", headers=admin_headers).json()
+    assert categories == {"ERP": 1, "CRM": 1}
+
+
+def test_rebuild_endpoint_requires_admin(client, admin_headers, editor_headers):
+    assert client.post("/api/dashboard/rollups/rebuild", headers=editor_headers).status_code == 403
+    resp = client.post("/api/dashboard/rollups/rebuild", headers=admin_headers)
+    assert resp.status_code == 200
+    assert resp.json()["rows"] == 7
@@ -0,0 +1,59 @@
+"""Tests for full-text search."""
+import time
+
+from sqlalchemy import text
+
+from app.services.search_service import rebuild_search_index
+
+
+def _hits(data):
+    return {g["type"]: [i["id"] for i in g["items"]] for g in data["groups"]}
+
+
+def test_search_groups_ranks_and_prefixes(client, admin_headers, viewer_headers):
+    client.post("/api/applications", json={"name": "Salesforce CRM", "vendor": "Salesforce"}, headers=admin_headers)
+    client.post("/api/applications", json={"name": "SAP ERP", "description": "Salesforce-Anbindung geplant"}, headers=admin_headers)
+    client.post("/api/vendors", json={"name": "Salesforce Inc."}, headers=admin_headers)
+    client.post("/api/projects", json={"name": "Lagerlogistik", "category": "Logistik"}, headers=admin_headers)
+
+    data = client.get("/api/search?q=sales", headers=viewer_headers).json()
+    assert _hits(data) == {"application": ["APP-001", "APP-002"], "vendor": ["VND-001"]}
+    assert data["total"] == 3 and data["corrected"] is False
+
+    only = client.get("/api/search?q=sales&types=vendor", headers=viewer_headers).json()
+    assert _hits(only) == {"vendor": ["VND-001"]}
+    assert client.get("/api/search?q=sales&types=nope", headers=viewer_headers).status_code == 400
+    assert _hits(client.get("/api/search?q=lager logis", headers=viewer_headers).json()) == {"project": ["PRJ-001"]}
+
+
+def test_search_tolerates_typos(client, admin_headers):
+    client.post("/api/data-objects", json={"name": "Kundenstammdaten", "owner": "Müller"}, headers=admin_headers)
+    data = client.get("/api/search?q=kundnstammdaten", headers=admin_headers).json()
+    assert data["corrected"] is True
+    assert _hits(data) == {"data_object": ["DO-001"]}
+    assert _hits(client.get("/api/search?q=muller", headers=admin_headers).json()) == {"data_object": ["DO-001"]}
+
+
+def test_index_follows_updates_and_deletes(client, admin_headers, db_session):
+    client.post("/api/demands", json={"title": "Power BI Einführung"}, headers=admin_headers)
+    client.put("/api/demands/DEM-001", json={"title": "Tableau Einführung"}, headers=admin_headers)
+    assert client.get("/api/search?q=power", headers=admin_headers).json()["total"] == 0
+    assert client.get("/api/search?q=tableau", headers=admin_headers).json()["total"] == 1
+
+    before = db_session.execute(text("SELECT entity_type, entity_id, title, body FROM search_documents ORDER BY 1, 2")).all()
+    rebuild_search_index(db_session)
+    db_session.commit()
+    after = db_session.execute(text("SELECT entity_type, entity_id, title, body FROM search_documents ORDER BY 1, 2")).all()
+    assert before == after
+
+    client.delete("/api/demands/DEM-001", headers=admin_headers)
+    assert client.get("/api/search?q=tableau", headers=admin_headers).json()["total"] == 0
+
+
+def test_seeded_landscape_is_searchable(client, admin_headers):
+    client.post("/api/seed", headers=admin_headers)
+    started = time.perf_counter()
+    data = client.get("/api/search?q=sap", headers=admin_headers).json()
+    assert time.perf_counter() - started < 0.5
+    assert data["total"] > 0
+    assert "application" in _hits(data)
@@ -0,0 +1,47 @@
+"""Tests for the seed endpoint."""
+
+
+def test_seed_reports_counts_and_throughput(client, admin_headers):
+    resp = client.post("/api/seed", headers=admin_headers)
+    assert resp.status_code == 200
+    data = resp.json()
+    assert data["skipped"] is False
+    assert data["counts"]["applications"] > 0
+    assert data["counts"]["sub_capabilities"] > 0
+    assert set(data["rows_per_second"]) == set(data["counts"])
+    apps = client.get("/api/applications", headers=admin_headers).json()
+    assert len(apps) == data["counts"]["applications"]
+
+
+def test_seed_replaces_existing_data(client, admin_headers):
+    client.post("/api/applications", json={"id": "APP-TMP", "name": "Temp"}, headers=admin_headers)
+    client.post("/api/seed", headers=admin_headers)
+    resp = client.get("/api/applications/APP-TMP", headers=admin_headers)
+    assert resp.status_code == 404
+
+
+def test_seed_if_changed_skips_unchanged_file(client, admin_headers):
+    first = client.post("/api/seed?if_changed=true", headers=admin_headers).json()
+    assert first["skipped"] is False
+    second = client.post("/api/seed?if_changed=true", headers=admin_headers).json()
+    assert second["skipped"] is True
+    assert second["sha256"] == first["sha256"]
+
+
+def test_seed_if_changed_reseeds_after_edit(client, admin_headers):
+    client.post("/api/seed?if_changed=true", headers=admin_headers)
+    client.post("/api/applications", json={"name": "Edited"}, headers=admin_headers)
+    resp = client.post("/api/seed?if_changed=true", headers=admin_headers).json()
+    assert resp["skipped"] is False
+
+
+def test_seed_if_changed_sees_queued_audit_entries(client, admin_headers, running_audit_writer):
+    client.post("/api/seed?if_changed=true", headers=admin_headers)
+    client.post("/api/applications", json={"name": "Edited"}, headers=admin_headers)
+    resp = client.post("/api/seed?if_changed=true", headers=admin_headers).json()
+    assert resp["skipped"] is False
+
+
+def test_seed_requires_admin(client, editor_headers):
+    resp = client.post("/api/seed", headers=editor_headers)
+    assert resp.status_code == 403
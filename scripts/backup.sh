@@ -36,6 +36,15 @@ case "$DB_TYPE" in
     ;;
 esac
 
+# Archived audit entries live outside the database (monthly .jsonl.gz files);
+# past months never change, so copy only what is new
+AUDIT_ARCHIVE_DIR="${AUDIT_ARCHIVE_DIR:-./data/audit-archive}"
+if [ -d "$AUDIT_ARCHIVE_DIR" ]; then
+  mkdir -p "$BACKUP_DIR/audit-archive"
+  cp -u "$AUDIT_ARCHIVE_DIR"/audit-*.jsonl.gz "$BACKUP_DIR/audit-archive/" 2>/dev/null || true
+  echo "Audit archive: $BACKUP_DIR/audit-archive"
+fi
+
 # Clean up backups older than 30 days
 find "$BACKUP_DIR" -name "eadash_*" -mtime +30 -delete 2>/dev/null || true
 echo "Cleanup: removed backups older than 30 days"